@@ -1,31 +1,108 @@
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.outputs import LLMResult
-from typing import Any
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 from ..common.logger import logger
+from ..common.metrics import registry as metrics_registry
+
+USAGE_TAG_PREFIX = "usage:"
+
+LLM_TOKENS = metrics_registry.counter("aiga_llm_tokens_total", "LLM tokens by calling node/run name", ("usage", "kind"))
+LLM_CALLS = metrics_registry.counter("aiga_llm_calls_total", "LLM calls by calling node/run name", ("usage",))
+
+
+def usage_config(name: str) -> dict:
+    """
+    LLM 호출에 붙이는 config. run_name과 상속되는 usage 태그를 함께 지정하여
+    SQL agent처럼 내부에서 여러 번 LLM을 호출하는 경우에도 같은 항목으로 집계되게 한다.
+    """
+    return {"run_name": name, "tags": [f"{USAGE_TAG_PREFIX}{name}"]}
+
+
+def _resolve_usage_label(tags: Optional[List[str]], metadata: Optional[Dict[str, Any]], name: Optional[str]) -> str:
+    # 가장 안쪽(마지막) usage 태그 > 명시된 run_name > LangGraph 노드명
+    for tag in reversed(tags or []):
+        if tag.startswith(USAGE_TAG_PREFIX):
+            return tag[len(USAGE_TAG_PREFIX):]
+    if name:
+        return name
+    if metadata and metadata.get("langgraph_node"):
+        return metadata["langgraph_node"]
+    return "unknown"
+
+
+def _extract_cached_tokens(token_usage: dict) -> int:
+    details = token_usage.get("prompt_tokens_details") or {}
+    return details.get("cached_tokens", 0) or 0
+
 
 class TokenCountingCallback(BaseCallbackHandler):
-    """LLM 호출의 토큰 사용량을 집계하는 콜백 핸들러"""
+    """LLM 호출의 토큰 사용량을 집계하는 콜백 핸들러 (호출 노드/run name 별 breakdown 포함)"""
     def __init__(self):
         super().__init__()
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
         self.total_tokens = 0
+        self.total_cached_tokens = 0
+        self.usage_by_label: Dict[str, Dict[str, int]] = {}
+        self._run_labels: Dict[UUID, str] = {}
         logger.info("TokenCountingCallback initialized.")
 
-    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+    def _remember_run(self, run_id: UUID, tags, metadata, kwargs):
+        self._run_labels[run_id] = _resolve_usage_label(tags, metadata, kwargs.get("name"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, tags=None, metadata=None, **kwargs: Any) -> None:
+        self._remember_run(run_id, tags, metadata, kwargs)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, tags=None, metadata=None, **kwargs: Any) -> None:
+        self._remember_run(run_id, tags, metadata, kwargs)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._run_labels.pop(run_id, None)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID = None, **kwargs: Any) -> None:
         """LLM 호출이 끝날 때마다 자동으로 실행되어 토큰을 누적합니다."""
         logger.info("on_llm_end triggered.")
+        label = self._run_labels.pop(run_id, None) or _resolve_usage_label(kwargs.get("tags"), None, None)
 
         # response.llm_output이 None이 아닌지 먼저 확인
         if response.llm_output is not None:
             token_usage = response.llm_output.get("token_usage", {})
             if token_usage:
                 logger.info("Token usage found in on_llm_end.")
-                self.total_prompt_tokens += token_usage.get("prompt_tokens", 0)
-                self.total_completion_tokens += token_usage.get("completion_tokens", 0)
-                self.total_tokens += token_usage.get("total_tokens", 0)
+                self._record(
+                    label,
+                    token_usage.get("prompt_tokens", 0) or 0,
+                    token_usage.get("completion_tokens", 0) or 0,
+                    token_usage.get("total_tokens", 0) or 0,
+                    _extract_cached_tokens(token_usage),
+                )
             else:
                 logger.warning("No 'token_usage' key found in response.llm_output.")
         else:
             # llm_output이 None인 결정적인 경우를 로깅
             logger.warning("response.llm_output is None in on_llm_end. This may indicate an API error or content filtering.")
+
+    def _record(self, label: str, prompt_tokens: int, completion_tokens: int, total_tokens: int, cached_tokens: int):
+        self.total_prompt_tokens += prompt_tokens
+        self.total_completion_tokens += completion_tokens
+        self.total_tokens += total_tokens
+        self.total_cached_tokens += cached_tokens
+
+        entry = self.usage_by_label.setdefault(
+            label,
+            {"calls": 0, "input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cached_tokens": 0},
+        )
+        entry["calls"] += 1
+        entry["input_tokens"] += prompt_tokens
+        entry["output_tokens"] += completion_tokens
+        entry["total_tokens"] += total_tokens
+        entry["cached_tokens"] += cached_tokens
+
+        LLM_CALLS.inc(usage=label)
+        LLM_TOKENS.inc(prompt_tokens, usage=label, kind="input")
+        LLM_TOKENS.inc(completion_tokens, usage=label, kind="output")
+        LLM_TOKENS.inc(cached_tokens, usage=label, kind="cached")
+
+    def breakdown(self) -> Dict[str, Dict[str, int]]:
+        return {label: dict(entry) for label, entry in self.usage_by_label.items()}
@@ -1,53 +1,11 @@
 from ..database.hospital import getHospitalStandardName
 from ..common.logger import logger
+from ..common.sanitizer import REWRITER
+from ..common.hospital_index import hospital_alias_index
 
 import re
 import math
 
-# 🚨 Start: Medical Term Rewriting
-# 중요: 가장 길고 구체적인 키워드를 먼저 배치해야 합니다.
-MEDICAL_REWRITE = {
-    "피투성이": "혈액으로 오염된 상태",
-    "베였는데": "상처가 났는데", # '베이다'의 활용형
-    "베이다": "절상",
-    "베다": "절개하다",
-    "손목": "손목 부위",
-    "피": "출혈",
-    "정액": "정자 포함 체액",
-    "가슴": "흉부 또는 유방 조직",
-    "유혈": "출혈",
-    "찔리다": "관통 외상",
-    "맞다": "외상",
-    "죽다": "사망",
-    "사망하다": "사망",
-    "살인": "치명적 타해",
-    "폭행": "물리적 외상",
-    "공격": "신체 손상 유발 행위",
-    "자해": "자가 손상",
-    "사정": "정자 방출",
-    "성관계": "성적 접촉",
-    "성행위": "성적 행위",
-    "유두": "유방 돌출부",
-    "젖꼭지": "유방 돌출부",
-    "성기": "외부 생식기",
-    "음경": "남성 외부 생식기",
-    "질": "여성 생식관",
-    "자위": "자가 자극 행위",
-    "자살": "극단적 선택",
-    "목매다": "질식에 의한 사망",
-    "극단적 선택": "생명 위기 행동",
-    "마약": "불법 약물",
-    "대마": "칸나비스",
-    "코카인": "중추신경 자극 물질",
-    "필로폰": "메스암페타민",
-    "헤로인": "오피오이드 계열 물질",
-    "총": "화기",
-    "칼": "날붙이",
-    "폭발": "에너지 방출 사건",
-    "전쟁": "무력 충돌",
-    "고문": "강제적 신체 손상",
-}
-
 DO_NOT_RECOMMNAD_MEDICAL_TYPE = {"치과","치과의원", "치과병원", "한의원","한방병원","동네위원"}
 
 def haversine_distance(lat1, lon1, lat2, lon2):
@@ -70,19 +28,10 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     distance = R * c
     return distance
 
+# 🚨 Start: Medical Term Rewriting
+# 치환 사전은 sensitive_words.PROMPT_REWRITE, 매처는 sanitizer.REWRITER (MEDICAL_REWRITE 와 하나의 매처를 공유)
 def sanitize_prompt(text):
-    # 1. 문장 구조 자체를 바꾸는 규칙을 먼저 적용
-    # "어떻게 하면 좋아?" -> "관련해서 어떤 정보가 있을까?" 로 질문의 뉘앙스 변경
-    if "어떻게 하면 좋아?" in text or "어떻게 하냐고?" in text or "어떻게 해야 해?" in text:
-        text = text.replace("어떻게 하면 좋아?", "관련해서 어떤 정보가 있을까?")
-        text = text.replace("어떻게 하냐고?", "관련해서 어떤 정보가 있을까?")
-        text = text.replace("어떻게 해야 해?", "관련해서 어떤 정보가 있을까?")
-        
-    # 2. 기존의 키워드 치환 로직 실행 (MEDICAL_REWRITE 딕셔너리의 키-값 쌍들이 여기에 적용됨)
-    for k, v in MEDICAL_REWRITE.items():
-        text = text.replace(k, v)
-        
-    return text
+    return REWRITER.rewrite(text, "prompt")
 # 🚨 End: Medical Term Rewriting
 
 def calculate_similarity(s1, s2):
@@ -99,52 +48,14 @@ def calculate_similarity(s1, s2):
  
     return intersection / union
 
-def generate_hospital_aliases(name: str) -> list[str]:
-    """
-    병원 이름에 대한 기본 별칭을 생성합니다.
-    - '대학교'를 '대'로 축약합니다. (예: 건국대학교병원 -> 건국대병원)
-    - 이름 끝의 '병원'을 제거합니다. (예: 건국대병원 -> 건국대)
-    
-    Args:
-        name: 원본 병원 이름
-    
-    Returns:
-        생성된 별칭 리스트 (원본 이름 포함)
-    """
-    aliases = {name}
-    
-    # 처리할 이름들의 집합. 초기는 원본 이름만 포함.
-    queue = {name}
-    processed = set()
-
-    while queue:
-        current_name = queue.pop()
-        if current_name in processed:
-            continue
-        processed.add(current_name)
-
-        # 규칙 1: '대학교' -> '대'
-        if "대학교" in current_name:
-            alias = current_name.replace("대학교", "대")
-            if alias not in aliases:
-                aliases.add(alias)
-                queue.add(alias)
-
-        # 규칙 2: 이름 끝의 '병원' 제거
-        if current_name.endswith("병원"):
-            alias = current_name[:-2]
-            # '병원'만 있는 이름이거나, 제거 후 빈 문자열이 되는 경우 방지
-            if alias and alias not in aliases:
-                aliases.add(alias)
-                queue.add(alias)
-                
-    # 길이를 기준으로 내림차순 정렬하여 대표 이름이 먼저 오도록 함
-    return sorted(list(aliases), key=len, reverse=True)
-
-
 def getValidHospitalName(hospital: str):
     """병원 이름을 표준화하는 함수"""
     logger.info(f" NOHLOGGER : getValidHospitalName hospital: {hospital}")
+    if hospital_alias_index.ready:
+        # 인메모리 별칭 인덱스 (MySQL 조회 없음)
+        standard_name = hospital_alias_index.lookup(hospital)
+        logger.info(f"NOHLOGGER : getValidHospitalName index result: {standard_name}")
+        return standard_name or hospital
     result = getHospitalStandardName(hospital);
     logger.info(f"NOHLOGGER : getValidHospitalName result: {result}")
     if result and result.get("data"):
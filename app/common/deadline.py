@@ -0,0 +1,44 @@
+import time
+from typing import Optional
+
+from .logger import logger
+from .metrics import registry as metrics_registry
+from ..config import settings
+
+# 요청 단위 deadline. startQuery에서 설정해 RunnableConfig["configurable"]["deadline_at"]로 전달하고,
+# 각 단계는 남은 시간이 부족하면 선택 작업(검증, fallback 추론, 선제적 복원)을 건너뛴다.
+
+DEADLINE_SKIPS = metrics_registry.counter("aiga_deadline_skips_total", "Optional stages skipped because the request deadline was near", ("stage",))
+DEADLINE_EXCEEDED = metrics_registry.counter("aiga_deadline_exceeded_total", "Requests cancelled at the hard request deadline")
+
+
+def new_deadline() -> Optional[float]:
+    """REQUEST_DEADLINE_SECONDS 기준 절대 시각(time.monotonic). 0 이하면 deadline 없음"""
+    if settings.request_deadline_seconds <= 0:
+        return None
+    return time.monotonic() + settings.request_deadline_seconds
+
+
+def hard_timeout(deadline_at: Optional[float]) -> Optional[float]:
+    """startQuery의 강제 종료까지 남은 시간 (deadline + 유예, admission 대기 시간 포함)"""
+    if deadline_at is None:
+        return None
+    return max(0.0, deadline_at - time.monotonic()) + settings.request_deadline_grace_seconds
+
+
+def remaining(config) -> Optional[float]:
+    """남은 시간(초). deadline이 없으면 None"""
+    deadline_at = ((config or {}).get("configurable") or {}).get("deadline_at")
+    if deadline_at is None:
+        return None
+    return deadline_at - time.monotonic()
+
+
+def has_budget(config, needed_seconds: float, stage: str) -> bool:
+    """선택 단계 실행 전 확인. 남은 시간이 needed_seconds 보다 적으면 False (건너뛰기)"""
+    left = remaining(config)
+    if left is None or left >= needed_seconds:
+        return True
+    DEADLINE_SKIPS.inc(stage=stage)
+    logger.warning(f"Deadline budget low ({left:.2f}s left < {needed_seconds:.2f}s): skipping {stage}")
+    return False
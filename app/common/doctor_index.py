@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+from .metrics import registry as metrics_registry
+from .refreshing_index import RefreshingIndex
+from ..config import settings
+from ..database.doctorNames import getActiveDoctorNames
+
+# 의사 이름 -> doctor_id 인메모리 인덱스 (활성 의사만).
+# `doctorname LIKE '%name%'` 전체 스캔 대신 일치하는 doctor_id 목록을 구해 MySQL에는 id(IN)로만 조회한다.
+
+NAME_LOOKUPS = metrics_registry.counter("aiga_doctor_name_lookups_total", "Doctor name index lookups", ("result",))
+
+
+def _normalize(name: str) -> str:
+    return (name or "").strip().lower()
+
+
+def _ngrams(text: str) -> set:
+    if len(text) < 2:
+        return set(text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _NameSnapshot:
+    def __init__(self, rows: List[dict]):
+        ids_by_name: Dict[str, List[int]] = {}
+        for row in rows:
+            name = _normalize(row.get("doctorname"))
+            if name and row.get("doctor_id") is not None:
+                ids_by_name.setdefault(name, []).append(row["doctor_id"])
+        # 이름 단위 postings (같은 이름의 의사는 한 항목)
+        self.names: List[str] = list(ids_by_name)
+        self.ids: List[List[int]] = [ids_by_name[name] for name in self.names]
+        self.postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for gram in _ngrams(name) | set(name):
+                self.postings.setdefault(gram, []).append(position)
+        self.doctor_count = len(rows)
+
+    def __len__(self):
+        return self.doctor_count
+
+    def find(self, query: str) -> List[int]:
+        """이름에 query가 포함된 의사들의 doctor_id (LIKE '%query%')"""
+        postings = [self.postings.get(gram) for gram in _ngrams(query)]
+        if not postings or not all(postings):
+            return []
+        doctor_ids = []
+        for position in min(postings, key=len):
+            if query in self.names[position]:
+                doctor_ids.extend(self.ids[position])
+        return doctor_ids
+
+
+class DoctorNameIndex(RefreshingIndex):
+    name = "doctor_name"
+
+    @property
+    def enabled(self) -> bool:
+        return settings.doctor_name_index_enable
+
+    @property
+    def refresh_seconds(self) -> int:
+        return settings.doctor_name_index_refresh_seconds
+
+    def _fetch_rows(self) -> list:
+        return getActiveDoctorNames()
+
+    def _build(self, rows: list) -> _NameSnapshot:
+        return _NameSnapshot(rows)
+
+    def find_ids(self, names: Union[str, Iterable[str]]) -> Optional[List[int]]:
+        """
+        이름(또는 이름 목록)에 부분 일치하는 doctor_id 목록 (중복 제거, 입력 순서 유지).
+        인덱스가 준비되지 않았거나 빈 이름이 있거나 결과가 DOCTOR_NAME_INDEX_MAX_IDS를 넘으면 None
+        (호출부는 기존 LIKE 쿼리로 처리).
+        """
+        snapshot = self._snapshot
+        if not self.ready:
+            return None
+        queries = [names] if isinstance(names, str) else list(names)
+        queries = [_normalize(query) for query in queries]
+        if not queries or not all(queries):
+            return None
+        doctor_ids = []
+        seen = set()
+        for query in queries:
+            for doctor_id in snapshot.find(query):
+                if doctor_id not in seen:
+                    seen.add(doctor_id)
+                    doctor_ids.append(doctor_id)
+        if len(doctor_ids) > settings.doctor_name_index_max_ids:
+            NAME_LOOKUPS.inc(result="too_many")
+            return None
+        NAME_LOOKUPS.inc(result="hit" if doctor_ids else "miss")
+        return doctor_ids
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            **super().stats(),
+            "distinct_names": len(snapshot.names) if snapshot else 0,
+            "ngrams": len(snapshot.postings) if snapshot else 0,
+            "max_ids": settings.doctor_name_index_max_ids,
+        }
+
+
+doctor_name_index = DoctorNameIndex()
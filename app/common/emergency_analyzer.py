@@ -1,15 +1,7 @@
 import re
 from typing import Optional, Any
-from kiwipiepy import Kiwi
 from ..common.logger import logger
-
-# Kiwi 형태소 분석기 인스턴스 생성 (한 번만 실행)
-try:
-    kiwi = Kiwi()
-    logger.info("Kiwipiepy Kiwi 형태소 분석기 초기화 완료.")
-except Exception as e:
-    kiwi = None
-    logger.error(f"Kiwipiepy Kiwi 형태소 분석기 초기화 실패: {e}", exc_info=True)
+from ..common.startup import get_kiwi
 
 # 응급 상황을 탐지하기 위한 키워드 리스트
 EMERGENCY_KEYWORDS = ["응급실", "비상상황", "죽을거 같아"]
@@ -23,6 +15,7 @@ def detect_emergency_situation_internal(text: str, tokens: Optional[list[Any]] =
     Returns:
         bool: 응급 상황 키워드가 탐지되면 True, 아니면 False
     """
+    kiwi = get_kiwi()
     if not kiwi:
         logger.warning("Kiwi 분석기가 없어 응급 상황 분석을 건너뜁니다.")
         return False
@@ -2,6 +2,7 @@
 import json
 import re
 from ..common.logger import logger
+from ..common.callbacks import usage_config
 from typing import List, Dict, Any, Optional
 
 from langchain_core.messages import BaseMessage, ToolMessage, HumanMessage
@@ -70,7 +71,7 @@ Sentence: "{text}"
 JSON:"""
 
     try:
-        response = await llm.ainvoke(prompt)
+        response = await llm.ainvoke(prompt, config=usage_config("entity_extraction"))
         cleaned_json_str = re.sub(r'```json\s*|\s*```', '', response.content.strip())
         entities = json.loads(cleaned_json_str)
         
@@ -247,7 +248,7 @@ async def extract_entities_for_routing(llm: AzureChatOpenAI, state: dict) -> dic
 JSON:
 """
     try:
-        response = await llm.ainvoke(prompt)
+        response = await llm.ainvoke(prompt, config=usage_config("entity_extraction"))
         logger.debug(f"Entity extraction for routing raw response: {response.content}")
         cleaned_json_str = re.sub(r'```json\s*|\s*```', '', response.content.strip())
         entities = json.loads(cleaned_json_str)
@@ -331,7 +332,7 @@ Also consider the previously confirmed departments from the entity_history.
 Most recent department:"""
     
     try:
-        response = await llm.ainvoke(prompt)
+        response = await llm.ainvoke(prompt, config=usage_config("entity_extraction"))
         department = response.content.strip()
         logger.debug(f"Specialized department extraction raw response: {department}")
 
@@ -2,6 +2,7 @@ from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 import asyncio
 import logging
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,8 @@ async def get_address_from_coordinates(latitude: float, longitude: float) -> str
         
     try:
         # Nominatim은 비동기를 직접 지원하지 않으므로 asyncio.to_thread를 사용합니다.
-        location = await asyncio.to_thread(geocode_reverse, (latitude, longitude))
+        with span("geocoding"):
+            location = await asyncio.to_thread(geocode_reverse, (latitude, longitude))
         if location:
             logger.info(f"Geocoded ({latitude}, {longitude}) to: {location.address}")
             return location.address
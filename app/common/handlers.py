@@ -10,12 +10,7 @@ from ..common.location_analyzer import detect_forbidden_recommendation_internal
 from ..common.geocoder import get_address_from_coordinates
 from app.config import settings
 from ..introduce import EMERGENCY_INTRODUCTION # <--- 이 라인 추가
-from kiwipiepy import Kiwi # Kiwi 형태소 분석기 임포트 
-# Kiwi 형태소 분석기 초기화 (핸들러 모듈에서 한번만)
-kiwi = Kiwi()
-
-# Kiwi 형태소 분석기 초기화 (핸들러 모듈에서 한번만)
-kiwi = Kiwi()
+from ..common.startup import get_kiwi
 
 # 현재 위치 질문 감지를 위한 키워드 (기존 handle_current_location_query 로직에서 추출)
 CURRENT_LOCATION_KEYWORDS = {
@@ -39,6 +34,7 @@ async def classify_and_handle_initial_requests(state: dict, config: RunnableConf
     # 각 토큰 객체에서 .form (원형), .lemma (기본형), .tag (품사) 등을 사용
     analyzed_tokens = []
     try:
+        kiwi = get_kiwi()
         if kiwi:
             analyzed_tokens = kiwi.analyze(current_user_message)[0][0]
     except Exception as e:
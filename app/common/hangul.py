@@ -0,0 +1,86 @@
+from typing import Optional
+
+# 한글 음절 분해 / 초성 추출 / 편집 거리 유틸리티 (병원명 초성·오타 매칭용)
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+            "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+
+def is_syllable(char: str) -> bool:
+    return _HANGUL_BASE <= ord(char) <= _HANGUL_LAST
+
+
+def is_chosung(char: str) -> bool:
+    """호환용 자음(ㄱ~ㅎ) 중 초성으로 쓰일 수 있는 글자인지"""
+    return char in _CHOSUNG_SET
+
+
+def has_chosung(text: str) -> bool:
+    return any(char in _CHOSUNG_SET for char in text)
+
+
+def to_chosung(text: str) -> str:
+    """음절은 초성으로, 그 외 글자는 그대로 (예: '서울아산' -> 'ㅅㅇㅇㅅ', '서울ㅇㅅ' -> 'ㅅㅇㅇㅅ')"""
+    chars = []
+    for char in text:
+        if is_syllable(char):
+            chars.append(CHOSUNG[(ord(char) - _HANGUL_BASE) // 588])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def decompose(text: str) -> str:
+    """음절을 초성/중성/종성 자모로 분해 (예: '병원' -> 'ㅂㅕㅇㅇㅝㄴ')"""
+    chars = []
+    for char in text:
+        if is_syllable(char):
+            code = ord(char) - _HANGUL_BASE
+            chars.append(CHOSUNG[code // 588])
+            chars.append(JUNGSUNG[(code % 588) // 28])
+            chars.append(JONGSUNG[code % 28])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def matches_chosung_pattern(pattern: str, text: str, start: int) -> bool:
+    """text[start:]가 pattern과 위치별로 일치하는지. pattern의 초성 글자는 text 음절의 초성과 비교한다"""
+    for offset, expected in enumerate(pattern):
+        actual = text[start + offset]
+        if expected == actual:
+            continue
+        if expected in _CHOSUNG_SET and is_syllable(actual) and CHOSUNG[(ord(actual) - _HANGUL_BASE) // 588] == expected:
+            continue
+        return False
+    return True
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """편집 거리. max_distance를 넘으면 None (대각선 주변만 계산하고 조기 종료)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [max_distance + 1] * len(b)
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        row_min = current[0] if low == 1 else max_distance + 1
+        for j in range(low, high + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return None
+        previous = current
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
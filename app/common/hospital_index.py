@@ -0,0 +1,234 @@
+from typing import Dict, List, Optional, Tuple
+
+from .hangul import bounded_levenshtein, decompose, has_chosung, matches_chosung_pattern, to_chosung
+from .logger import logger
+from .metrics import registry as metrics_registry
+from .refreshing_index import RefreshingIndex
+from ..config import settings
+from ..database.hospital import getHospitalAliasRows
+
+# 병원 별칭(hospital_alias) 인메모리 인덱스.
+# 기존 getHospitalStandardName 의 `alias_name LIKE '%x%' ORDER BY public_score DESC LIMIT 1` 과 같은 결과를
+# MySQL 없이 반환한다. 기동 시 한 번 적재하고 HOSPITAL_ALIAS_REFRESH_SECONDS 마다 다시 적재한다.
+# 부분 일치가 없으면 초성 입력('ㅅㅂㄹㅅ', '서울ㅇㅅ병원')과 오타(자모 단위 편집 거리)까지 로컬에서 처리한다.
+
+ALIAS_LOOKUPS = metrics_registry.counter("aiga_hospital_alias_lookups_total", "Hospital alias index lookups", ("result",))
+
+
+def generate_hospital_aliases(name: str) -> list[str]:
+    """
+    병원 이름에 대한 기본 별칭을 생성합니다.
+    - '대학교'를 '대'로 축약합니다. (예: 건국대학교병원 -> 건국대병원)
+    - 이름 끝의 '병원'을 제거합니다. (예: 건국대병원 -> 건국대)
+
+    Args:
+        name: 원본 병원 이름
+
+    Returns:
+        생성된 별칭 리스트 (원본 이름 포함)
+    """
+    aliases = {name}
+
+    # 처리할 이름들의 집합. 초기는 원본 이름만 포함.
+    queue = {name}
+    processed = set()
+
+    while queue:
+        current_name = queue.pop()
+        if current_name in processed:
+            continue
+        processed.add(current_name)
+
+        # 규칙 1: '대학교' -> '대'
+        if "대학교" in current_name:
+            alias = current_name.replace("대학교", "대")
+            if alias not in aliases:
+                aliases.add(alias)
+                queue.add(alias)
+
+        # 규칙 2: 이름 끝의 '병원' 제거
+        if current_name.endswith("병원"):
+            alias = current_name[:-2]
+            # '병원'만 있는 이름이거나, 제거 후 빈 문자열이 되는 경우 방지
+            if alias and alias not in aliases:
+                aliases.add(alias)
+                queue.add(alias)
+
+    # 길이를 기준으로 내림차순 정렬하여 대표 이름이 먼저 오도록 함
+    return sorted(list(aliases), key=len, reverse=True)
+
+
+def _normalize(name: str) -> str:
+    # MySQL utf8mb4_general_ci 비교와 맞추기 위해 대소문자 무시, 호출부와 같이 공백 제거
+    return (name or "").replace(" ", "").lower()
+
+
+def _ngrams(text: str) -> set:
+    if len(text) < 2:
+        return set(text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _AliasSnapshot:
+    """한 번 적재된 불변 인덱스. 새로 적재할 때는 통째로 교체한다"""
+
+    def __init__(self, rows: List[dict]):
+        # public_score 내림차순(NULL은 뒤로) = 배열 순서. 이후 모든 후보 목록은 순서(rank)로 정렬된 상태를 유지한다
+        ranked = sorted(
+            (row for row in rows if row.get("alias_name") and row.get("standard_name")),
+            key=lambda row: (row.get("public_score") is None, -(row.get("public_score") or 0)),
+        )
+        self.aliases: List[str] = [_normalize(row["alias_name"]) for row in ranked]
+        self.standard_names: List[str] = [row["standard_name"] for row in ranked]
+        self.exact: Dict[str, int] = {}
+        self.normalized: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+        # 초성 문자열과 그 bigram, 별칭 변형(generate_hospital_aliases)별 (글자 수, 자모 분해 문자열) (초성/오타 매칭용)
+        self.chosung: List[str] = [to_chosung(alias) for alias in self.aliases]
+        self.jamo_variants: List[Tuple[Tuple[int, str], ...]] = [
+            tuple((len(variant), decompose(variant)) for variant in generate_hospital_aliases(alias))
+            for alias in self.aliases
+        ]
+        self.chosung_postings: Dict[str, List[int]] = {}
+        # 자모 bigram -> 순위 (별칭 변형 전체의 합집합, 오타 후보 필터용)
+        self.jamo_postings: Dict[str, List[int]] = {}
+
+        for rank, alias in enumerate(self.aliases):
+            self.exact.setdefault(alias, rank)
+            for gram in _ngrams(alias) | set(alias):
+                self.postings.setdefault(gram, []).append(rank)
+            for gram in _ngrams(self.chosung[rank]):
+                self.chosung_postings.setdefault(gram, []).append(rank)
+            for gram in set().union(*(_ngrams(jamo) for _, jamo in self.jamo_variants[rank])):
+                self.jamo_postings.setdefault(gram, []).append(rank)
+            for key in generate_hospital_aliases(alias):
+                self.normalized.setdefault(key, rank)
+            for key in generate_hospital_aliases(_normalize(self.standard_names[rank])):
+                self.normalized.setdefault(key, rank)
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def find_substring(self, query: str) -> Optional[int]:
+        """query를 포함하는 별칭 중 가장 높은 순위 (LIKE '%query%' ORDER BY public_score DESC LIMIT 1)"""
+        if not query:
+            return 0 if self.aliases else None
+        # 정확히 일치하는 별칭이 있으면 그보다 높은 순위만 확인하면 된다
+        upper = self.exact.get(query, len(self.aliases))
+        grams = _ngrams(query)
+        postings = [self.postings.get(gram) for gram in grams]
+        if not all(postings):
+            return None
+        for rank in min(postings, key=len):
+            if rank >= upper:
+                break
+            if query in self.aliases[rank]:
+                return rank
+        return upper if upper < len(self.aliases) else None
+
+    def find_normalized(self, query: str) -> Optional[int]:
+        """'대학교'->'대', '병원' 제거 등으로 만든 키가 일치하는 별칭 (부분 일치가 없을 때의 보조 탐색)"""
+        ranks = [self.normalized[key] for key in generate_hospital_aliases(query) if key in self.normalized]
+        return min(ranks) if ranks else None
+
+    def find_chosung(self, query: str) -> Optional[int]:
+        """초성이 섞인 입력: 초성 문자열로 후보를 찾고, 초성이 아닌 글자는 음절 그대로 일치하는지 확인"""
+        pattern = to_chosung(query)
+        postings = [self.chosung_postings.get(gram) for gram in _ngrams(pattern)]
+        if not postings or not all(postings):
+            return None
+        for rank in min(postings, key=len):
+            chosung = self.chosung[rank]
+            start = chosung.find(pattern)
+            while start != -1:
+                if matches_chosung_pattern(query, self.aliases[rank], start):
+                    return rank
+                start = chosung.find(pattern, start + 1)
+        return None
+
+    def find_fuzzy(self, query: str, max_distance: int) -> Optional[int]:
+        """
+        오타 허용 매칭: 별칭(또는 '병원' 등을 뗀 변형)과의 자모 단위 편집 거리가 max_distance 이하인 것 중
+        (거리, 순위)가 가장 작은 별칭.
+        자모 편집 하나는 음절 경계를 옮길 수 있어(빈 종성은 분해 시 사라짐, '간아' -> '가나') 음절 단위로는 거를 수 없으므로,
+        자모 bigram으로 거른다: 편집 하나는 query의 bigram을 최대 2개 깨뜨리므로, 거리 k 이하인 후보에는
+        query bigram 위치 중 (bigram 수 - 2k)개 이상이 나타난다.
+        """
+        query_jamo = decompose(query)
+        grams = [query_jamo[i:i + 2] for i in range(len(query_jamo) - 1)]
+        required = len(grams) - 2 * max_distance
+        if required < 1:
+            return None
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for rank in self.jamo_postings.get(gram, ()):
+                counts[rank] = counts.get(rank, 0) + 1
+        best = None
+        for rank in sorted(rank for rank, count in counts.items() if count >= required):
+            for length, jamo in self.jamo_variants[rank]:
+                if abs(length - len(query)) > max_distance:
+                    continue
+                distance = bounded_levenshtein(query_jamo, jamo, max_distance)
+                if distance is not None and (best is None or distance < best[0]):
+                    best = (distance, rank)
+            if best and best[0] == 0:
+                break
+        return best[1] if best else None
+
+
+class HospitalAliasIndex(RefreshingIndex):
+    name = "hospital_alias"
+
+    @property
+    def enabled(self) -> bool:
+        return settings.hospital_alias_index_enable
+
+    @property
+    def refresh_seconds(self) -> int:
+        return settings.hospital_alias_refresh_seconds
+
+    def _fetch_rows(self) -> list:
+        return getHospitalAliasRows().get("data") or []
+
+    def _build(self, rows: list) -> _AliasSnapshot:
+        return _AliasSnapshot(rows)
+
+    def lookup(self, hospital: str) -> Optional[str]:
+        """표준 병원명. 일치하는 별칭이 없으면 None (인덱스가 준비되지 않았으면 호출하지 말 것)"""
+        snapshot = self._snapshot
+        query = _normalize(hospital)
+        rank = snapshot.find_substring(query)
+        if rank is not None:
+            ALIAS_LOOKUPS.inc(result="hit")
+            return snapshot.standard_names[rank]
+        rank = snapshot.find_normalized(query)
+        if rank is not None:
+            ALIAS_LOOKUPS.inc(result="normalized")
+            return snapshot.standard_names[rank]
+        if has_chosung(query):
+            rank = snapshot.find_chosung(query)
+            if rank is not None:
+                ALIAS_LOOKUPS.inc(result="chosung")
+                return snapshot.standard_names[rank]
+        if settings.hospital_fuzzy_max_distance > 0 and len(query) >= settings.hospital_fuzzy_min_length:
+            # 짧은 이름은 오타 한 개까지만 허용
+            max_distance = settings.hospital_fuzzy_max_distance if len(query) > 4 else 1
+            rank = snapshot.find_fuzzy(query, max_distance)
+            if rank is not None:
+                ALIAS_LOOKUPS.inc(result="fuzzy")
+                logger.info(f"Hospital alias fuzzy match: '{hospital}' -> '{snapshot.aliases[rank]}'")
+                return snapshot.standard_names[rank]
+        ALIAS_LOOKUPS.inc(result="miss")
+        return None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            **super().stats(),
+            "normalized_keys": len(snapshot.normalized) if snapshot else 0,
+            "ngrams": len(snapshot.postings) if snapshot else 0,
+            "jamo_ngrams": len(snapshot.jamo_postings) if snapshot else 0,
+        }
+
+
+hospital_alias_index = HospitalAliasIndex()
@@ -0,0 +1,203 @@
+import importlib.util
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+from langchain_openai import AzureChatOpenAI
+
+from .logger import logger
+from .metrics import registry as metrics_registry
+from ..config import settings
+
+# 모든 AzureChatOpenAI 클라이언트(agent / summary / sql agent 등)가 엔드포인트별로 하나의 HTTP 커넥션 풀을 공유하도록 하는 팩토리.
+# 클라이언트마다 따로 풀을 만들면 첫 호출마다 TLS 핸드셰이크가 반복된다.
+
+HTTP_INFLIGHT = metrics_registry.gauge("aiga_llm_http_inflight", "In-flight LLM HTTP requests (including those waiting for a pooled connection)", ("endpoint",))
+HTTP_POOL_WAITING = metrics_registry.gauge("aiga_llm_http_pool_waiting", "LLM HTTP requests beyond max connections (waiting for the pool)", ("endpoint",))
+HTTP_POOL_CONNECTIONS = metrics_registry.gauge("aiga_llm_http_pool_connections", "Open connections in the shared LLM HTTP pool", ("endpoint", "state"))
+HTTP_POOL_MAX = metrics_registry.gauge("aiga_llm_http_pool_max_connections", "Configured max connections of the shared LLM HTTP pool", ("endpoint",))
+HTTP_REQUESTS = metrics_registry.counter("aiga_llm_http_requests_total", "LLM HTTP requests by status", ("endpoint", "status"))
+HTTP_SECONDS = metrics_registry.histogram(
+    "aiga_llm_http_request_seconds",
+    "LLM HTTP request latency (pool wait + network + model)",
+    ("endpoint",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+
+
+def _pool_connection_counts(transport) -> tuple:
+    """httpcore 풀의 활성/유휴 커넥션 수 (내부 속성이라 실패하면 None)"""
+    try:
+        connections = transport._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections) - idle, idle
+    except Exception:
+        return None
+
+
+class _PoolMetrics:
+    def __init__(self, endpoint: str, max_connections: int):
+        self.endpoint = endpoint
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._inflight = 0
+        HTTP_POOL_MAX.set(max_connections, endpoint=endpoint)
+
+    def started(self):
+        with self._lock:
+            self._inflight += 1
+            inflight = self._inflight
+        HTTP_INFLIGHT.set(inflight, endpoint=self.endpoint)
+        HTTP_POOL_WAITING.set(max(0, inflight - self.max_connections), endpoint=self.endpoint)
+
+    def finished(self, transport, started_at: float, status: str):
+        with self._lock:
+            self._inflight -= 1
+            inflight = self._inflight
+        HTTP_INFLIGHT.set(inflight, endpoint=self.endpoint)
+        HTTP_POOL_WAITING.set(max(0, inflight - self.max_connections), endpoint=self.endpoint)
+        HTTP_REQUESTS.inc(endpoint=self.endpoint, status=status)
+        HTTP_SECONDS.observe(time.perf_counter() - started_at, endpoint=self.endpoint)
+        counts = _pool_connection_counts(transport)
+        if counts:
+            HTTP_POOL_CONNECTIONS.set(counts[0], endpoint=self.endpoint, state="active")
+            HTTP_POOL_CONNECTIONS.set(counts[1], endpoint=self.endpoint, state="idle")
+
+
+class _MeteredAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncHTTPTransport, metrics: _PoolMetrics):
+        self._transport = transport
+        self._metrics = metrics
+
+    async def handle_async_request(self, request):
+        started_at = time.perf_counter()
+        self._metrics.started()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            self._metrics.finished(self._transport, started_at, status)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.HTTPTransport, metrics: _PoolMetrics):
+        self._transport = transport
+        self._metrics = metrics
+
+    def handle_request(self, request):
+        started_at = time.perf_counter()
+        self._metrics.started()
+        status = "error"
+        try:
+            response = self._transport.handle_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            self._metrics.finished(self._transport, started_at, status)
+
+    def close(self):
+        self._transport.close()
+
+
+def _http2_enabled() -> bool:
+    if not settings.llm_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("LLM_HTTP2=true 이지만 h2 패키지가 설치되지 않아 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+        return False
+    return True
+
+
+def _endpoint_key(endpoint: str) -> str:
+    return urlsplit(endpoint or "").netloc or (endpoint or "default")
+
+
+class LLMClientPool:
+    """엔드포인트(host)별 공유 httpx 클라이언트 (async / sync 각각 하나)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._async_clients = {}
+        self._sync_clients = {}
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive,
+            keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(settings.azure_request_timeout, connect=settings.llm_http_connect_timeout_seconds)
+
+    def async_client(self, endpoint: str) -> httpx.AsyncClient:
+        key = _endpoint_key(endpoint)
+        client = self._async_clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                http2 = _http2_enabled()
+                metrics = _PoolMetrics(key, settings.llm_http_max_connections)
+                transport = httpx.AsyncHTTPTransport(limits=self._limits(), http2=http2, retries=0)
+                client = httpx.AsyncClient(transport=_MeteredAsyncTransport(transport, metrics), timeout=self._timeout())
+                self._async_clients[key] = client
+                logger.info(f"LLM HTTP pool 생성: {key} (max_connections={settings.llm_http_max_connections}, http2={http2})")
+        return client
+
+    def sync_client(self, endpoint: str) -> httpx.Client:
+        key = _endpoint_key(endpoint)
+        client = self._sync_clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._sync_clients.get(key)
+            if client is None:
+                metrics = _PoolMetrics(f"{key}#sync", settings.llm_http_max_connections)
+                transport = httpx.HTTPTransport(limits=self._limits(), http2=_http2_enabled(), retries=0)
+                client = httpx.Client(transport=_MeteredTransport(transport, metrics), timeout=self._timeout())
+                self._sync_clients[key] = client
+        return client
+
+    async def aclose(self):
+        with self._lock:
+            async_clients = list(self._async_clients.values())
+            sync_clients = list(self._sync_clients.values())
+            self._async_clients.clear()
+            self._sync_clients.clear()
+        for client in async_clients:
+            await client.aclose()
+        for client in sync_clients:
+            client.close()
+
+
+llm_client_pool = LLMClientPool()
+
+
+def create_chat_model(model: str, use_deployment: bool = False, **kwargs) -> AzureChatOpenAI:
+    """
+    공유 커넥션 풀을 사용하는 AzureChatOpenAI 생성.
+    use_deployment=True 이면 azure_deployment 로, 아니면 model_name 으로 모델을 지정한다 (기존 클라이언트 설정 유지).
+    """
+    endpoint = settings.azure_endpoint
+    params = {
+        "azure_endpoint": endpoint,
+        "api_key": settings.azure_key,
+        "api_version": settings.azure_api_version,
+        "temperature": 0,
+        "http_async_client": llm_client_pool.async_client(endpoint),
+        "http_client": llm_client_pool.sync_client(endpoint),
+    }
+    if use_deployment:
+        params["azure_deployment"] = model
+    else:
+        params["model_name"] = model
+    params.update(kwargs)
+    return AzureChatOpenAI(**params)
@@ -3,28 +3,20 @@
 import json
 import re
 from typing import Optional, Any
-from kiwipiepy import Kiwi
 from langchain_openai import AzureChatOpenAI
 from ..common.logger import logger
-from ..tools.location_dic import GROUP_LOCATION_EAMBIUS_RULES, LOCATION_NORMALIZATION_RULES, GROUP_LOCATION_EXPANSION_RULES
+from ..common.callbacks import usage_config
+from ..common.startup import get_kiwi
+from ..tools.location_dic import GROUP_LOCATION_EAMBIUS_RULES, GROUP_LOCATION_EXPANSION_RULES
 
 # 더 유연한 병원 이름 패턴 (e.g., 강릉아산병원, 서울대병원)
 # '병원' 앞에 두 글자 이상의 한글이 오는 경우를 병원 이름으로 간주
 hospital_pattern = re.compile(r'[가-힣]{2,}(?:대학교|대학|대)?병원')
 
 
-# Kiwi 형태소 분석기 인스턴스 생성
-# 모델 로딩 시 한 번만 실행
-try:
-    kiwi = Kiwi()
-    logger.info("Kiwipiepy Kiwi 형태소 분석기 초기화 완료.")
-except Exception as e:
-    kiwi = None
-    logger.error(f"Kiwipiepy Kiwi 형태소 분석기 초기화 실패: {e}", exc_info=True)
-
-
 # 금지된 추천(치과, 한의원 등) 요청을 탐지하기 위한 로직
 from ..common.common import DO_NOT_RECOMMNAD_MEDICAL_TYPE
+from ..common.location_lexicon import SIDO_RULE_BY_NAME, find_sido_rule, scan_location_terms
 
 # 추천, 순위, 비교 뉘앙스를 나타내는 단어의 기본형(lemma)
 RECOMMENDATION_HINTS = {
@@ -41,6 +33,7 @@ def detect_forbidden_recommendation_internal(text: str, tokens: Optional[list[An
     Returns:
         tuple[bool, Optional[str]]: (탐지 여부, 탐지된 금지어)
     """
+    kiwi = get_kiwi()
     if not kiwi:
         logger.warning("Kiwi 분석기가 없어 금지된 추천 분석을 건너뜁니다.")
         return False, None
@@ -51,12 +44,8 @@ def detect_forbidden_recommendation_internal(text: str, tokens: Optional[list[An
         else:
             analyzed_tokens = tokens
         
-        found_forbidden_term = None
-        # 사용자가 입력한 단어 형태 그대로 금지어와 일치하는지 먼저 확인
-        for term in DO_NOT_RECOMMNAD_MEDICAL_TYPE:
-            if term in text:
-                found_forbidden_term = term
-                break
+        # 사용자가 입력한 단어 형태 그대로 금지어와 일치하는지 먼저 확인 (가장 왼쪽, 가장 긴 금지어)
+        found_forbidden_term = scan_location_terms(text).leftmost("forbidden")
         
         # 텍스트에서 직접 일치하는 단어를 못찾았을 경우, 형태소 분석 결과로 재탐색
         if not found_forbidden_term:
@@ -93,6 +82,9 @@ PROXIMITY_STEMS = {
     "근처", "주변", "가깝다", "인근", "부근", "근방", "옆", "가까이", "가까운데"
 }
 
+# 직전 AI 메시지의 '근처' 검색 제안 표현 (location_lexicon 의 proximity 카테고리에 포함)
+AI_NEARBY_OFFER_TERMS = frozenset({"근처", "가까운", "주변", "가까이"})
+
 # 사용자 자신을 지칭하는 대명사/명사 집합
 USER_PROXY_NOUNS = {
     "나", "내", "저", "저의", "여기"
@@ -111,6 +103,7 @@ def classify_location_query(text: str) -> tuple[str, str | None, bool]:
             - 기준 명사: "NAMED_LOCATION"일 경우 추출된 명사, 그 외에는 None
             - is_nearby: '근처' 등 근접성 관련 단어 포함 여부 (True/False)
     """
+    kiwi = get_kiwi()
     if not kiwi:
         logger.warning("Kiwi 분석기가 없어 위치 분석을 건너뜁니다.")
         return "NONE", None, False
@@ -204,6 +197,7 @@ def analyze_other_location_request(text: str) -> bool:
     Returns:
         bool: 모호한 '다른 장소' 검색 요청이 맞으면 True, 아니면 False
     """
+    kiwi = get_kiwi()
     if not kiwi:
         logger.warning("Kiwi 분석기가 없어 '다른 장소 요청' 분석을 건너뜁니다.")
         return False
@@ -284,8 +278,8 @@ async def update_location_context(
     # 만약 현재 메시지에서 위치 의도가 명확히 드러나지 않았지만 (NONE),
     # 직전 AI 메시지에서 '근처' 검색을 제안했고 사용자가 긍정적으로 답변했다면 의도를 상속함.
     if classification == "NONE" and last_ai_message:
-        # AI 메시지에 '근처' 또는 '가까운'이 포함되어 있는지 확인
-        ai_offered_nearby = any(word in last_ai_message for word in ["근처", "가까운", "주변", "가까이"])
+        # AI 메시지에 '근처' 또는 '가까운'이 포함되어 있는지 확인 (공유 스캔의 proximity 매치 사용)
+        ai_offered_nearby = bool(AI_NEARBY_OFFER_TERMS.intersection(scan_location_terms(last_ai_message).terms("proximity")))
         
         # 사용자의 메시지가 긍정 답변(수락)인지 확인
         # 공백 제거 후 확인하거나 형태소 분석 결과 활용 (여기서는 간단히 패턴 매칭)
@@ -349,11 +343,8 @@ async def update_location_context(
 
         # 새로운 위치 컨텍스트 처리
         # 먼저, 문장 자체에서 명확하게 위치를 특정할 수 있는지 확인 (예: '서울 중구')
-        sido_in_message = None
-        for sido_long, sido_short in LOCATION_NORMALIZATION_RULES:
-            if sido_long in user_message or sido_short in user_message:
-                sido_in_message = sido_long
-                break
+        sido_rule = find_sido_rule(user_message)
+        sido_in_message = sido_rule[0] if sido_rule else None
         
         if sido_in_message:
             # '강원도 춘천'과 같은 케이스: 메시지에서 시/도를 찾았으므로 바로 컨텍스트를 확정합니다.
@@ -376,11 +367,8 @@ async def update_location_context(
         # 3b: 모호하지 않은 신규 위치 (하지만 시/도 정보가 필요할 수 있음)
         else:
             # anchor_noun이 시/도 이름인지 먼저 확인
-            normalized_sido = None
-            for sido_long, sido_short in LOCATION_NORMALIZATION_RULES:
-                if anchor_noun == sido_long or anchor_noun == sido_short:
-                    normalized_sido = sido_long  # 정식 명칭으로 통일
-                    break
+            sido_rule = SIDO_RULE_BY_NAME.get(anchor_noun)
+            normalized_sido = sido_rule[0] if sido_rule else None  # 정식 명칭으로 통일
             
             if normalized_sido:
                 # 시/도 이름이 맞을 경우, 바로 resolved 상태의 컨텍스트 추가
@@ -444,7 +432,7 @@ async def update_location_context(
 단어: "{anchor_noun}"
 대답:"""
                 try:
-                    llm_response = await llm.ainvoke(prompt)
+                    llm_response = await llm.ainvoke(prompt, config=usage_config("location_check"))
                     response_data = json.loads(llm_response.content.strip())
                     is_location = response_data.get("is_location", False)
                     is_national = response_data.get("is_national", False) # is_national 값 추가 확인
@@ -484,13 +472,9 @@ async def update_location_context(
     
     # 보류 중인 컨텍스트가 있고, 현재 메시지가 새로운 위치 쿼리가 아닐 때
     if pending_context_index != -1:
-        sido_in_message = None
-        # 사용자 답변에서 시/도 이름 추출
-        for sido_long, sido_short in LOCATION_NORMALIZATION_RULES:
-            # 메시지에 시/도 전체 이름 또는 축약명이 포함되어 있는지 확인
-            if sido_long in user_message or sido_short in user_message:
-                sido_in_message = sido_long # 정식 명칭으로 저장
-                break
+        # 사용자 답변에서 시/도 전체 이름 또는 축약명을 찾아 정식 명칭으로 저장
+        sido_rule = find_sido_rule(user_message)
+        sido_in_message = sido_rule[0] if sido_rule else None
         
         if sido_in_message:
             logger.info(f"명확화 답변 '{sido_in_message}' 수신. 보류 중인 위치 컨텍스트 해결 중.")
@@ -518,13 +502,10 @@ def check_location_info(current_message: str) -> dict:
     """
     logger.info(f"check_location_info: Analyzing message '{current_message}' for top-level regions.")
     
-    sido_names = {name for rule in LOCATION_NORMALIZATION_RULES for name in rule}
-    group_names = set(GROUP_LOCATION_EXPANSION_RULES.keys())
-    valid_regions = sido_names.union(group_names)
-
-    # Check if any valid region name is present as a substring in the message.
+    # Find every top-level region name present as a substring in the message (one lexicon scan).
     # This is more robust for handling Korean postpositions (e.g., "울산에서").
-    found_regions = [region for region in valid_regions if region in current_message]
+    scan = scan_location_terms(current_message)
+    found_regions = list(scan.terms("sido")) + list(scan.terms("group"))
     
     flag = {
         'has_location': False,
@@ -557,7 +538,7 @@ User request: "{user_message}"
 Respond with only "true" or "false".."""
 
     try:
-        response = await llm.ainvoke(prompt)
+        response = await llm.ainvoke(prompt, config=usage_config("proximity_check"))
         logger.debug(f"Proximity analysis with LLM. Query: '{user_message}', Raw Response: '{response.content}'")
         result = response.content.strip().lower()
         return result == "true"
@@ -0,0 +1,58 @@
+from typing import Optional, Tuple
+
+from ..common.common import DO_NOT_RECOMMNAD_MEDICAL_TYPE
+from ..common.multipattern import KeywordLexicon, LexiconScan, PatternRewriter
+from ..tools.location_dic import (
+    GPS_PROXIMITY_KEYWORDS,
+    GROUP_LOCATION_EAMBIUS_RULES,
+    GROUP_LOCATION_EXPANSION_RULES,
+    LOCATION_NORMALIZATION_RULES,
+    NAMED_PROXIMITY_KEYWORDS,
+)
+
+# 위치/의도 분석기가 공유하는 키워드 사전 (import 시 한 번 컴파일).
+# 카테고리:
+#   sido       - LOCATION_NORMALIZATION_RULES 의 긴 이름/짧은 이름 (순서 = 규칙 순서)
+#   group      - GROUP_LOCATION_EXPANSION_RULES 키
+#   ambiguous  - GROUP_LOCATION_EAMBIUS_RULES 키
+#   proximity  - GPS_PROXIMITY_KEYWORDS + NAMED_PROXIMITY_KEYWORDS
+#   forbidden  - DO_NOT_RECOMMNAD_MEDICAL_TYPE
+
+# 이름(긴/짧은) -> 처음 등장하는 정규화 규칙 (long, short)
+SIDO_RULE_BY_NAME = {}
+for _rule in LOCATION_NORMALIZATION_RULES:
+    for _name in _rule:
+        SIDO_RULE_BY_NAME.setdefault(_name, _rule)
+
+# 긴 이름 -> 짧은 이름 치환기 (normalize_location_in_question)
+SIDO_NORMALIZER = PatternRewriter(dict(LOCATION_NORMALIZATION_RULES))
+
+# 그룹명 길이 내림차순 (매 호출마다 정렬하지 않도록 미리 계산)
+GROUP_NAMES_BY_LENGTH = tuple(sorted(GROUP_LOCATION_EXPANSION_RULES.keys(), key=len, reverse=True))
+
+location_lexicon = KeywordLexicon({
+    "sido": [name for rule in LOCATION_NORMALIZATION_RULES for name in rule],
+    "group": list(GROUP_LOCATION_EXPANSION_RULES.keys()),
+    "ambiguous": list(GROUP_LOCATION_EAMBIUS_RULES.keys()),
+    "proximity": list(GPS_PROXIMITY_KEYWORDS) + list(NAMED_PROXIMITY_KEYWORDS),
+    "forbidden": sorted(DO_NOT_RECOMMNAD_MEDICAL_TYPE),
+})
+
+
+def scan_location_terms(text: str) -> LexiconScan:
+    """텍스트 한 번 스캔으로 시/도, 그룹, 모호 지역, 근접 표현, 금지 진료과 매치를 모두 구한다 (같은 텍스트는 캐시)"""
+    return location_lexicon.scan(text or "")
+
+
+def find_sido_rule(text: str) -> Optional[Tuple[str, str]]:
+    """
+    텍스트에 포함된 첫 번째 시/도 정규화 규칙 (long, short).
+    기존 `for long, short in LOCATION_NORMALIZATION_RULES: if long in text or short in text` 루프와 같은 결과.
+    """
+    name = scan_location_terms(text).first("sido")
+    return SIDO_RULE_BY_NAME[name] if name else None
+
+
+def has_top_level_region(text: str) -> bool:
+    """시/도 또는 그룹 지역명이 포함되어 있는지"""
+    return scan_location_terms(text).has("sido", "group")
@@ -1,6 +1,10 @@
+import atexit
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import random
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -41,6 +45,8 @@ class CustomFormatter(logging.Formatter):
                 logging.ERROR: self.format_str,
                 logging.CRITICAL: self.format_str
             }
+        # 레벨별 Formatter는 한 번만 생성 (레코드마다 새로 만들지 않음)
+        self._formatters = {}
     
     def _supports_color(self):
         """Windows 환경에서 색상 지원 여부 확인"""
@@ -57,12 +63,103 @@ class CustomFormatter(logging.Formatter):
             return False
     
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno, self.format_str)
-        formatter = logging.Formatter(log_fmt, datefmt='%Y-%m-%d %H:%M:%S')
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            formatter = logging.Formatter(self.FORMATS.get(record.levelno, self.format_str), datefmt='%Y-%m-%d %H:%M:%S')
+            self._formatters[record.levelno] = formatter
         return formatter.format(record)
 
+
+# LogRecord 기본 속성 (JSON 출력 시 extra 필드만 골라내기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (LOG_FORMAT=json). logger.info(..., extra={...}) 필드도 함께 출력"""
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "func": record.funcName,
+            "line": record.lineno,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """WARNING 미만 레코드를 rate 비율만 통과시킨다 (핫패스 로거용)"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+_SIMPLE_ARG_TYPES = (str, int, float, bool, type(None))
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    포맷팅을 리스너 스레드로 미루는 QueueHandler.
+    기본 QueueHandler.prepare()는 이벤트 루프에서 메시지를 포맷하므로, 인자가 불변 타입이면 그대로 넘긴다.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, _SIMPLE_ARG_TYPES) for value in values):
+                # dict/list 등 이후에 변경될 수 있는 인자는 지금 문자열로 고정
+                record.msg = record.getMessage()
+                record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_logger_map(raw: str) -> dict:
+    """"aiga_llm_server.sql=WARNING,aiga_llm_server.results=0.1" -> {name: value}"""
+    result = {}
+    for item in (raw or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip() and value.strip():
+            result[name.strip()] = value.strip()
+    return result
+
+
+_queue_listener = None
+
+
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """핫패스 전용 하위 로거 (예: get_logger("sql") -> aiga_llm_server.sql). LOG_LEVELS / LOG_SAMPLING 으로 제어"""
+    return logging.getLogger(f"aiga_llm_server.{name}")
+
+
 def setup_logger(log_level: str = "INFO"):
-    """로거 설정 - 24시간마다 자동 로그 파일 생성"""
+    """로거 설정 - 24시간마다 자동 로그 파일 생성, 파일/콘솔 I/O는 QueueListener 스레드에서 처리"""
     
     # 로그 디렉토리 생성 (Windows 환경 고려)
     try:
@@ -81,16 +178,20 @@ def setup_logger(log_level: str = "INFO"):
     # 상위 로거(루트)로의 이벤트 전파 방지 (중복 로그 출력 방지)
     logger.propagate = False
 
-    # 기존 핸들러 제거
+    # 기존 핸들러 / 리스너 제거 (main.py에서 다시 호출되는 경우)
+    _stop_queue_listener()
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
-    
+
+    use_json = os.getenv("LOG_FORMAT", "text") == "json"
+    handlers = []
+    notices = []
+
     # 콘솔 핸들러 (Windows 환경 고려)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_formatter = CustomFormatter()
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(JsonFormatter() if use_json else CustomFormatter())
+    handlers.append(console_handler)
 
     # LOG_HANDLER_TYPE 환경 변수를 확인하여 파일 핸들러 추가 여부 결정
     log_handler_type = os.getenv("LOG_HANDLER_TYPE", "default")
@@ -112,12 +213,12 @@ def setup_logger(log_level: str = "INFO"):
             file_handler.namer = lambda name: name.replace(".log", "") + ".log"  # 기본 .log 유지
             
             file_handler.setLevel(logging.DEBUG)
-            file_formatter = logging.Formatter(
+            file_formatter = JsonFormatter() if use_json else logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
             
             # 에러 전용 파일 핸들러 (24시간마다 자동 로테이션)
             error_handler = logging.handlers.TimedRotatingFileHandler(
@@ -135,17 +236,42 @@ def setup_logger(log_level: str = "INFO"):
             
             error_handler.setLevel(logging.ERROR)
             error_handler.setFormatter(file_formatter)
-            logger.addHandler(error_handler)
+            handlers.append(error_handler)
             
-            logger.info(f"Logger initialized with file handlers. Log directory: {log_dir}")
+            notices.append((logging.INFO, f"Logger initialized with file handlers. Log directory: {log_dir}"))
             
         except (PermissionError, OSError) as e:
             # 파일 생성 실패시 콘솔에만 출력
-            logger.warning(f"Log file creation failed: {e}. Console output only.")
+            notices.append((logging.WARNING, f"Log file creation failed: {e}. Console output only."))
+    else:
+        notices.append((logging.INFO, "LOG_HANDLER_TYPE is 'pm2'. Skipping file handler setup. PM2 will manage log files."))
+
+    # 이벤트 루프에서는 큐에 넣기만 하고, 포맷/쓰기는 리스너 스레드에서 처리
+    global _queue_listener
+    if os.getenv("LOG_QUEUE_ENABLE", "true") == "true":
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(DeferredQueueHandler(log_queue))
+        _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
     else:
-        logger.info("LOG_HANDLER_TYPE is 'pm2'. Skipping file handler setup. PM2 will manage log files.")
+        for handler in handlers:
+            logger.addHandler(handler)
+
+    # 하위 로거별 레벨 게이트 / 샘플링 (예: LOG_LEVELS=aiga_llm_server.sql=WARNING, LOG_SAMPLING=aiga_llm_server.results=0.05)
+    for name, level in _parse_logger_map(os.getenv("LOG_LEVELS")).items():
+        logging.getLogger(name).setLevel(getattr(logging, level.upper(), logging.INFO))
+    for name, rate in _parse_logger_map(os.getenv("LOG_SAMPLING")).items():
+        child = logging.getLogger(name)
+        for existing in [f for f in child.filters if isinstance(f, SamplingFilter)]:
+            child.removeFilter(existing)
+        child.addFilter(SamplingFilter(float(rate)))
+
+    for level, message in notices:
+        logger.log(level, message)
     
     return logger
 
+atexit.register(_stop_queue_listener)
+
 # 전역 로거 인스턴스
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
@@ -0,0 +1,183 @@
+import functools
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 여러 키워드를 한 번에 찾고 치환하는 컴파일된 매처.
+# 키워드를 길이 내림차순으로 묶은 단일 정규식(alternation)을 사용하므로, 같은 위치에서는 가장 긴 키워드가,
+# 전체적으로는 가장 왼쪽 매치가 선택된다 (leftmost-longest). 치환 결과는 다시 검사하지 않는다.
+# 겹치는 매치까지 모두 필요한 탐지 용도는 KeywordLexicon(Aho-Corasick)을 사용한다.
+
+
+class PatternRewriter:
+    def __init__(self, replacements: Dict[str, str]):
+        self.replacements = dict(replacements)
+        keys = sorted((key for key in self.replacements if key), key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(key) for key in keys)) if keys else None
+
+    def search(self, text: str) -> bool:
+        return bool(self._pattern and text and self._pattern.search(text))
+
+    def find_all(self, text: str) -> List[str]:
+        if not self._pattern or not text:
+            return []
+        return self._pattern.findall(text)
+
+    def rewrite(self, text: str) -> str:
+        if not self._pattern or not text:
+            return text
+        replacements = self.replacements
+        return self._pattern.sub(lambda match: replacements[match.group(0)], text)
+
+    def rewrite_and_find(self, text: str) -> Tuple[str, List[str]]:
+        """한 번의 스캔으로 (치환된 텍스트, 매치된 키워드 목록) 반환"""
+        if not self._pattern or not text:
+            return text, []
+        found = []
+        replacements = self.replacements
+
+        def _replace(match):
+            key = match.group(0)
+            found.append(key)
+            return replacements[key]
+
+        return self._pattern.sub(_replace, text), found
+
+
+class LexiconScan:
+    """KeywordLexicon.scan() 결과. 겹치는 매치를 포함한 모든 (start, term) 위치와 카테고리별 매치 용어"""
+
+    __slots__ = ("text", "hits", "_by_category", "_categories_of")
+
+    def __init__(self, text: str, hits: List[Tuple[int, str]], by_category: Dict[str, Tuple[str, ...]], categories_of: Dict[str, Dict[str, int]]):
+        self.text = text
+        self.hits = hits
+        self._by_category = by_category
+        self._categories_of = categories_of
+
+    def has(self, *categories: str) -> bool:
+        return any(category in self._by_category for category in categories)
+
+    def terms(self, category: str) -> Tuple[str, ...]:
+        """카테고리에서 매치된 용어 (중복 없이, 사전에 등록된 순서)"""
+        return self._by_category.get(category, ())
+
+    def first(self, category: str) -> Optional[str]:
+        """사전 순서상 가장 앞선 매치 용어 (기존 `for term in RULES: if term in text` 루프와 같은 결과)"""
+        terms = self._by_category.get(category)
+        return terms[0] if terms else None
+
+    def leftmost(self, category: str) -> Optional[str]:
+        """텍스트에서 가장 왼쪽, 같은 위치면 가장 긴 매치 용어"""
+        for _, term in self.hits:
+            if category in self._categories_of[term]:
+                return term
+        return None
+
+
+class KeywordLexicon:
+    """
+    카테고리별 키워드 집합을 하나의 Aho-Corasick 오토마톤으로 컴파일한 사전.
+    scan(text) 한 번으로 모든 카테고리의 매치(겹치는 매치 포함)를 구하므로, 여러 분석기가 같은 스캔 결과를 공유할 수 있다.
+    같은 텍스트에 대한 스캔 결과는 LRU 캐시에서 재사용된다.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], cache_size: int = 512):
+        # term -> {category: 카테고리 내 순서}
+        self.categories_of: Dict[str, Dict[str, int]] = {}
+        for category, terms in categories.items():
+            for order, term in enumerate(terms):
+                if term:
+                    self.categories_of.setdefault(term, {}).setdefault(category, order)
+        self._build()
+        self.scan = functools.lru_cache(maxsize=cache_size)(self._scan)
+
+    def _build(self):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+        for term in self.categories_of:
+            node = 0
+            for char in term:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    outputs.append([])
+                node = next_node
+            outputs[node].append(term)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(output) for output in outputs]
+
+    def _scan(self, text: str) -> LexiconScan:
+        if not text:
+            return LexiconScan(text, [], {}, self.categories_of)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        hits = []
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for term in outputs[node]:
+                hits.append((index - len(term) + 1, term))
+        hits.sort(key=lambda hit: (hit[0], -len(hit[1])))
+
+        found: Dict[str, Dict[str, int]] = {}
+        for _, term in hits:
+            for category, order in self.categories_of[term].items():
+                found.setdefault(category, {}).setdefault(term, order)
+        by_category = {
+            category: tuple(sorted(terms, key=terms.get))
+            for category, terms in found.items()
+        }
+        return LexiconScan(text, hits, by_category, self.categories_of)
+
+
+class MultiTableRewriter:
+    """
+    여러 치환표를 하나의 KeywordLexicon(Aho-Corasick)으로 컴파일한 매처. 치환표 이름이 카테고리가 된다.
+    같은 텍스트의 스캔 결과는 모든 치환표가 공유하고(LRU 캐시), 치환은 표별로 leftmost-longest
+    (PatternRewriter와 같은 규칙)로 적용한다. 같은 키의 치환값이 표마다 달라도 된다.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, str]], cache_size: int = 512):
+        self.tables = {name: dict(table) for name, table in tables.items()}
+        self.lexicon = KeywordLexicon({name: list(table) for name, table in self.tables.items()}, cache_size=cache_size)
+
+    def rewrite_and_find(self, text: str, table: str) -> Tuple[str, List[str]]:
+        """한 번의 스캔으로 (치환된 텍스트, 매치된 키워드 목록) 반환"""
+        if not text:
+            return text, []
+        replacements = self.tables[table]
+        parts, found = [], []
+        position = 0
+        # hits는 (시작 위치, -길이) 순이므로 처음 만나는 겹치지 않는 매치가 leftmost-longest
+        for start, term in self.lexicon.scan(text).hits:
+            if start < position or term not in replacements:
+                continue
+            parts.append(text[position:start])
+            parts.append(replacements[term])
+            found.append(term)
+            position = start + len(term)
+        if not found:
+            return text, []
+        parts.append(text[position:])
+        return "".join(parts), found
+
+    def rewrite(self, text: str, table: str) -> str:
+        return self.rewrite_and_find(text, table)[0]
@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from decimal import Decimal
+from typing import Any, List, Optional
+
+from .logger import logger
+from .metrics import registry as metrics_registry
+from ..config import settings
+
+# 검색 결과 "더 보기"용 keyset 페이지네이션 커서.
+# 커서에는 검색 형태(어떤 검색인지 + 다시 쿼리를 만들 인자)와 마지막 행의 정렬 키가 들어가며,
+# HMAC 서명으로 위변조를 막는다. /chat/more 는 LLM 없이 커서만으로 다음 페이지를 DB에서 바로 조회한다.
+
+CURSOR_DECODES = metrics_registry.counter("aiga_pagination_cursor_decodes_total", "Continuation cursor decodes", ("result",))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def pagination_enabled() -> bool:
+    """PAGINATION_ENABLE 이고 서명 키(PAGINATION_CURSOR_SECRET)가 설정된 경우에만 커서를 발급/해석한다"""
+    return settings.pagination_enable and bool(settings.pagination_cursor_secret)
+
+
+def check_pagination_config():
+    if settings.pagination_enable and not settings.pagination_cursor_secret:
+        logger.warning("PAGINATION_ENABLE=true but PAGINATION_CURSOR_SECRET is not set; next_cursor / /chat/more are disabled")
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(body: str) -> str:
+    digest = hmac.new(settings.pagination_cursor_secret.encode("utf-8"), body.encode("ascii"), hashlib.sha256).digest()
+    return _b64encode(digest[:16])
+
+
+def _dump_key(value: Any) -> list:
+    # total_score는 AVG 결과(DECIMAL)일 수 있어 타입을 보존해야 다음 페이지 비교(=)가 정확하다
+    if isinstance(value, Decimal):
+        return ["d", str(value)]
+    if isinstance(value, float):
+        return ["f", value]
+    return ["v", value]
+
+
+def _load_key(item: list) -> Any:
+    kind, value = item
+    if kind == "d":
+        return Decimal(value)
+    if kind == "f":
+        return float(value)
+    return value
+
+
+def encode_cursor(search: str, args: dict, sort_key: List[Any], page: int) -> str:
+    """
+    Args:
+        search: 다음 페이지를 조회할 검색 이름 (sql_tool.PAGINATED_SEARCHES 키)
+        args: 검색 쿼리를 다시 만들기 위한 인자 (JSON 직렬화 가능)
+        sort_key: 현재 페이지 마지막 행의 정렬 키 (ORDER BY 순서)
+        page: 다음 페이지 번호 (2부터)
+    """
+    payload = {
+        "s": search,
+        "a": args,
+        "k": [_dump_key(value) for value in sort_key],
+        "p": page,
+        "iat": int(time.time()),
+    }
+    body = _b64encode(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return f"{body}.{_sign(body)}"
+
+
+def decode_cursor(cursor: Optional[str]) -> dict:
+    """서명/만료를 확인한 커서 내용 {"search", "args", "sort_key", "page"}. 유효하지 않으면 InvalidCursor"""
+    try:
+        if not isinstance(cursor, str) or not cursor.isascii():
+            raise ValueError("non-ascii cursor")
+        body, signature = cursor.split(".", 1)
+        expected = _sign(body)
+    except ValueError:
+        CURSOR_DECODES.inc(result="malformed")
+        raise InvalidCursor("malformed cursor")
+    if not hmac.compare_digest(signature, expected):
+        CURSOR_DECODES.inc(result="bad_signature")
+        raise InvalidCursor("bad cursor signature")
+    try:
+        payload = json.loads(_b64decode(body))
+        decoded = {
+            "search": payload["s"],
+            "args": payload["a"],
+            "sort_key": [_load_key(item) for item in payload["k"]],
+            "page": int(payload["p"]),
+        }
+        issued_at = int(payload["iat"])
+    except (ValueError, KeyError, TypeError):
+        CURSOR_DECODES.inc(result="malformed")
+        raise InvalidCursor("malformed cursor")
+    if settings.pagination_cursor_ttl_seconds > 0 and time.time() - issued_at > settings.pagination_cursor_ttl_seconds:
+        CURSOR_DECODES.inc(result="expired")
+        raise InvalidCursor("cursor expired")
+    CURSOR_DECODES.inc(result="ok")
+    return decoded
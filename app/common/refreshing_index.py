@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from .logger import logger
+from .metrics import registry as metrics_registry
+
+# DB 테이블을 주기적으로 다시 읽어 만드는 인메모리 인덱스의 공통 부분 (병원 별칭, 의사 이름 등).
+# 서브클래스는 enabled / refresh_seconds / _fetch_rows / _build 를 구현한다.
+# 적재된 스냅샷은 불변이고, 새로 적재할 때는 참조만 교체하므로 조회 쪽은 락이 필요 없다.
+
+INDEX_ENTRIES = metrics_registry.gauge("aiga_memory_index_entries", "Entries loaded in an in-memory lookup index", ("index",))
+INDEX_REFRESHES = metrics_registry.counter("aiga_memory_index_refreshes_total", "In-memory lookup index reloads", ("index", "outcome"))
+
+
+class RefreshingIndex:
+    name = "index"
+
+    def __init__(self):
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.loaded_at: Optional[float] = None
+        self.last_refresh_seconds: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def refresh_seconds(self) -> int:
+        raise NotImplementedError
+
+    def _fetch_rows(self) -> list:
+        raise NotImplementedError
+
+    def _build(self, rows: list):
+        raise NotImplementedError
+
+    @property
+    def ready(self) -> bool:
+        return self.enabled and self._snapshot is not None
+
+    def refresh(self) -> int:
+        """테이블을 다시 읽어 인덱스를 교체 (동기, 스레드에서 호출). 빈 결과면 기존 인덱스 유지"""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            rows = self._fetch_rows()
+            if not rows and self._snapshot is not None:
+                # fetchData는 DB 오류 시 빈 결과를 돌려주므로, 기존 인덱스를 비우지 않는다
+                INDEX_REFRESHES.inc(index=self.name, outcome="empty")
+                logger.warning(f"{self.name} index refresh returned no rows; keeping the previous index.")
+                return len(self._snapshot)
+            snapshot = self._build(rows)
+            self._snapshot = snapshot
+            self.loaded_at = time.time()
+            self.last_refresh_seconds = round(time.perf_counter() - started, 3)
+            INDEX_ENTRIES.set(len(snapshot), index=self.name)
+            INDEX_REFRESHES.inc(index=self.name, outcome="ok")
+            logger.info(f"{self.name} index loaded: {len(snapshot)} entries in {self.last_refresh_seconds:.3f}s")
+            return len(snapshot)
+
+    def start(self):
+        if not self.enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                INDEX_REFRESHES.inc(index=self.name, outcome="error")
+                logger.error(f"{self.name} index refresh failed: {e}", exc_info=True)
+            await asyncio.sleep(self.refresh_seconds)
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "entries": len(snapshot) if snapshot else 0,
+            "loaded_at": self.loaded_at,
+            "last_refresh_seconds": self.last_refresh_seconds,
+            "refresh_interval_seconds": self.refresh_seconds,
+        }
@@ -1,15 +1,13 @@
 # app/common/sanitizer.py
 import re
-from kiwipiepy import Kiwi
 from ..common.logger import logger
-from ..common.sensitive_words import MEDICAL_REWRITE
+from ..common.startup import get_kiwi
+from ..common.sensitive_words import MEDICAL_REWRITE, PROMPT_REWRITE
+from ..common.multipattern import MultiTableRewriter
 
-# Initialize Kiwi tokenizer
-try:
-    kiwi = Kiwi()
-except Exception as e:
-    logger.error(f"Failed to initialize Kiwi: {e}")
-    kiwi = None
+# Compiled once from both dictionaries: one scan detects every keyword, then each table is rewritten
+# leftmost-longest (replacements are not re-scanned). The tables stay separate because some keys map differently.
+REWRITER = MultiTableRewriter({"medical": MEDICAL_REWRITE, "prompt": PROMPT_REWRITE})
 
 # Words to preserve during sanitization for location context
 LOCATION_KEYWORDS = {"근처", "주변", "가깝다", "인근", "부근", "근방", "옆", "가까이", "가까운데", "여기"}
@@ -19,6 +17,7 @@ def _sanitize_with_kiwi(text: str) -> str:
     (Internal) Aggressively sanitizes the input text by extracting nouns, verbs, adjectives
     and key location words to simplify the query for content filters.
     """
+    kiwi = get_kiwi()
     if not kiwi:
         logger.error("Kiwi not initialized. Returning original text.")
         return text
@@ -53,6 +52,7 @@ def sanitize_prompt(text: str) -> str:
     """
     # 1. Check for symptom lemmas using Kiwi for more robust detection
     found_symptom_lemma = False
+    kiwi = get_kiwi()
     if kiwi:
         # Common symptom-related verb/adjective stems
         SYMPTOM_STEMS = {
@@ -70,24 +70,20 @@ def sanitize_prompt(text: str) -> str:
         except Exception as e:
             logger.error(f"Kiwi tokenization failed during symptom check for '{text}': {e}")
 
-    # 2. Fallback/secondary check for keywords in the dictionary
-    found_sensitive_in_dict = any(word in text for word in MEDICAL_REWRITE.keys())
+    # 2. Detect and rewrite MEDICAL_REWRITE keywords in a single leftmost-longest pass
+    rewritten_text, found_keywords = REWRITER.rewrite_and_find(text, "medical")
+    found_sensitive_in_dict = bool(found_keywords)
 
     # 3. A query is sensitive if either check passes
     is_sensitive_query = found_symptom_lemma or found_sensitive_in_dict
 
-    # 4. Rewrite the text using the MEDICAL_REWRITE dictionary regardless
-    rewritten_text = text
-    for old, new in MEDICAL_REWRITE.items():
-        rewritten_text = rewritten_text.replace(old, new)
-
     final_sanitized_text = ""
-    # 5. Conditionally apply aggressive sanitization on the rewritten text
+    # 4. Conditionally apply aggressive sanitization on the rewritten text
     if is_sensitive_query:
         logger.info(f"Sensitive query detected in '{text}'. Applying full Kiwi sanitization.")
         final_sanitized_text = _sanitize_with_kiwi(rewritten_text)
     else:
-        # 6. Return only the rewritten text if not sensitive
+        # 5. Return only the rewritten text if not sensitive
         logger.info(f"No sensitive symptoms/keywords detected. Standard rewrite applied: '{text}' -> '{rewritten_text}'")
         final_sanitized_text = rewritten_text
     
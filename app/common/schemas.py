@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class ChatRequest(BaseModel):
     message: str
@@ -9,6 +9,14 @@ class ChatRequest(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
 
+class DoctorsRequest(BaseModel):
+    doctor_ids: List[int]
+    session_id: Optional[str] = None
+
+class MoreRequest(BaseModel):
+    cursor: str
+    session_id: Optional[str] = None
+
 class StopRequest(BaseModel):
     session_id: str
 
@@ -41,3 +41,51 @@ MEDICAL_REWRITE = {
     "전쟁": "무력 충돌",
     "고문": "강제적 신체 손상",
 }
+
+# common.sanitize_prompt 용: 질문 뉘앙스를 바꾸는 문장 규칙 + 용어 치환.
+# "어떻게 하면 좋아?" -> "관련해서 어떤 정보가 있을까?" 로 질문의 뉘앙스 변경.
+# MEDICAL_REWRITE 와 일부 키('피', '정액', '베다')의 치환값이 달라 사전을 합치지 않고 매처만 공유한다 (sanitizer.REWRITER).
+PROMPT_REWRITE = {
+    "어떻게 하면 좋아?": "관련해서 어떤 정보가 있을까?",
+    "어떻게 하냐고?": "관련해서 어떤 정보가 있을까?",
+    "어떻게 해야 해?": "관련해서 어떤 정보가 있을까?",
+    "피투성이": "혈액으로 오염된 상태",
+    "베였는데": "상처가 났는데", # '베이다'의 활용형
+    "베이다": "절상",
+    "베다": "절개하다",
+    "손목": "손목 부위",
+    "피": "출혈",
+    "정액": "정자 포함 체액",
+    "가슴": "흉부 또는 유방 조직",
+    "유혈": "출혈",
+    "찔리다": "관통 외상",
+    "맞다": "외상",
+    "죽다": "사망",
+    "사망하다": "사망",
+    "살인": "치명적 타해",
+    "폭행": "물리적 외상",
+    "공격": "신체 손상 유발 행위",
+    "자해": "자가 손상",
+    "사정": "정자 방출",
+    "성관계": "성적 접촉",
+    "성행위": "성적 행위",
+    "유두": "유방 돌출부",
+    "젖꼭지": "유방 돌출부",
+    "성기": "외부 생식기",
+    "음경": "남성 외부 생식기",
+    "질": "여성 생식관",
+    "자위": "자가 자극 행위",
+    "자살": "극단적 선택",
+    "목매다": "질식에 의한 사망",
+    "극단적 선택": "생명 위기 행동",
+    "마약": "불법 약물",
+    "대마": "칸나비스",
+    "코카인": "중추신경 자극 물질",
+    "필로폰": "메스암페타민",
+    "헤로인": "오피오이드 계열 물질",
+    "총": "화기",
+    "칼": "날붙이",
+    "폭발": "에너지 방출 사건",
+    "전쟁": "무력 충돌",
+    "고문": "강제적 신체 손상",
+}
@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .metrics import registry as metrics_registry
+from .refreshing_index import RefreshingIndex
+from ..config import settings
+from ..database.specialtyTerms import getSpecialtyTerms
+
+# 진료분야(specialty) 인메모리 역색인.
+# 표준 질환명이 없을 때 getRecommandDoctors 계열이 만들던 `specialty LIKE '%x%'` OR 체인을 메모리에서 풀어
+# 일치하는 specialty_id 목록만 MySQL에 넘긴다 (specialty 테이블 전체 LIKE 스캔 제거).
+
+SPECIALTY_LOOKUPS = metrics_registry.counter("aiga_specialty_index_lookups_total", "Specialty index lookups", ("result",))
+
+# (연산자, 검색어 목록). 'AND'는 모든 검색어, 'OR'는 하나 이상의 검색어를 포함. 조건끼리는 OR
+SpecialtyClause = Tuple[str, Sequence[str]]
+
+
+def _normalize(text: str) -> str:
+    # MySQL utf8mb4_general_ci LIKE 와 같이 대소문자 무시
+    return (text or "").lower()
+
+
+def _ngrams(text: str) -> set:
+    if len(text) < 2:
+        return set(text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _SpecialtySnapshot:
+    def __init__(self, rows: List[dict]):
+        rows = [row for row in rows if row.get("specialty") and row.get("specialty_id") is not None]
+        self.specialties: List[str] = [_normalize(row["specialty"]) for row in rows]
+        self.ids: List[int] = [row["specialty_id"] for row in rows]
+        self.postings: Dict[str, List[int]] = {}
+        for position, specialty in enumerate(self.specialties):
+            for gram in _ngrams(specialty) | set(specialty):
+                self.postings.setdefault(gram, []).append(position)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, term: str) -> Set[int]:
+        """term을 포함하는 specialty 위치 (LIKE '%term%')"""
+        postings = [self.postings.get(gram) for gram in _ngrams(term)]
+        if not postings or not all(postings):
+            return set()
+        return {position for position in min(postings, key=len) if term in self.specialties[position]}
+
+
+class SpecialtyIndex(RefreshingIndex):
+    name = "specialty"
+
+    @property
+    def enabled(self) -> bool:
+        return settings.specialty_index_enable
+
+    @property
+    def refresh_seconds(self) -> int:
+        return settings.specialty_index_refresh_seconds
+
+    def _fetch_rows(self) -> list:
+        return getSpecialtyTerms()
+
+    def _build(self, rows: list) -> _SpecialtySnapshot:
+        return _SpecialtySnapshot(rows)
+
+    def find_ids(self, clauses: Sequence[SpecialtyClause]) -> Optional[List[int]]:
+        """
+        조건 중 하나 이상을 만족하는 specialty_id 목록 (테이블 순서). 기존 LIKE 체인과 같은 집합이며,
+        결과 정렬은 호출부 쿼리의 ORDER BY 가 정한다.
+        인덱스가 준비되지 않았거나 빈 검색어가 있거나 결과가 SPECIALTY_INDEX_MAX_IDS를 넘으면 None
+        (호출부는 기존 LIKE 쿼리로 처리).
+        """
+        snapshot = self._snapshot
+        if not self.ready:
+            return None
+        normalized = [(operator.upper(), [_normalize(term) for term in terms]) for operator, terms in clauses]
+        if not normalized or not all(terms and all(terms) for _, terms in normalized):
+            return None
+        matches: Dict[str, Set[int]] = {}
+        positions: Set[int] = set()
+        for operator, terms in normalized:
+            for term in terms:
+                if term not in matches:
+                    matches[term] = snapshot.find(term)
+            hits = [matches[term] for term in terms]
+            positions |= set.intersection(*hits) if operator == "AND" else set.union(*hits)
+        if len(positions) > settings.specialty_index_max_ids:
+            SPECIALTY_LOOKUPS.inc(result="too_many")
+            return None
+        SPECIALTY_LOOKUPS.inc(result="hit" if positions else "miss")
+        return [snapshot.ids[position] for position in sorted(positions)]
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            **super().stats(),
+            "ngrams": len(snapshot.postings) if snapshot else 0,
+            "max_ids": settings.specialty_index_max_ids,
+        }
+
+
+specialty_index = SpecialtyIndex()
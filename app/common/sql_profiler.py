@@ -0,0 +1,208 @@
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .logger import logger
+from ..config import settings
+
+# SQLAlchemy 엔진 레벨 SQL 프로파일러.
+# - 쿼리 형태(리터럴을 ?로 치환한 정규화 SQL)별 실행 횟수 / 소요 시간 / 반환 행 수 집계
+# - 느린 쿼리(파라미터 포함)를 링 버퍼에 보관
+# - 임계값 이상이면 EXPLAIN 결과를 형태별로 주기적으로 수집
+# 결과는 /admin/sql-profile 로 조회한다.
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """리터럴/IN 목록/공백을 정규화해서 같은 형태의 쿼리를 하나로 묶는다"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("(?, ...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip().rstrip(";")
+
+
+def _truncate(value, limit: int = 500) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class _ShapeStats:
+    __slots__ = ("shape", "count", "total_ms", "max_ms", "rows_total", "rows_max", "errors", "last_seen", "explain", "explained_at")
+
+    def __init__(self, shape: str):
+        self.shape = shape
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows_total = 0
+        self.rows_max = 0
+        self.errors = 0
+        self.last_seen = 0.0
+        self.explain = None
+        self.explained_at = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "shape": self.shape,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows_total": self.rows_total,
+            "rows_avg": round(self.rows_total / self.count, 1) if self.count else 0.0,
+            "rows_max": self.rows_max,
+            "errors": self.errors,
+            "last_seen": self.last_seen,
+            "explain": self.explain,
+        }
+
+
+class SqlProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes: "OrderedDict[str, _ShapeStats]" = OrderedDict()
+        self._shape_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._slow = deque(maxlen=settings.sql_profiler_slow_ring_size)
+        self.started_at = time.time()
+
+    def _shape_of(self, statement: str) -> str:
+        # 같은 SQL 문자열이 반복되므로 정규화 결과를 캐시 (정규식 비용 절감)
+        shape = self._shape_cache.get(statement)
+        if shape is None:
+            shape = normalize_sql(statement)
+            self._shape_cache[statement] = shape
+            if len(self._shape_cache) > settings.sql_profiler_max_shapes * 4:
+                self._shape_cache.popitem(last=False)
+        return shape
+
+    def _stats_for(self, shape: str) -> _ShapeStats:
+        stats = self._shapes.get(shape)
+        if stats is None:
+            stats = _ShapeStats(shape)
+            self._shapes[shape] = stats
+            if len(self._shapes) > settings.sql_profiler_max_shapes:
+                # 가장 오래 안 쓰인 형태부터 제거
+                self._shapes.popitem(last=False)
+        else:
+            self._shapes.move_to_end(shape)
+        return stats
+
+    def record(self, statement: str, parameters, elapsed_ms: float, rowcount: int, error: bool = False):
+        now = time.time()
+        with self._lock:
+            shape = self._shape_of(statement)
+            stats = self._stats_for(shape)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if rowcount >= 0:
+                stats.rows_total += rowcount
+                stats.rows_max = max(stats.rows_max, rowcount)
+            if error:
+                stats.errors += 1
+            stats.last_seen = now
+            if elapsed_ms >= settings.sql_profiler_slow_ms:
+                self._slow.append({
+                    "at": now,
+                    "duration_ms": round(elapsed_ms, 3),
+                    "rows": rowcount,
+                    "error": error,
+                    "shape": shape,
+                    "statement": statement if len(statement) <= 4000 else statement[:4000] + "...",
+                    "parameters": _truncate(parameters),
+                })
+            return stats
+
+    def should_explain(self, stats: _ShapeStats, statement: str, elapsed_ms: float) -> bool:
+        if not settings.sql_profiler_explain or elapsed_ms < settings.sql_profiler_explain_ms:
+            return False
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return False
+        # 같은 형태는 interval 동안 한 번만 EXPLAIN (DB 부하 방지)
+        return time.time() - stats.explained_at >= settings.sql_profiler_explain_interval_seconds
+
+    def capture_explain(self, stats: _ShapeStats, dbapi_connection, statement: str, parameters):
+        stats.explained_at = time.time()
+        cursor = None
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("EXPLAIN " + statement, parameters)
+            columns = [column[0] for column in cursor.description or ()]
+            rows = cursor.fetchall()
+            stats.explain = {
+                "at": stats.explained_at,
+                "rows": [dict(zip(columns, [value if isinstance(value, (int, float, str)) or value is None else str(value) for value in row])) for row in rows],
+            }
+        except Exception as e:
+            logger.warning(f"SQL profiler EXPLAIN 실패: {e}")
+            stats.explain = {"at": stats.explained_at, "error": str(e)}
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def snapshot(self, sort: str = "total_ms", limit: int = 50) -> dict:
+        with self._lock:
+            shapes = [stats.as_dict() for stats in self._shapes.values()]
+            slow = list(self._slow)
+        if sort not in ("total_ms", "max_ms", "avg_ms", "count", "rows_total", "rows_max"):
+            sort = "total_ms"
+        shapes.sort(key=lambda row: row[sort], reverse=True)
+        return {
+            "enabled": settings.sql_profiler_enable,
+            "since": self.started_at,
+            "slow_threshold_ms": settings.sql_profiler_slow_ms,
+            "shape_count": len(shapes),
+            "shapes": shapes[:limit],
+            "slow_queries": sorted(slow, key=lambda row: row["duration_ms"], reverse=True),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+            self._slow.clear()
+            self.started_at = time.time()
+
+
+sql_profiler = SqlProfiler()
+
+
+def install_sql_profiler(engine):
+    """엔진의 cursor execute 이벤트에 프로파일러를 연결 (SQL_PROFILER_ENABLE=true 일 때만)"""
+    if not settings.sql_profiler_enable:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("aiga_profiler_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("aiga_profiler_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+        # mysqlconnector 방언은 buffered 커서라 SELECT도 execute 직후 rowcount가 유효하다
+        rowcount = getattr(cursor, "rowcount", -1)
+        stats = sql_profiler.record(statement, parameters, elapsed_ms, rowcount if rowcount is not None else -1)
+        if not executemany and sql_profiler.should_explain(stats, statement, elapsed_ms):
+            sql_profiler.capture_explain(stats, conn.connection, statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get("aiga_profiler_start") if conn is not None else None
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+        sql_profiler.record(exception_context.statement or "", exception_context.parameters, elapsed_ms, -1, error=True)
+
+    logger.info(f"SQL profiler enabled (slow >= {settings.sql_profiler_slow_ms}ms, explain={settings.sql_profiler_explain})")
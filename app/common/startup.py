@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from .logger import logger
+from ..config import settings
+
+# 무거운 객체(Kiwi, SQLDatabase 리플렉션, SQL agent 등)의 지연 초기화와 기동 시간 프로파일.
+# 모듈 import 시점에는 아무것도 만들지 않고, 첫 사용 또는 startup 워밍업에서 한 번만 생성한다.
+
+_process_started = time.perf_counter()
+
+
+class StartupProfile:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.components = {}
+        self.ready = False
+        self.ready_after_seconds = None
+
+    def record(self, component: str, seconds: float):
+        with self._lock:
+            self.components[component] = round(self.components.get(component, 0.0) + seconds, 4)
+
+    @contextmanager
+    def step(self, component: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(component, time.perf_counter() - started)
+
+    def mark_ready(self):
+        self.ready = True
+        self.ready_after_seconds = round(time.perf_counter() - _process_started, 3)
+        breakdown = ", ".join(f"{name}={seconds:.3f}s" for name, seconds in sorted(self.components.items(), key=lambda item: -item[1]))
+        logger.info(f"Startup ready in {self.ready_after_seconds:.3f}s ({breakdown})")
+
+    def mark_not_ready(self):
+        self.ready = False
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            components = dict(self.components)
+        return {"ready": self.ready, "ready_after_seconds": self.ready_after_seconds, "components": components}
+
+
+startup_profile = StartupProfile()
+
+_MISSING = object()
+
+
+def lazy_singleton(component: str):
+    """
+    인자 없는 팩토리를 스레드 안전한 지연 싱글톤으로 만든다.
+    생성 시간은 startup_profile에 component 이름으로 기록되고, 예외가 나면 캐시하지 않아 다음 호출에서 재시도한다.
+    """
+    def decorator(factory):
+        lock = threading.Lock()
+        instance = _MISSING
+
+        @functools.wraps(factory)
+        def get():
+            nonlocal instance
+            if instance is not _MISSING:
+                return instance
+            with lock:
+                if instance is _MISSING:
+                    started = time.perf_counter()
+                    value = factory()
+                    startup_profile.record(component, time.perf_counter() - started)
+                    instance = value
+            return instance
+
+        def reset():
+            nonlocal instance
+            with lock:
+                instance = _MISSING
+
+        get.reset = reset
+        get.is_initialized = lambda: instance is not _MISSING
+        return get
+
+    return decorator
+
+
+@lazy_singleton("kiwi")
+def _create_kiwi():
+    from kiwipiepy import Kiwi
+    kiwi = Kiwi()
+    logger.info("Kiwipiepy Kiwi 형태소 분석기 초기화 완료.")
+    return kiwi
+
+
+_kiwi_failed_at = None
+
+
+def get_kiwi():
+    """
+    모든 분석기가 공유하는 Kiwi 형태소 분석기. 초기화 실패 시 None (분석기들은 None이면 분석을 건너뜀).
+    실패 후 KIWI_RETRY_SECONDS 동안은 재시도하지 않아 요청마다 Kiwi() 생성과 에러 로그가 반복되지 않는다.
+    """
+    global _kiwi_failed_at
+    if _create_kiwi.is_initialized():
+        return _create_kiwi()
+    if _kiwi_failed_at is not None and time.monotonic() - _kiwi_failed_at < settings.kiwi_retry_seconds:
+        return None
+    try:
+        kiwi = _create_kiwi()
+    except Exception as e:
+        _kiwi_failed_at = time.monotonic()
+        logger.error(f"Kiwipiepy Kiwi 형태소 분석기 초기화 실패 ({settings.kiwi_retry_seconds:.0f}초 후 재시도): {e}", exc_info=True)
+        return None
+    _kiwi_failed_at = None
+    return kiwi
+
+
+async def warmup(factories: dict):
+    """지연 싱글톤들을 스레드에서 미리 생성. 실패해도 기동은 계속되고 첫 사용 시 다시 시도한다"""
+    for component, factory in factories.items():
+        try:
+            await asyncio.to_thread(factory)
+        except Exception as e:
+            logger.warning(f"Startup warmup 실패 ({component}): {e}")
@@ -0,0 +1,218 @@
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .logger import logger
+from .metrics import registry as metrics_registry
+from ..config import settings
+
+# SQLite 저장 포맷 코덱 (tool_results_cache.content, 체크포인트 blob).
+# 압축된 값은 bytes이며 첫 바이트가 코덱을 나타낸다.
+#   0x01 zlib                 : [0x01][deflate]
+#   0x02 zlib + 공유 사전      : [0x02][사전 id][deflate(zdict)]
+#   0x03 zstd (+ 공유 사전)    : [0x03][사전 id, 0이면 없음][zstd frame]
+# 기존 행은 그대로 읽는다: tool_results_cache 는 str(TEXT)이면 압축 전 행이고,
+# 체크포인트는 serde type 에 COMPRESSED_TYPE_PREFIX 가 없으면 압축 전 행이다.
+# 작은 값(STORAGE_CODEC_MIN_BYTES 미만)은 압축하지 않고 기존 형식으로 저장한다.
+
+CODEC_ZLIB = 0x01
+CODEC_ZLIB_DICT = 0x02
+CODEC_ZSTD = 0x03
+
+COMPRESSED_TYPE_PREFIX = "zc:"
+
+CODEC_BYTES = metrics_registry.counter("aiga_storage_codec_bytes_total", "Bytes before/after storage codec encoding", ("store", "kind"))
+CODEC_SECONDS = metrics_registry.histogram(
+    "aiga_storage_codec_seconds", "Storage codec encode/decode time", ("store", "op"),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+# 공유 사전 (zlib zdict / zstd raw-content dict). 도구 결과 JSON에 반복되는 키와 문구.
+# 주의: v1은 학습 결과가 아니라 도구 결과 스키마(sql_tool / tools 의 응답 키)와 자주 나오는 지역/진료과 문구로
+# 손으로 만든 초기 사전이다. 저장소에는 학습에 쓸 운영 payload가 없으므로, 운영 데이터로
+# python -m benchmarks.storage_codec --sqlite <운영 checkpoints.sqlite> --train dict_v2.bin 을 실행해
+# 만든 사전을 id 2로 추가하고 CURRENT_DICT_ID 를 올린다.
+# zlib은 사전 뒤쪽 문자열일수록 짧은 거리로 참조하므로 자주 나오는 것을 뒤에 둔다.
+# 사전 내용을 바꿀 때는 기존 id를 지우지 말고 새 id로 추가해야 기존 행을 읽을 수 있다.
+_DICT_V1 = "".join([
+    '"is_historical_context": true, "migrated": true, "result_id": "',
+    '{"status": "error", "message": "',
+    '"chat_type": "recommand_hospital", "answer": {"hospitals": [',
+    '{"hospital_id": "', '"name": "', '"telephone": "', '"hospital_site": "',
+    '"result_mode": "compact", "next_cursor": null, "page": ',
+    '서울특별시 경기도 부산광역시 대구광역시 인천광역시 광주광역시 대전광역시 울산광역시 경상남도 경상북도 전라남도 전라북도 충청남도 충청북도 강원도 제주특별자치도 ',
+    '대학교병원 의료원 병원 의원 내과 외과 정형외과 신경외과 이비인후과 피부과 안과 산부인과 소아청소년과 비뇨의학과 정신건강의학과 재활의학과 가정의학과 ',
+    '교수 전문의 부교수 조교수 임상교수 의학박사 의과대학 졸업 수련 전임의 레지던트 인턴 ',
+    '"ai_score": {"kindness": 0.0, "satisfaction": 0.0, "explanation": 0.0, "recommendation": 0.0}, "paper": [], "review": []}',
+    '"doctor_score": {"paper_score": 0.0, "patient_score": 0.0, "public_score": 0.0, "peer_score": 0.0}, ',
+    '"url": "', '"education": "', '"career": "', '"photo": "https://',
+    '"name": "', '"deptname": "', '"specialties": "', '"parse_specialties": "',
+    '"lat": ', '"lon": ', '"telephone": "', '"hospital_site": "', '"hospital_hid": "H01KR',
+    '{"doctor_id": ', '"doctor_rid": "', '"hospital": "', '"address": "',
+    '{"chat_type": "search_doctor", "answer": {"doctors": [',
+    '{"chat_type": "recommand_doctor", "answer": {"doctors": [',
+    '], "proposal": "',
+]).encode("utf-8")
+
+DICTIONARIES: Dict[int, bytes] = {1: _DICT_V1}
+CURRENT_DICT_ID = 1
+
+
+def train_dictionary(samples: Iterable[Union[str, bytes]], size: int = 16384) -> bytes:
+    """
+    샘플 payload로 공유 사전 후보를 만든다. zstandard가 있으면 zstd 학습기를 쓰고,
+    없으면 JSON 토큰(따옴표 구간) 빈도 x 길이 상위 조각을 점수 오름차순으로 이어 붙인다.
+    """
+    samples = [sample.encode("utf-8") if isinstance(sample, str) else bytes(sample) for sample in samples]
+    try:
+        import zstandard  # zstd 코덱/학습을 쓸 때만 필요
+        return zstandard.train_dictionary(size, samples).as_bytes()
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.warning(f"zstd dictionary training failed, falling back to frequency dictionary: {e}")
+
+    counts: Counter = Counter()
+    for sample in samples:
+        for fragment in sample.split(b'"'):
+            if 3 <= len(fragment) <= 256:
+                counts[b'"' + fragment + b'"'] += 1
+    scored = sorted(((count * len(fragment), fragment) for fragment, count in counts.items() if count > 1), reverse=True)
+    chosen, total = [], 0
+    for _, fragment in scored:
+        if total + len(fragment) > size:
+            continue
+        chosen.append(fragment)
+        total += len(fragment)
+    return b"".join(reversed(chosen))
+
+
+class StorageCodec:
+    def __init__(self):
+        self._zstd = None
+
+    @property
+    def codec(self) -> str:
+        return settings.storage_codec
+
+    def _zstd_module(self):
+        if self._zstd is None:
+            import zstandard  # zstd 코덱을 쓸 때만 필요
+            self._zstd = zstandard
+        return self._zstd
+
+    def _compress(self, data: bytes) -> Optional[bytes]:
+        codec = self.codec
+        if codec == "zlib":
+            if settings.storage_codec_dictionary:
+                compressor = zlib.compressobj(settings.storage_codec_level, zdict=DICTIONARIES[CURRENT_DICT_ID])
+                return bytes((CODEC_ZLIB_DICT, CURRENT_DICT_ID)) + compressor.compress(data) + compressor.flush()
+            return bytes((CODEC_ZLIB,)) + zlib.compress(data, settings.storage_codec_level)
+        if codec == "zstd":
+            zstandard = self._zstd_module()
+            dict_id = CURRENT_DICT_ID if settings.storage_codec_dictionary else 0
+            dict_data = zstandard.ZstdCompressionDict(DICTIONARIES[dict_id], dict_type=zstandard.DICT_TYPE_RAWCONTENT) if dict_id else None
+            compressor = zstandard.ZstdCompressor(level=settings.storage_codec_level, dict_data=dict_data)
+            return bytes((CODEC_ZSTD, dict_id)) + compressor.compress(data)
+        return None
+
+    def _decompress(self, data: bytes) -> bytes:
+        header = data[0]
+        if header == CODEC_ZLIB:
+            return zlib.decompress(data[1:])
+        if header == CODEC_ZLIB_DICT:
+            decompressor = zlib.decompressobj(zdict=DICTIONARIES[data[1]])
+            return decompressor.decompress(data[2:]) + decompressor.flush()
+        if header == CODEC_ZSTD:
+            zstandard = self._zstd_module()
+            dict_id = data[1]
+            dict_data = zstandard.ZstdCompressionDict(DICTIONARIES[dict_id], dict_type=zstandard.DICT_TYPE_RAWCONTENT) if dict_id else None
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data[2:])
+        raise ValueError(f"unknown storage codec header: {header:#04x}")
+
+    def encode_bytes(self, data: bytes, store: str) -> Optional[bytes]:
+        """압축된 값 (헤더 포함). 코덱이 꺼져 있거나 작거나 압축 이득이 없으면 None (호출부는 기존 형식으로 저장)"""
+        if self.codec == "none" or len(data) < settings.storage_codec_min_bytes:
+            return None
+        started = time.perf_counter()
+        encoded = self._compress(data)
+        CODEC_SECONDS.observe(time.perf_counter() - started, store=store, op="encode")
+        if encoded is None or len(encoded) >= len(data):
+            return None
+        CODEC_BYTES.inc(len(data), store=store, kind="raw")
+        CODEC_BYTES.inc(len(encoded), store=store, kind="stored")
+        return encoded
+
+    def decode_bytes(self, data: bytes, store: str) -> bytes:
+        started = time.perf_counter()
+        decoded = self._decompress(data)
+        CODEC_SECONDS.observe(time.perf_counter() - started, store=store, op="decode")
+        return decoded
+
+    def encode_text(self, text: str, store: str = "tool_results_cache") -> Union[str, bytes]:
+        """TEXT 컬럼 저장값. 압축하면 bytes(BLOB), 아니면 원래 문자열"""
+        encoded = self.encode_bytes(text.encode("utf-8"), store)
+        return text if encoded is None else encoded
+
+    def decode_text(self, value: Union[str, bytes], store: str = "tool_results_cache") -> str:
+        """저장값 -> 문자열. str이면 압축 전 행"""
+        if isinstance(value, str):
+            return value
+        return self.decode_bytes(bytes(value), store).decode("utf-8")
+
+    def stats(self) -> dict:
+        stores = {}
+        for store in ("tool_results_cache", "checkpoints"):
+            raw = CODEC_BYTES.value(store=store, kind="raw")
+            stored = CODEC_BYTES.value(store=store, kind="stored")
+            timings = {}
+            for op in ("encode", "decode"):
+                total, count = CODEC_SECONDS.totals(store=store, op=op)
+                timings[op] = {"count": count, "avg_ms": round(total / count * 1000, 3) if count else None}
+            stores[store] = {
+                "raw_bytes": raw,
+                "stored_bytes": stored,
+                "ratio": round(raw / stored, 2) if stored else None,
+                **timings,
+            }
+        return {
+            "codec": self.codec,
+            "level": settings.storage_codec_level,
+            "dictionary_id": CURRENT_DICT_ID if settings.storage_codec_dictionary else None,
+            "min_bytes": settings.storage_codec_min_bytes,
+            "checkpoints": settings.storage_codec_checkpoints,
+            "stores": stores,
+        }
+
+
+storage_codec = StorageCodec()
+
+
+class CompressedSerializer:
+    """
+    체크포인트 serde 래퍼. 압축한 blob은 type 앞에 COMPRESSED_TYPE_PREFIX 를 붙여 저장하고,
+    읽을 때 접두어가 없으면 기존 blob 으로 그대로 넘긴다.
+    코덱이 꺼져 있거나 STORAGE_CODEC_CHECKPOINTS=false 이면 압축하지 않지만 압축된 blob 은 계속 읽는다.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.inner.dumps_typed(obj)
+        if not settings.storage_codec_checkpoints or not isinstance(data, (bytes, bytearray)):
+            return type_, data
+        encoded = storage_codec.encode_bytes(bytes(data), "checkpoints")
+        if encoded is None:
+            return type_, data
+        return COMPRESSED_TYPE_PREFIX + type_, encoded
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, blob = data
+        if type_.startswith(COMPRESSED_TYPE_PREFIX):
+            return self.inner.loads_typed((type_[len(COMPRESSED_TYPE_PREFIX):], storage_codec.decode_bytes(bytes(blob), "checkpoints")))
+        return self.inner.loads_typed(data)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
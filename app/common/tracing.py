@@ -0,0 +1,118 @@
+import time
+
+from .metrics import registry as metrics_registry
+from ..config import settings
+
+# 단계별 소요 시간 측정용 경량 span.
+# METRICS_ENABLE이 꺼져 있으면 공유 no-op 객체를 반환하므로 호출 비용은 함수 호출 1회 수준이다.
+
+STAGE_SECONDS = metrics_registry.histogram(
+    "aiga_stage_duration_seconds",
+    "Latency of request stages (LLM, tools, SQL, geocoding, validation)",
+    ("stage", "tool", "cache"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **labels):
+        return self
+
+    def finish(self):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# 원시 측정값이 필요한 경우(벤치마크 하네스 등)를 위한 리스너: fn(stage, tool, cache, seconds)
+_span_listeners = []
+
+
+def add_span_listener(listener):
+    _span_listeners.append(listener)
+
+
+def remove_span_listener(listener):
+    if listener in _span_listeners:
+        _span_listeners.remove(listener)
+
+
+class Span:
+    __slots__ = ("stage", "tool", "cache", "_start", "_finished")
+
+    def __init__(self, stage: str, tool: str = "", cache: str = ""):
+        self.stage = stage
+        self.tool = tool
+        self.cache = cache
+        self._finished = False
+        self._start = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
+
+    def set(self, tool: str = None, cache: str = None):
+        # 실행 중에 알게 되는 라벨 (예: 캐시 hit/miss, 실제 라우팅된 도구명)
+        if tool is not None:
+            self.tool = tool
+        if cache is not None:
+            self.cache = cache
+        return self
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        elapsed = time.perf_counter() - self._start
+        STAGE_SECONDS.observe(elapsed, stage=self.stage, tool=self.tool, cache=self.cache)
+        for listener in _span_listeners:
+            listener(self.stage, self.tool, self.cache, elapsed)
+
+
+def span(stage: str, tool: str = "", cache: str = ""):
+    """`with span("llm"):` 또는 `s = span("tool", tool=name) ... s.finish()` 형태로 사용"""
+    if not settings.metrics_enable:
+        return _NOOP_SPAN
+    return Span(stage, tool, cache)
+
+
+def instrument_engine(engine):
+    """SQLAlchemy 엔진의 모든 SQL 실행 시간을 stage="sql" 로 기록"""
+    if not settings.metrics_enable:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("aiga_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("aiga_query_start")
+        if starts:
+            elapsed = time.perf_counter() - starts.pop()
+            STAGE_SECONDS.observe(elapsed, stage="sql", tool="", cache="")
+            for listener in _span_listeners:
+                listener("sql", "", "", elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # 실패한 쿼리도 시작 시각을 꺼내야 이후 쿼리의 시간이 어긋나지 않는다
+        conn = exception_context.connection
+        starts = conn.info.get("aiga_query_start") if conn is not None else None
+        if starts:
+            elapsed = time.perf_counter() - starts.pop()
+            STAGE_SECONDS.observe(elapsed, stage="sql", tool="", cache="")
+            for listener in _span_listeners:
+                listener("sql", "", "", elapsed)
@@ -12,6 +12,35 @@ def _get_final_limit(limit: Optional[int] = None) -> int:
         final_limit = settings.limit_common
     return final_limit
 
+# 의사 결과의 긴 텍스트 필드. RESULT_MODE=compact 이면 검색 결과에서는 빼고(SELECT도 NULL),
+# 사용자가 펼친 의사만 상세 조회(/chat/doctor, /chat/doctors)에서 읽는다.
+HEAVY_DOCTOR_FIELDS = ("specialties", "parse_specialties", "education", "career")
+
+def is_compact_result_mode() -> bool:
+    return settings.result_mode == "compact"
+
+def doctor_heavy_columns(basic_alias: str = "b", career_alias: str = "d") -> str:
+    """검색 쿼리 SELECT 절의 긴 텍스트 컬럼. compact 모드면 같은 이름의 NULL (행 형태는 유지)"""
+    if is_compact_result_mode():
+        return ", ".join(f"NULL AS {field}" for field in HEAVY_DOCTOR_FIELDS)
+    return f"{basic_alias}.specialties, {basic_alias}.parse_specialties, {career_alias}.education, {career_alias}.career"
+
+def compact_observation(observation: dict) -> dict:
+    """
+    compact 모드면 도구 결과의 의사 목록에서 긴 텍스트 필드를 제거한다.
+    ToolMessage / 체크포인트 / tool_results_cache / LLM 프롬프트에 모두 이 결과가 들어간다.
+    """
+    if not is_compact_result_mode():
+        return observation
+    answer = observation.get("answer")
+    if not isinstance(answer, dict) or not isinstance(answer.get("doctors"), list):
+        return observation
+    doctors = [
+        {key: value for key, value in doctor.items() if key not in HEAVY_DOCTOR_FIELDS} if isinstance(doctor, dict) else doctor
+        for doctor in answer["doctors"]
+    ]
+    return {**observation, "answer": {**answer, "doctors": doctors, "result_mode": "compact"}}
+
 def is_result_empty(tool_name: str, observation: dict) -> bool:
     """Check if the observation from a primary tool contains an empty list of doctors or hospitals."""
     #if tool_name not in [
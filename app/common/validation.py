@@ -0,0 +1,104 @@
+import asyncio
+import json
+import random
+from typing import List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+
+from .callbacks import usage_config
+from .logger import logger
+from .metrics import registry as metrics_registry
+from .tracing import span
+from ..config import settings
+from ..prompt.validation_prompt import VALIDATION_PROMPT
+
+# validate_node 응답 검증 정책.
+#   VALIDATION_MODE=sync  : 응답 전에 검증하고, 부적절하면 agent로 되돌린다 (기존 동작)
+#   VALIDATION_MODE=audit : 응답은 바로 반환하고, 검증은 백그라운드에서 실행해 결과만 기록한다
+# 공통으로 VALIDATION_HEURISTICS(도구 결과 기반 응답은 LLM 생략), VALIDATION_SAMPLE_RATE(일부 턴만 검증),
+# VALIDATION_MODEL(저렴한 검증 모델)을 적용한다.
+
+VALIDATIONS = metrics_registry.counter("aiga_validation_total", "Answer validations by mode and outcome", ("mode", "outcome"))
+
+_audit_tasks: set = set()
+
+
+def _current_turn(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """마지막 HumanMessage 이후 메시지 (이번 턴)"""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return list(messages[index + 1:])
+    return list(messages)
+
+
+def _has_structured_result(message: ToolMessage) -> bool:
+    try:
+        observation = json.loads(message.content)
+    except (TypeError, ValueError):
+        return False
+    if not isinstance(observation, dict) or observation.get("is_historical_context"):
+        return False
+    answer = observation.get("answer")
+    if not isinstance(answer, dict):
+        return False
+    return any(isinstance(answer.get(key), list) and answer.get(key) for key in ("doctors", "hospitals"))
+
+
+def heuristic_verdict(messages: Sequence[BaseMessage]) -> Optional[bool]:
+    """
+    LLM 없이 판단 가능한 경우의 검증 결과.
+    빈 응답이면 False, 이번 턴 도구 결과에 의사/병원 목록이 있으면(구조화된 DB 기반 응답) True, 그 외 None(LLM 검증 필요)
+    """
+    answer = messages[-1].content if messages else ""
+    if not isinstance(answer, str) or not answer.strip():
+        return False
+    if any(isinstance(message, ToolMessage) and _has_structured_result(message) for message in _current_turn(messages)):
+        return True
+    return None
+
+
+def sampled() -> bool:
+    """VALIDATION_SAMPLE_RATE(0~1) 비율의 턴만 검증"""
+    rate = settings.validation_sample_rate
+    return rate >= 1 or random.random() < rate
+
+
+async def llm_verdict(model, question: str, answer: str) -> bool:
+    prompt = VALIDATION_PROMPT.format(question=question, answer=answer)
+    with span("validate"):
+        result = await model.ainvoke(prompt, config=usage_config("validation"))
+    return result.content.strip().lower() == "yes"
+
+
+async def _audit(model, question: str, answer: str, session_id: Optional[str]):
+    try:
+        is_valid = await llm_verdict(model, question, answer)
+    except Exception as e:
+        VALIDATIONS.inc(mode="audit", outcome="error")
+        logger.warning(f"validation audit failed: session_id={session_id} error={e}")
+        return
+    VALIDATIONS.inc(mode="audit", outcome="pass" if is_valid else "fail")
+    if not is_valid:
+        logger.warning(f"validation audit: inappropriate answer session_id={session_id} question={question[:200]!r}")
+
+
+async def drain_audits(timeout: float = 5.0):
+    """종료 시 대기 중인 백그라운드 검증을 timeout 동안 기다리고 남은 것은 취소"""
+    if not _audit_tasks:
+        return
+    _, pending = await asyncio.wait(set(_audit_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def schedule_audit(model, question: str, answer: str, session_id: Optional[str]) -> bool:
+    """백그라운드 검증 등록. 대기 중인 감사가 VALIDATION_AUDIT_MAX_PENDING 이상이면 건너뛰고 False"""
+    if len(_audit_tasks) >= settings.validation_audit_max_pending:
+        VALIDATIONS.inc(mode="audit", outcome="dropped")
+        return False
+    task = asyncio.create_task(_audit(model, question, answer, session_id))
+    _audit_tasks.add(task)
+    task.add_done_callback(_audit_tasks.discard)
+    return True
@@ -1,4 +1,5 @@
 import os
+import socket
 from dotenv import load_dotenv,dotenv_values
 from .common.logger import logger
 
@@ -23,12 +24,32 @@ class Settings:
     azure_summary_api_model: str = os.getenv("AZURE_OPENAI_SUMMARY_MODEL")
     azure_request_timeout: int = int(os.getenv("AZURE_OPENAI_REQUEST_TIMEOUT", 60))
 
+    # LLM 클라이언트 공유 HTTP 커넥션 풀 (엔드포인트별 1개, app/common/llm_clients.py)
+    llm_http_max_connections: int = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', 100))
+    llm_http_max_keepalive: int = int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', 20))
+    llm_http_keepalive_expiry_seconds: float = float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS', 60))
+    llm_http_connect_timeout_seconds: float = float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT_SECONDS', 5))
+    llm_http2: bool = os.getenv('LLM_HTTP2') == "true"
+
+    # 부하 테스트용 로컬 OpenAI 호환 stub 서버 (benchmarks/llm_stub_server.py). 켜면 모든 LLM 클라이언트가 stub을 호출
+    llm_stub_enable: bool = os.getenv('LLM_STUB_ENABLE') == "true"
+    llm_stub_endpoint: str = os.getenv('LLM_STUB_ENDPOINT', 'http://127.0.0.1:8089')
+
     google_api_key: str = os.getenv("GOOGLE_API_KEY")
 
     default_locale: str = os.getenv("DEFAULT_LOCALE", "ko")
 
     validation_enable: bool = os.getenv('VALIDATION_ENABLE') == "true"
     validation_retry_limit: int = int(os.getenv('VALIDATION_RETRY_LIMIT', 3))
+    # sync: 응답 전 검증 후 부적절하면 재시도 / audit: 응답 후 백그라운드 검증, 결과만 기록
+    validation_mode: str = os.getenv('VALIDATION_MODE', 'sync').lower()
+    # 이번 턴 도구 결과에 의사/병원 목록이 있는 응답은 LLM 검증 생략
+    validation_heuristics: bool = os.getenv('VALIDATION_HEURISTICS', 'true') == "true"
+    # 검증할 턴 비율 (0~1)
+    validation_sample_rate: float = float(os.getenv('VALIDATION_SAMPLE_RATE', 1.0))
+    # 검증 전용 모델 (비어 있으면 메인 모델)
+    validation_model: str = os.getenv('VALIDATION_MODEL', '')
+    validation_audit_max_pending: int = int(os.getenv('VALIDATION_AUDIT_MAX_PENDING', 32))
 
     sql_agent_verbose: bool = os.getenv('SQL_AGENT_VERBOSE')  == "true"
     llm_summary_verbose: bool = os.getenv('LLM_SUMMARY_VERBOSE') == "true"
@@ -44,9 +65,104 @@ class Settings:
 
     proactive_restoration_limit: int = int(os.getenv('PROACTIVE_RESTORATION_LIMIT', 10))
 
+    # 워커 단위 admission control (/chat/start 동시 실행 한도, 0이면 비활성). 초과 시 대기열, 대기열 초과 시 429
+    admission_max_concurrency: int = int(os.getenv('ADMISSION_MAX_CONCURRENCY', 32))
+    admission_max_queue: int = int(os.getenv('ADMISSION_MAX_QUEUE', 64))
+    admission_max_queued_per_session: int = int(os.getenv('ADMISSION_MAX_QUEUED_PER_SESSION', 1))
+    admission_queue_timeout_seconds: float = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', 10))
+
+    # 요청 deadline (기본 0 = 비활성). 남은 시간이 단계별 최소 예산보다 적으면 선택 작업을 건너뛴다.
+    # 켤 때는 AZURE_OPENAI_REQUEST_TIMEOUT 보다 길게 잡아야 느리지만 정상인 턴이 504가 되지 않는다
+    request_deadline_seconds: float = float(os.getenv('REQUEST_DEADLINE_SECONDS', 0))
+    request_deadline_grace_seconds: float = float(os.getenv('REQUEST_DEADLINE_GRACE_SECONDS', 5))
+    deadline_validation_min_seconds: float = float(os.getenv('DEADLINE_VALIDATION_MIN_SECONDS', 8))
+    deadline_fallback_min_seconds: float = float(os.getenv('DEADLINE_FALLBACK_MIN_SECONDS', 10))
+    deadline_restoration_min_seconds: float = float(os.getenv('DEADLINE_RESTORATION_MIN_SECONDS', 15))
+
+    # 기동 후 Kiwi / SQL agent 등 지연 객체를 미리 생성하고 나서 /ready 를 200으로 전환
+    startup_warmup: bool = os.getenv('STARTUP_WARMUP', 'true') == "true"
+    # Kiwi 초기화 실패 후 재시도까지 대기(초). 그동안 분석기들은 Kiwi 없이 동작
+    kiwi_retry_seconds: float = float(os.getenv('KIWI_RETRY_SECONDS', 300))
+
+    # 멀티 워커 실행 레지스트리 (local | redis)
+    worker_id: str = os.getenv('WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+    execution_registry_backend: str = os.getenv('EXECUTION_REGISTRY_BACKEND', 'local')
+    execution_registry_prefix: str = os.getenv('EXECUTION_REGISTRY_PREFIX', 'aiga:exec')
+    execution_registry_heartbeat_seconds: int = int(os.getenv('EXECUTION_REGISTRY_HEARTBEAT_SECONDS', 5))
+    redis_url: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    # 같은 session_id로 실행 중에 /chat/start가 다시 들어온 경우의 정책 (cancel | reject | queue)
+    session_concurrency_policy: str = os.getenv('SESSION_CONCURRENCY_POLICY', 'cancel')
+    # cancel 정책에서 이전 실행 종료를 기다리는 시간. 넘기면 새 실행은 이전 실행이 끝난 뒤 시작
+    session_cancel_wait_seconds: float = float(os.getenv('SESSION_CANCEL_WAIT_SECONDS', 5))
+
+    # 단계별 latency 메트릭 (/metrics). 꺼져 있으면 span은 no-op
+    metrics_enable: bool = os.getenv('METRICS_ENABLE') == "true"
+
+    # SQL 프로파일러 (/admin/sql-profile): 쿼리 형태별 집계, 느린 쿼리 링 버퍼, EXPLAIN 스냅샷
+    sql_profiler_enable: bool = os.getenv('SQL_PROFILER_ENABLE') == "true"
+    sql_profiler_slow_ms: float = float(os.getenv('SQL_PROFILER_SLOW_MS', 200))
+    sql_profiler_slow_ring_size: int = int(os.getenv('SQL_PROFILER_SLOW_RING_SIZE', 100))
+    sql_profiler_max_shapes: int = int(os.getenv('SQL_PROFILER_MAX_SHAPES', 500))
+    sql_profiler_explain: bool = os.getenv('SQL_PROFILER_EXPLAIN') == "true"
+    sql_profiler_explain_ms: float = float(os.getenv('SQL_PROFILER_EXPLAIN_MS', 500))
+    sql_profiler_explain_interval_seconds: int = int(os.getenv('SQL_PROFILER_EXPLAIN_INTERVAL_SECONDS', 600))
+
+    # 병원 별칭 인메모리 인덱스 (getValidHospitalName). 적재 전이거나 비활성이면 기존 LIKE 쿼리 사용
+    hospital_alias_index_enable: bool = os.getenv('HOSPITAL_ALIAS_INDEX_ENABLE', 'true') == "true"
+    hospital_alias_refresh_seconds: int = int(os.getenv('HOSPITAL_ALIAS_REFRESH_SECONDS', 3600))
+    # 초성/오타 매칭: 자모 단위 최대 편집 거리 (0이면 오타 매칭 비활성), 오타 매칭을 시도할 최소 글자 수
+    hospital_fuzzy_max_distance: int = int(os.getenv('HOSPITAL_FUZZY_MAX_DISTANCE', 2))
+    hospital_fuzzy_min_length: int = int(os.getenv('HOSPITAL_FUZZY_MIN_LENGTH', 3))
+
+    # 의사 이름 인메모리 인덱스 (getSearchDoctors / search_doctor_details_by_name). 결과 id가 MAX_IDS를 넘으면 기존 LIKE 쿼리 사용
+    doctor_name_index_enable: bool = os.getenv('DOCTOR_NAME_INDEX_ENABLE', 'true') == "true"
+    doctor_name_index_refresh_seconds: int = int(os.getenv('DOCTOR_NAME_INDEX_REFRESH_SECONDS', 1800))
+    doctor_name_index_max_ids: int = int(os.getenv('DOCTOR_NAME_INDEX_MAX_IDS', 500))
+
+    # 진료분야(specialty) 인메모리 역색인 (표준 질환명이 없을 때의 getRecommandDoctors 계열). 결과 id가 MAX_IDS를 넘으면 기존 LIKE 쿼리 사용
+    specialty_index_enable: bool = os.getenv('SPECIALTY_INDEX_ENABLE', 'true') == "true"
+    specialty_index_refresh_seconds: int = int(os.getenv('SPECIALTY_INDEX_REFRESH_SECONDS', 3600))
+    specialty_index_max_ids: int = int(os.getenv('SPECIALTY_INDEX_MAX_IDS', 1000))
+
+    # /chat/doctors 한 번에 조회할 수 있는 최대 doctor_id 수
+    doctor_batch_max_ids: int = int(os.getenv('DOCTOR_BATCH_MAX_IDS', 100))
+
+    # 의사 검색 결과 모드 (full | compact). compact면 학력/경력/전문분야 등 긴 텍스트는 상세 조회에서만 반환
+    result_mode: str = os.getenv('RESULT_MODE', 'full')
+
+    # 검색 결과 "더 보기" (next_cursor + /chat/more). 커서 서명 키는 모든 워커/재시작에 같은 값이어야 하므로
+    # PAGINATION_CURSOR_SECRET 이 없으면 기능을 끈다 (기동 시 경고 로그)
+    pagination_enable: bool = os.getenv('PAGINATION_ENABLE', 'true') == "true"
+    pagination_cursor_secret: str = os.getenv('PAGINATION_CURSOR_SECRET', '')
+    pagination_cursor_ttl_seconds: int = int(os.getenv('PAGINATION_CURSOR_TTL_SECONDS', 3600))
+
+    # 체크포인트(sqlite) 보존 정책 / 정리 작업
+    checkpoint_gc_enable: bool = os.getenv('CHECKPOINT_GC_ENABLE') == "true"
+    checkpoint_session_ttl_hours: int = int(os.getenv('CHECKPOINT_SESSION_TTL_HOURS', 168))
+    checkpoint_gc_interval_seconds: int = int(os.getenv('CHECKPOINT_GC_INTERVAL_SECONDS', 3600))
+    checkpoint_gc_batch_size: int = int(os.getenv('CHECKPOINT_GC_BATCH_SIZE', 200))
+    checkpoint_gc_vacuum_pages: int = int(os.getenv('CHECKPOINT_GC_VACUUM_PAGES', 2000))
+    checkpoint_gc_convert_auto_vacuum: bool = os.getenv('CHECKPOINT_GC_CONVERT_AUTO_VACUUM') == "true"
+
+    # SQLite 저장 압축 (tool_results_cache.content, 체크포인트 blob): none | zlib | zstd(zstandard 패키지 필요)
+    # 압축 전 행은 그대로 읽으므로 켜고 끄는 것은 자유롭지만, 켠 뒤에는 이 코덱을 모르는 이전 버전으로 되돌리면 안 된다
+    storage_codec: str = os.getenv('STORAGE_CODEC', 'none')
+    storage_codec_level: int = int(os.getenv('STORAGE_CODEC_LEVEL', 6))
+    storage_codec_dictionary: bool = os.getenv('STORAGE_CODEC_DICTIONARY', 'true') == "true"
+    storage_codec_min_bytes: int = int(os.getenv('STORAGE_CODEC_MIN_BYTES', 256))
+    storage_codec_checkpoints: bool = os.getenv('STORAGE_CODEC_CHECKPOINTS', 'true') == "true"
+
     ## - Noh logger.info(f"azure_endpoint: {azure_endpoint}")
     ## - Noh logger.info(f"azure_key: {azure_key}")
     ## - Noh logger.info(f"azure_api_version: {azure_api_version}")
     ## - Noh logger.info(f"azure_api_model: {azure_api_model}")
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+
+if settings.llm_stub_enable:
+    settings.azure_endpoint = settings.llm_stub_endpoint
+    settings.azure_key = "stub"
+    settings.azure_api_version = settings.azure_api_version or "2024-06-01"
+    settings.azure_api_model = settings.azure_api_model or "stub"
+    settings.azure_summary_api_model = settings.azure_summary_api_model or "stub"
+    logger.warning(f"LLM_STUB_ENABLE=true: 모든 LLM 호출이 stub 서버({settings.llm_stub_endpoint})로 전달됩니다")
@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from ..config import settings
-from ..common.logger import logger
+from ..common.logger import logger, get_logger
+from ..common.tracing import instrument_engine
+from ..common.sql_profiler import install_sql_profiler
 
 DATABASE_URL = (
     f"mysql+mysqlconnector://{settings.mysql_user}"
@@ -20,6 +22,10 @@ engine = create_engine(
 )
 
 logger.info(f'engine: {engine}')
+instrument_engine(engine)
+install_sql_profiler(engine)
+
+sql_logger = get_logger("sql")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -33,7 +39,7 @@ def get_db():
 
 def fetchData(query, param): 
     sql = text(query)
-    logger.debug(f"param: {param}\nquery: {sql}")
+    sql_logger.debug("param: %s\nquery: %s", param, sql)
 
     try:
         with engine.connect() as connection:
@@ -51,4 +57,8 @@ def fetchData(query, param):
         return {
             "column": [],
             "data": []
-        }
\ No newline at end of file
+        }
+def in_clause_params(prefix: str, values) -> tuple:
+    """IN (...) 절용 이름 있는 placeholder 문자열과 파라미터 (예: ':doctor_id_0, :doctor_id_1')"""
+    params = {f"{prefix}_{i}": value for i, value in enumerate(values)}
+    return ", ".join(f":{key}" for key in params), params
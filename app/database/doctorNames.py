@@ -0,0 +1,12 @@
+from .db import fetchData
+
+def getActiveDoctorNames() -> list:
+    """의사 이름 인덱스 적재용 (doctor_id, doctorname) 목록 (활성 의사만)"""
+
+    query = """
+        SELECT b.doctor_id, b.doctorname
+        FROM doctor_basic b
+        WHERE b.is_active in ('1','2') AND b.doctorname IS NOT NULL
+    """
+    result = fetchData(query, {})
+    return result.get("data", [])
@@ -15,3 +15,13 @@ LIMIT 1"""
     result = fetchData(query, param)
     return result
 
+
+def getHospitalAliasRows():
+    """병원 별칭 인덱스 적재용 전체 별칭 목록 (alias_name, standard_name, public_score)"""
+
+    query = """SELECT 
+	h.alias_name, h.shortname as standard_name, he.public_score 
+FROM 
+	aiga2025.hospital_alias h left join aiga2025.hospital_evaluation he ON h.hid = he.hid"""
+    result = fetchData(query, {})
+    return result
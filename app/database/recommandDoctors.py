@@ -1,7 +1,64 @@
 import os
-from .db import fetchData
-from ..common.logger import logger
+from .db import fetchData, in_clause_params
+from ..common.logger import logger, get_logger
 from ..common.contant import EVAL_TYPE
+from ..common.specialty_index import specialty_index
+from ..common.utils import doctor_heavy_columns
+
+# 핫패스 상세 로그 (LOG_LEVELS / LOG_SAMPLING 으로 레벨·샘플링 제어)
+sql_logger = get_logger("sql")
+result_logger = get_logger("results")
+
+def _specialty_clauses(search_diseases: list):
+    """
+    원본 질환명으로 specialty를 찾을 조건. 조건은 (연산자, 검색어 목록)이고 조건끼리는 OR.
+    1차: 원본 / 공백 제거 버전 / 단어별 AND, 2차(Fallback): 여러 단어 질환명은 단어별 OR.
+
+    Returns:
+        (1차 조건, 2차 조건, 공백이 포함된 질환명 존재 여부)
+    """
+    primary, fallback = [], []
+    has_space_disease = False
+    for d in search_diseases:
+        # 1. 원본 검색어
+        primary.append(("AND", [d]))
+        tokens = d.split()
+        if ' ' in d:
+            has_space_disease = True
+            # 2. 공백을 제거한 버전
+            primary.append(("AND", [d.replace(' ', '')]))
+            # 3. 단어별 AND 조건 (정밀도 향상)
+            if len(tokens) > 1:
+                primary.append(("AND", tokens))
+                fallback.append(("OR", tokens))
+                continue
+        fallback.append(("AND", [d]))
+    return primary, fallback, has_space_disease
+
+def _specialty_where(clauses: list, param: dict, prefix: str):
+    """
+    specialty 서브쿼리의 WHERE 절. 진료분야 인덱스가 준비되어 있으면 일치하는 specialty_id IN (...),
+    아니면 기존 `specialty LIKE` OR 체인. 인덱스상 일치하는 specialty가 없으면 None.
+    """
+    specialty_ids = specialty_index.find_ids(clauses)
+    if specialty_ids is not None:
+        if not specialty_ids:
+            return None
+        placeholders, id_params = in_clause_params(f"{prefix}_specialty_id", specialty_ids)
+        param.update(id_params)
+        return f"specialty_id IN ({placeholders})"
+
+    where_parts = []
+    param_idx = 0
+    for operator, terms in clauses:
+        term_parts = []
+        for t in terms:
+            param_name = f"{prefix}_{param_idx}"
+            term_parts.append(f"specialty LIKE :{param_name}")
+            param[param_name] = f"%{t}%"
+            param_idx += 1
+        where_parts.append(term_parts[0] if len(term_parts) == 1 else f"({f' {operator} '.join(term_parts)})")
+    return " OR ".join(where_parts)
 
 def getRecommandDoctors(standard_disease: list, disease: list, logical_operator: str = 'OR', evalType: EVAL_TYPE=EVAL_TYPE.TOTAL):
     """
@@ -13,8 +70,8 @@ def getRecommandDoctors(standard_disease: list, disease: list, logical_operator:
         logical_operator (str): 'AND' 또는 'OR'. 기본값은 'OR'.
         evalType (EVAL_TYPE): 평가 타입.
     """
-    prefix_query = """SELECT s.shortname, s.address, s.lat, s.lon, s.telephone, s.hospital_site, s.hid, b.doctorname, b.deptname, b.specialties,b.parse_specialties,
-    b.rid,HEX(b.rid) AS hexrid, b.doctor_id, b.doctor_url, b.profileimgurl, d.education, d.career,
+    prefix_query = f"""SELECT s.shortname, s.address, s.lat, s.lon, s.telephone, s.hospital_site, s.hid, b.doctorname, b.deptname,
+    b.rid,HEX(b.rid) AS hexrid, b.doctor_id, b.doctor_url, b.profileimgurl, {doctor_heavy_columns()},
     0 as paper_score,
     IFNULL(e.patient_score, 0) as patient_score,
     IFNULL(e.public_score, 0) as public_score,
@@ -38,41 +95,15 @@ def getRecommandDoctors(standard_disease: list, disease: list, logical_operator:
         return {"data": []} # 검색할 질환이 없으면 빈 결과 반환
 
     if not standard_disease:
-        # 표준 질환명이 없는 경우, 원본 질환명으로 LIKE 검색
-        # 공백이 있는 질환명과 공백이 없는 질환명을 모두 검색하기 위한 로직
-        param_idx = 0
-        where_parts = []
-        has_space_disease = False
-        
-        for d in search_diseases:
-            # 1. 원본 검색어 추가
-            param_name = f"disease_{param_idx}"
-            where_parts.append(f"specialty LIKE :{param_name}")
-            param[param_name] = f"%{d}%"
-            param_idx += 1
-
-            # 질환명에 공백이 있는 경우 처리
-            if ' ' in d:
-                has_space_disease = True
-                # 2. 공백을 제거한 버전도 OR 조건으로 추가
-                d_no_space = d.replace(' ', '')
-                param_name_no_space = f"disease_{param_idx}"
-                where_parts.append(f"specialty LIKE :{param_name_no_space}")
-                param[param_name_no_space] = f"%{d_no_space}%"
-                param_idx += 1
-                
-                # 3. 단어별 AND 조건 추가 (정밀도 향상)
-                tokens = d.split()
-                if len(tokens) > 1:
-                    token_parts = []
-                    for t in tokens:
-                        p_token = f"disease_{param_idx}"
-                        token_parts.append(f"specialty LIKE :{p_token}")
-                        param[p_token] = f"%{t}%"
-                        param_idx += 1
-                    where_parts.append(f"({' AND '.join(token_parts)})")
-        
-        where_clauses = " OR ".join(where_parts)
+        # 표준 질환명이 없는 경우, 원본 질환명으로 specialty 검색 (인덱스가 있으면 specialty_id 로 조회)
+        primary_clauses, fallback_clauses, has_space_disease = _specialty_clauses(search_diseases)
+        where_clauses = _specialty_where(primary_clauses, param, "disease")
+        if where_clauses is None and has_space_disease:
+            # 인덱스에서 1차 조건 일치가 없으면 2차(단어별 OR) 조건으로 바로 조회한다 (DB 왕복 1회)
+            where_clauses = _specialty_where(fallback_clauses, param, "fb_disease")
+            has_space_disease = False
+        if where_clauses is None:
+            return {"column": [], "data": []}
 
         postfix_query = f"""
         FROM 
@@ -139,43 +170,20 @@ def getRecommandDoctors(standard_disease: list, disease: list, logical_operator:
 
     query = prefix_query + score_query + postfix_query
         
-    logger.info(f"fetchData: Recommand Doctors with diseases: {search_diseases}, operator: {logical_operator} param : {param}")
-    logger.info(f"getRecommandDoctors Query: {query}")
+    sql_logger.info("fetchData: Recommand Doctors with diseases: %s, operator: %s param : %s", search_diseases, logical_operator, param)
+    sql_logger.info("getRecommandDoctors Query: %s", query)
     result = fetchData(query, param)
 
     if result.get('data'):
-        logger.info(f"getRecommandDoctors First Result: {result['data'][0]}")
+        result_logger.info("getRecommandDoctors First Result: %s", result['data'][0])
     
     # 1차 검색 결과가 없고, 공백이 포함된 질환명이 있는 경우 2차 검색(Fallback) 수행
     if not result.get('data') and not standard_disease and has_space_disease:
         logger.info("No results found in 1st search. Attempting fallback with Tokenized OR search for multi-word diseases.")
-        fb_where_parts = []
         fb_param = {"score_weight": param["score_weight"]}
-        fb_idx = 0
-        
-        for d in search_diseases:
-            if ' ' in d:
-                tokens = d.split()
-                if len(tokens) > 1:
-                    token_parts = []
-                    for t in tokens:
-                        p_name = f"fb_disease_{fb_idx}"
-                        token_parts.append(f"specialty LIKE :{p_name}")
-                        fb_param[p_name] = f"%{t}%"
-                        fb_idx += 1
-                    fb_where_parts.append(f"({' OR '.join(token_parts)})")
-                else:
-                    p_name = f"fb_disease_{fb_idx}"
-                    fb_where_parts.append(f"specialty LIKE :{p_name}")
-                    fb_param[p_name] = f"%{d}%"
-                    fb_idx += 1
-            else:
-                p_name = f"fb_disease_{fb_idx}"
-                fb_where_parts.append(f"specialty LIKE :{p_name}")
-                fb_param[p_name] = f"%{d}%"
-                fb_idx += 1
-        
-        fb_where_clauses = " OR ".join(fb_where_parts)
+        fb_where_clauses = _specialty_where(fallback_clauses, fb_param, "fb_disease")
+        if fb_where_clauses is None:
+            return result
         fb_postfix_query = f"""
         FROM 
             ( SELECT specialty_id,specialty FROM specialty WHERE {fb_where_clauses} ) a
@@ -190,7 +198,7 @@ def getRecommandDoctors(standard_disease: list, disease: list, logical_operator:
         ORDER BY total_score desc 
         LIMIT 15"""
         fb_query = prefix_query + score_query + fb_postfix_query
-        logger.info(f"Fallback Query: {fb_query} param: {fb_param}")
+        sql_logger.info("Fallback Query: %s param: %s", fb_query, fb_param)
         result = fetchData(fb_query, fb_param)
     
     return result
@@ -207,8 +215,8 @@ def getRecommandDoctorWithDiseaseAndDepartment(standard_disease: list, disease:
         evalType (EVAL_TYPE): 평가 타입.
         limit (int): 반환할 결과의 최대 수.
     """
-    prefix_query = """SELECT s.shortname, s.address, s.lat, s.lon, s.telephone, s.hospital_site,s.hid, b.doctorname, b.deptname, b.specialties,b.parse_specialties,
-    b.rid,HEX(b.rid) AS hexrid, b.doctor_id, b.doctor_url, b.profileimgurl, d.education, d.career,
+    prefix_query = f"""SELECT s.shortname, s.address, s.lat, s.lon, s.telephone, s.hospital_site,s.hid, b.doctorname, b.deptname,
+    b.rid,HEX(b.rid) AS hexrid, b.doctor_id, b.doctor_url, b.profileimgurl, {doctor_heavy_columns()},
     0 as paper_score,
     IFNULL(e.patient_score, 0) as patient_score,
     IFNULL(e.public_score, 0) as public_score,
@@ -236,41 +244,15 @@ def getRecommandDoctorWithDiseaseAndDepartment(standard_disease: list, disease:
         return {"data": []} # 검색할 질환이 없으면 빈 결과 반환
 
     if not standard_disease:
-        # 표준 질환명이 없는 경우, 원본 질환명으로 LIKE 검색
-        # 공백이 있는 질환명과 공백이 없는 질환명을 모두 검색하기 위한 로직
-        param_idx = 0
-        where_parts = []
-        has_space_disease = False
-        
-        for d in search_diseases:
-            # 1. 원본 검색어 추가
-            param_name = f"disease_{param_idx}"
-            where_parts.append(f"specialty LIKE :{param_name}")
-            param[param_name] = f"%{d}%"
-            param_idx += 1
-
-            # 질환명에 공백이 있는 경우 처리
-            if ' ' in d:
-                has_space_disease = True
-                # 2. 공백을 제거한 버전도 OR 조건으로 추가
-                d_no_space = d.replace(' ', '')
-                param_name_no_space = f"disease_{param_idx}"
-                where_parts.append(f"specialty LIKE :{param_name_no_space}")
-                param[param_name_no_space] = f"%{d_no_space}%"
-                param_idx += 1
-                
-                # 3. 단어별 AND 조건 추가 (정밀도 향상)
-                tokens = d.split()
-                if len(tokens) > 1:
-                    token_parts = []
-                    for t in tokens:
-                        p_token = f"disease_{param_idx}"
-                        token_parts.append(f"specialty LIKE :{p_token}")
-                        param[p_token] = f"%{t}%"
-                        param_idx += 1
-                    where_parts.append(f"({' AND '.join(token_parts)})")
-        
-        where_clauses = " OR ".join(where_parts)
+        # 표준 질환명이 없는 경우, 원본 질환명으로 specialty 검색 (인덱스가 있으면 specialty_id 로 조회)
+        primary_clauses, fallback_clauses, has_space_disease = _specialty_clauses(search_diseases)
+        where_clauses = _specialty_where(primary_clauses, param, "disease")
+        if where_clauses is None and has_space_disease:
+            # 인덱스에서 1차 조건 일치가 없으면 2차(단어별 OR) 조건으로 바로 조회한다 (DB 왕복 1회)
+            where_clauses = _specialty_where(fallback_clauses, param, "fb_disease")
+            has_space_disease = False
+        if where_clauses is None:
+            return {"column": [], "data": []}
 
         postfix_query = f"""
         FROM 
@@ -341,47 +323,24 @@ def getRecommandDoctorWithDiseaseAndDepartment(standard_disease: list, disease:
 
     query = prefix_query + score_query + postfix_query
         
-    logger.info(f"fetchData: Recommand Doctors with diseases: {search_diseases}, department: {department}, operator: {logical_operator} param : {param}")
-    logger.info(f"getRecommandDoctorWithDiseaseAndDepartment Query: {query}")
+    sql_logger.info("fetchData: Recommand Doctors with diseases: %s, department: %s, operator: %s param : %s", search_diseases, department, logical_operator, param)
+    sql_logger.info("getRecommandDoctorWithDiseaseAndDepartment Query: %s", query)
     result = fetchData(query, param)
 
     if result.get('data'):
-        logger.info(f"getRecommandDoctorWithDiseaseAndDepartment First Result: {result['data'][0]}")
+        result_logger.info("getRecommandDoctorWithDiseaseAndDepartment First Result: %s", result['data'][0])
     
     # 1차 검색 결과가 없고, 공백이 포함된 질환명이 있는 경우 2차 검색(Fallback) 수행
     if not result.get('data') and not standard_disease and has_space_disease:
         logger.info("No results found in 1st search. Attempting fallback with Tokenized OR search for multi-word diseases.")
-        fb_where_parts = []
         fb_param = {
             "score_weight": param["score_weight"],
             "department": param["department"],
             "limit": param["limit"]
         }
-        fb_idx = 0
-        
-        for d in search_diseases:
-            if ' ' in d:
-                tokens = d.split()
-                if len(tokens) > 1:
-                    token_parts = []
-                    for t in tokens:
-                        p_name = f"fb_disease_{fb_idx}"
-                        token_parts.append(f"specialty LIKE :{p_name}")
-                        fb_param[p_name] = f"%{t}%"
-                        fb_idx += 1
-                    fb_where_parts.append(f"({' OR '.join(token_parts)})")
-                else:
-                    p_name = f"fb_disease_{fb_idx}"
-                    fb_where_parts.append(f"specialty LIKE :{p_name}")
-                    fb_param[p_name] = f"%{d}%"
-                    fb_idx += 1
-            else:
-                p_name = f"fb_disease_{fb_idx}"
-                fb_where_parts.append(f"specialty LIKE :{p_name}")
-                fb_param[p_name] = f"%{d}%"
-                fb_idx += 1
-        
-        fb_where_clauses = " OR ".join(fb_where_parts)
+        fb_where_clauses = _specialty_where(fallback_clauses, fb_param, "fb_disease")
+        if fb_where_clauses is None:
+            return result
         fb_postfix_query = f"""
         FROM 
             ( SELECT specialty_id,specialty FROM specialty WHERE {fb_where_clauses} ) a
@@ -397,7 +356,7 @@ def getRecommandDoctorWithDiseaseAndDepartment(standard_disease: list, disease:
         ORDER BY total_score desc 
         LIMIT :limit"""
         fb_query = prefix_query + score_query + fb_postfix_query
-        logger.info(f"Fallback Query: {fb_query} param: {fb_param}")
+        sql_logger.info("Fallback Query: %s param: %s", fb_query, fb_param)
         result = fetchData(fb_query, fb_param)
     
     return result
\ No newline at end of file
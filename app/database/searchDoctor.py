@@ -1,7 +1,8 @@
 from ..config import settings
-from ..common.utils import _get_final_limit
-from .db import fetchData
+from ..common.utils import _get_final_limit, doctor_heavy_columns
+from .db import fetchData, in_clause_params
 from ..common.logger import logger
+from ..common.doctor_index import doctor_name_index
 
 def getSearchDoctors(name: str, hospital: str = "", deptname: str = "") -> list:
     """
@@ -12,8 +13,8 @@ def getSearchDoctors(name: str, hospital: str = "", deptname: str = "") -> list:
     base_query = """
         SELECT
             s.shortname, s.address, s.lat, s.lon, s.telephone,s.hospital_site, s.hid,  b.doctor_id, b.doctorname, b.deptname,
-            b.specialties, b.parse_specialties, b.doctor_url, b.profileimgurl,
-            d.education, d.career,
+            b.doctor_url, b.profileimgurl,
+            {heavy_columns},
             b.rid, HEX(b.rid) as hexrid,
             0 as paper_score,
             IFNULL(e.patient_score, 0) as patient_score,
@@ -38,10 +39,19 @@ def getSearchDoctors(name: str, hospital: str = "", deptname: str = "") -> list:
                 GROUP BY doctor_id
                 ) e ON b.doctor_id = e.doctor_id
         WHERE
-            b.doctorname LIKE :name
+            {name_condition}
             AND b.is_active in ('1','2')
     """
-    param = {"name": f"%{name}%"}
+    # 이름 인덱스가 준비되어 있으면 doctorname LIKE 전체 스캔 대신 일치하는 doctor_id로만 조회
+    doctor_ids = doctor_name_index.find_ids(name)
+    if doctor_ids is not None:
+        if not doctor_ids:
+            return []
+        placeholders, param = in_clause_params("doctor_id", doctor_ids)
+        base_query = base_query.format(name_condition=f"b.doctor_id IN ({placeholders})", heavy_columns=doctor_heavy_columns())
+    else:
+        base_query = base_query.format(name_condition="b.doctorname LIKE :name", heavy_columns=doctor_heavy_columns())
+        param = {"name": f"%{name}%"}
 
     # 병원 조건 동적 추가
     if hospital:
@@ -66,8 +76,8 @@ def getSearchDoctorsByHospitalAndDept(hospital: str, deptname: Union[str, List[s
     base_query = """
         SELECT
             s.shortname, s.address, s.lat, s.lon, s.telephone,s.hospital_site, s.hid,  b.doctor_id, b.doctorname, b.deptname,
-            b.specialties, b.parse_specialties, b.doctor_url, b.profileimgurl,
-            d.education, d.career,
+            b.doctor_url, b.profileimgurl,
+            {heavy_columns},
             b.rid, HEX(b.rid) as hexrid,
             0 as paper_score,
             IFNULL(e.patient_score, 0) as patient_score,
@@ -115,42 +125,66 @@ def getSearchDoctorsByHospitalAndDept(hospital: str, deptname: Union[str, List[s
     dept_where_clause = " OR ".join(dept_clauses)
     dept_condition = f"AND ({dept_where_clause})" if dept_where_clause else ""
 
-    query = base_query.format(dept_condition=dept_condition)
+    query = base_query.format(dept_condition=dept_condition, heavy_columns=doctor_heavy_columns())
 
     logger.debug(f"Executing getSearchDoctorsByHospitalAndDept query: {query} with params: {param}")
     result = fetchData(query, param)
     return result.get("data", [])
 
-def getDoctorById(doctor_id: int) -> list:
-    """의사 ID로 상세 정보를 가져오는 함수 (개선안)"""
+def getDoctorsByIds(doctor_ids: List[int]) -> list:
+    """
+    doctor_id 목록으로 상세 정보를 한 번에 가져오는 함수 (PK 조회 1회).
+    평가 집계도 해당 의사들만 계산하며, 결과는 입력 순서(중복 제거)를 따른다.
+    """
+    doctor_ids = list(dict.fromkeys(doctor_ids))
+    if not doctor_ids:
+        return []
 
-    query = """
+    placeholders, param = in_clause_params("doctor_id", doctor_ids)
+    query = f"""
         SELECT
-            b.doctorname, b.deptname, s.shortName as hospital_name
+            s.shortname, s.address, s.lat, s.lon, s.telephone,s.hospital_site, s.hid,  b.doctor_id, b.doctorname, b.deptname,
+            b.specialties, b.parse_specialties, b.doctor_url, b.profileimgurl,
+            d.education, d.career,
+            b.rid, HEX(b.rid) as hexrid,
+            0 as paper_score,
+            IFNULL(e.patient_score, 0) as patient_score,
+            IFNULL(e.public_score, 0) as public_score,
+            IFNULL(e.peer_score, 0) as peer_score,
+            IFNULL(e.kindness, 0) as kindness,
+            IFNULL(e.satisfaction, 0) as satisfaction,
+            IFNULL(e.explanation, 0) as explanation,
+            IFNULL(e.recommendation, 0) as recommendation
         FROM
-            doctor_basic b
-        JOIN
-            hospital s on b.hid = s.hid
+            doctor_basic b JOIN hospital s ON b.hid = s.hid
+            LEFT JOIN doctor_career d ON b.rid = d.rid
+            LEFT JOIN
+                (SELECT
+                    doctor_id,
+                    0 as paper_score, avg(patient_score) as patient_score,
+                    avg(public_score) as public_score, avg(peer_score) as peer_score,
+                    avg(kindness) as kindness, avg(satisfaction) as satisfaction,
+                    avg(explanation) as explanation, avg(recommendation) as recommendation
+                FROM
+                    doctor_evaluation
+                WHERE
+                    doctor_id IN ({placeholders})
+                GROUP BY doctor_id
+                ) e ON b.doctor_id = e.doctor_id
         WHERE
-            b.doctor_id = :doctor_id
+            b.doctor_id IN ({placeholders})
             AND b.is_active in ('1','2')
-        LIMIT 1
     """
-    param = {"doctor_id": doctor_id}
-    
-    logger.debug(f"Fetching doctor info for getDoctorById with doctor_id: {doctor_id}")
-    result = fetchData(query, param)
-    
-    if not result.get("data"):
-        return []
 
-    doctor_info = result["data"][0]
-    name = doctor_info['doctorname']
-    hospital = doctor_info['hospital_name']
-    deptname = doctor_info['deptname']
+    logger.debug(f"Executing getDoctorsByIds query with {len(doctor_ids)} ids")
+    result = fetchData(query, param)
+    order = {doctor_id: i for i, doctor_id in enumerate(doctor_ids)}
+    return sorted(result.get("data", []), key=lambda row: order.get(row["doctor_id"], len(order)))
 
-    # 통합된 getSearchDoctors 함수를 호출하여 전체 정보 조회
-    return getSearchDoctors(name, hospital, deptname)
+def getDoctorById(doctor_id: int) -> list:
+    """의사 ID로 상세 정보를 가져오는 함수"""
+    logger.debug(f"Fetching doctor info for getDoctorById with doctor_id: {doctor_id}")
+    return getDoctorsByIds([doctor_id])
 
 def getSearchDoctorsByOnlyHospital(hospital: str) -> list:
     """병원으로 의사를 검색하는 함수 (개선안)"""
@@ -158,8 +192,8 @@ def getSearchDoctorsByOnlyHospital(hospital: str) -> list:
     query = """
         SELECT
             s.shortname, s.address, s.lat, s.lon, s.telephone,s.hospital_site, s.hid, b.doctor_id, b.doctorname, b.deptname,
-            b.specialties, b.parse_specialties, b.doctor_url, b.profileimgurl,
-            d.education, d.career,
+            b.doctor_url, b.profileimgurl,
+            {heavy_columns},
             b.rid, HEX(b.rid) as hexrid,
             0 as paper_score,
             IFNULL(e.patient_score, 0) as patient_score,
@@ -193,6 +227,7 @@ def getSearchDoctorsByOnlyHospital(hospital: str) -> list:
             e.patient_score DESC
     """
     param = {"hospital": hospital}
+    query = query.format(heavy_columns=doctor_heavy_columns())
 
     logger.debug(f"Executing getSearchDoctorsByOnlyHospital query with params: {param}")
     result = fetchData(query, param)
@@ -206,8 +241,8 @@ def getSearchDoctorsByOnlyDepartment(department: Union[str, List[str]], limit: O
     base_query = """
         SELECT
             s.shortname, s.address, s.lat, s.lon, s.telephone,s.hospital_site, s.hid, b.doctor_id, b.doctorname, b.deptname,
-            b.specialties, b.parse_specialties, b.doctor_url, b.profileimgurl,
-            d.education, d.career,
+            b.doctor_url, b.profileimgurl,
+            {heavy_columns},
             b.rid, HEX(b.rid) as hexrid,
             0 as paper_score,
             IFNULL(e.patient_score, 0) as patient_score,
@@ -255,8 +290,8 @@ def getSearchDoctorsByOnlyDepartment(department: Union[str, List[str]], limit: O
 
     final_limit = _get_final_limit(limit)
 
-    query = base_query.format(dept_condition=dept_condition, limit=final_limit)
+    query = base_query.format(dept_condition=dept_condition, limit=final_limit, heavy_columns=doctor_heavy_columns())
     
     logger.debug(f"Executing getSearchDoctorsByOnlyDepartment query with params: {param}")
     result = fetchData(query, param)
-    return result.get("data", [])
\ No newline at end of file
+    return result.get("data", [])
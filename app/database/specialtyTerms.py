@@ -0,0 +1,12 @@
+from .db import fetchData
+
+def getSpecialtyTerms() -> list:
+    """진료분야 인덱스 적재용 (specialty_id, specialty) 목록"""
+
+    query = """
+        SELECT specialty_id, specialty
+        FROM specialty
+        WHERE specialty IS NOT NULL
+    """
+    result = fetchData(query, {})
+    return result.get("data", [])
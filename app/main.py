@@ -1,25 +1,87 @@
+import asyncio
+import time
+_imports_started = time.perf_counter()
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from .routers.chat import router as chat_router
+from .routers.admin import router as admin_router
 from .common.logger import setup_logger
 from .agent import get_compiled_graph
+from .services.service import execution_manager
+from .services.checkpoint_maintenance import checkpoint_maintenance
+from .common.hospital_index import hospital_alias_index
+from .common.doctor_index import doctor_name_index
+from .common.specialty_index import specialty_index
+from .common.pagination import check_pagination_config
+from .common.validation import drain_audits
+from .common.metrics import registry as metrics_registry
+from .common.startup import startup_profile, warmup, get_kiwi
+from .common.llm_clients import llm_client_pool
+from .tools.tools import get_sql_agent_executor, configure_llm_cache
+from .config import settings
+
+startup_profile.record("imports", time.perf_counter() - _imports_started)
 
 # Initialize logger
 logger = setup_logger()
 
 app = FastAPI(title="FastAPI LangChain API")
 app.include_router(chat_router)
+app.include_router(admin_router)
 
 # Add startup event handler
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application startup event triggered.")
-    app.state.graph = await get_compiled_graph()
+    check_pagination_config()
+    # 전역 LLM 캐시는 메인 agent 호출에도 적용되므로 워밍업 여부와 관계없이 기동 시 설정
+    configure_llm_cache()
+    with startup_profile.step("graph"):
+        app.state.graph = await get_compiled_graph()
     logger.info("LangGraph compiled successfully and stored in app.state.graph.")
+    with startup_profile.step("execution_manager"):
+        await execution_manager.startup()
+    checkpoint_maintenance.start()
+    hospital_alias_index.start()
+    doctor_name_index.start()
+    specialty_index.start()
+    if settings.startup_warmup:
+        # 요청은 바로 받을 수 있고, 워밍업이 끝나면 /ready 가 200이 된다
+        app.state.warmup_task = asyncio.create_task(_warmup_then_ready())
+    else:
+        startup_profile.mark_ready()
+
+async def _warmup_then_ready():
+    await warmup({"kiwi": get_kiwi, "sql_agent": get_sql_agent_executor})
+    startup_profile.mark_ready()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    startup_profile.mark_not_ready()
+    await checkpoint_maintenance.stop()
+    await hospital_alias_index.stop()
+    await doctor_name_index.stop()
+    await specialty_index.stop()
+    await drain_audits()
+    await execution_manager.shutdown()
+    await llm_client_pool.aclose()
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/ready")
+async def readiness_check():
+    # 롤링 배포 / 오토스케일링용 readiness (워밍업 완료 전에는 503)
+    profile = startup_profile.as_dict()
+    return JSONResponse(status_code=200 if profile["ready"] else 503, content=profile)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 # def main():
 #     print("Hello from aiga-llm-server!")
 
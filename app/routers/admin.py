@@ -0,0 +1,92 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from ..services.service import execution_manager
+from ..services.checkpoint_maintenance import checkpoint_maintenance
+from ..services.admission import admission_controller
+from ..common.sql_profiler import sql_profiler
+from ..common.hospital_index import hospital_alias_index
+from ..common.doctor_index import doctor_name_index
+from ..common.specialty_index import specialty_index
+from ..common.storage_codec import storage_codec
+from ..config import settings
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/executions")
+async def executions():
+    # 워커별 진행 중인 LangGraph 실행 수
+    workers = await execution_manager.inflight_counts()
+    return {
+        "worker_id": settings.worker_id,
+        "backend": execution_manager.registry.backend_name,
+        "workers": workers,
+        "total": sum(workers.values()),
+        "policy": execution_manager.policy,
+        "local": execution_manager.stats(),
+        "admission": admission_controller.stats(),
+    }
+
+@router.get("/checkpoints/gc")
+async def checkpoint_gc_report():
+    # 마지막 체크포인트 정리 결과
+    return {
+        "enabled": settings.checkpoint_gc_enable,
+        "ttl_hours": settings.checkpoint_session_ttl_hours,
+        "last_report": checkpoint_maintenance.last_report,
+    }
+
+@router.post("/checkpoints/gc")
+async def run_checkpoint_gc():
+    # 수동 실행 (배포 직후 정리 등). GC가 꺼져 있으면 세션 활동이 기록되지 않으므로 실행하지 않는다
+    if not settings.checkpoint_gc_enable:
+        raise HTTPException(status_code=409, detail="CHECKPOINT_GC_ENABLE is false")
+    if not checkpoint_maintenance.attached:
+        raise HTTPException(status_code=503, detail="checkpoint database is not attached yet")
+    return await checkpoint_maintenance.run_once()
+
+@router.get("/sql-profile")
+async def sql_profile(sort: str = "total_ms", limit: int = 50):
+    # 쿼리 형태별 집계 + 느린 쿼리 (sort: total_ms | max_ms | avg_ms | count | rows_total | rows_max)
+    return sql_profiler.snapshot(sort=sort, limit=limit)
+
+@router.post("/sql-profile/reset")
+async def reset_sql_profile():
+    sql_profiler.reset()
+    return {"status": "ok"}
+
+@router.get("/hospital-alias-index")
+async def hospital_alias_index_stats():
+    # 병원 별칭 인메모리 인덱스 상태
+    return hospital_alias_index.stats()
+
+@router.post("/hospital-alias-index/refresh")
+async def refresh_hospital_alias_index():
+    # 별칭 테이블 변경 직후 수동 재적재
+    count = await asyncio.to_thread(hospital_alias_index.refresh)
+    return {"status": "ok", "entries": count}
+
+@router.get("/doctor-name-index")
+async def doctor_name_index_stats():
+    # 의사 이름 인메모리 인덱스 상태
+    return doctor_name_index.stats()
+
+@router.post("/doctor-name-index/refresh")
+async def refresh_doctor_name_index():
+    count = await asyncio.to_thread(doctor_name_index.refresh)
+    return {"status": "ok", "doctors": count}
+
+@router.get("/specialty-index")
+async def specialty_index_stats():
+    # 진료분야 역색인 상태
+    return specialty_index.stats()
+
+@router.post("/specialty-index/refresh")
+async def refresh_specialty_index():
+    count = await asyncio.to_thread(specialty_index.refresh)
+    return {"status": "ok", "entries": count}
+
+@router.get("/storage-codec")
+async def storage_codec_stats():
+    # SQLite 저장 압축률 / 인코딩·디코딩 시간 (이 워커 기동 이후)
+    return storage_codec.stats()
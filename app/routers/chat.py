@@ -1,11 +1,13 @@
 import re
+import asyncio
 from fastapi import APIRouter, Depends, Request
 from ..services.service import startQuery, stopQuery
 from ..database.db import get_db
 from fastapi.responses import JSONResponse
-from ..services.service import findDoctor
+from fastapi.encoders import jsonable_encoder
+from ..services.service import findDoctor, findDoctors, fetchMore
 from ..common.logger import logger
-from ..common.schemas import ChatRequest, StopRequest, ChatResponse
+from ..common.schemas import ChatRequest, StopRequest, ChatResponse, DoctorsRequest, MoreRequest
 from ..common.sanitizer import sanitize_prompt
 
 
@@ -37,4 +39,16 @@ async def detailDoctor(req: ChatRequest, db=Depends(get_db)):
     reply = findDoctor(req.message, req.session_id)
     if isinstance(reply, dict):
         return JSONResponse(content=reply)
-    return ChatResponse(reply=reply)
\ No newline at end of file
+    return ChatResponse(reply=reply)
+
+@router.post("/doctors")
+async def detailDoctors(req: DoctorsRequest, db=Depends(get_db)):
+    # 여러 의사 상세 정보를 한 번에 조회 (저장 목록 렌더링용)
+    reply = await asyncio.to_thread(findDoctors, req.doctor_ids, req.session_id)
+    return JSONResponse(content=reply)
+
+@router.post("/more")
+async def moreResults(req: MoreRequest, db=Depends(get_db)):
+    # 검색 결과 다음 페이지 (next_cursor). LLM 호출 없이 DB만 조회
+    reply = await fetchMore(req.cursor, req.session_id)
+    return JSONResponse(content=jsonable_encoder(reply))
@@ -0,0 +1,154 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from ..common.logger import logger
+from ..common.metrics import registry as metrics_registry
+from ..config import settings
+
+# 워커 단위 동시 실행 수 제한(admission control).
+# 한도를 넘으면 제한된 대기열에서 기다리고, 대기열이 가득 차거나 대기 시간이 초과되면 429로 즉시 거절한다.
+# 대기열은 세션(클라이언트)별로 나뉘어 라운드 로빈으로 꺼내므로 한 클라이언트가 대기열을 독점할 수 없다.
+
+ADMISSION_ACTIVE = metrics_registry.gauge("aiga_admission_active", "Chat turns currently admitted on this worker")
+ADMISSION_QUEUE_DEPTH = metrics_registry.gauge("aiga_admission_queue_depth", "Chat turns waiting for admission on this worker")
+ADMISSION_REJECTED = metrics_registry.counter("aiga_admission_rejected_total", "Chat turns rejected with 429", ("reason",))
+ADMISSION_WAIT_SECONDS = metrics_registry.histogram(
+    "aiga_admission_wait_seconds",
+    "Time spent waiting for admission",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"서버가 혼잡합니다. {retry_after}초 후 다시 시도해 주세요.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, max_concurrency: int = None, max_queue: int = None, max_queued_per_key: int = None, queue_timeout: float = None):
+        self.max_concurrency = settings.admission_max_concurrency if max_concurrency is None else max_concurrency
+        self.max_queue = settings.admission_max_queue if max_queue is None else max_queue
+        self.max_queued_per_key = settings.admission_max_queued_per_session if max_queued_per_key is None else max_queued_per_key
+        self.queue_timeout = settings.admission_queue_timeout_seconds if queue_timeout is None else queue_timeout
+        self._active = 0
+        self._queued = 0
+        # key -> 대기 중인 future 목록. 앞쪽 key부터 하나씩 꺼내고 뒤로 보낸다 (라운드 로빈)
+        self._waiters: "OrderedDict[str, deque]" = OrderedDict()
+        # 평균 처리 시간(EMA). Retry-After 추정에 사용
+        self._avg_service_seconds = 5.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrency > 0
+
+    def _retry_after(self) -> int:
+        slots = max(1, self.max_concurrency)
+        return max(1, math.ceil(self._avg_service_seconds * (self._queued + 1) / slots))
+
+    def _update_gauges(self):
+        ADMISSION_ACTIVE.set(self._active)
+        ADMISSION_QUEUE_DEPTH.set(self._queued)
+
+    def _reject(self, reason: str):
+        retry_after = self._retry_after()
+        ADMISSION_REJECTED.inc(reason=reason)
+        logger.warning(f"Admission rejected ({reason}): active={self._active}, queued={self._queued}, retry_after={retry_after}s")
+        raise AdmissionRejected(reason, retry_after)
+
+    def _remove_waiter(self, key: str, future: asyncio.Future):
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not waiters:
+            del self._waiters[key]
+
+    def _wake_next(self):
+        # 빈 슬롯을 다음 key의 첫 대기자에게 넘긴다 (active 수는 그대로)
+        while self._waiters:
+            key, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            self._queued -= 1
+            if waiters:
+                self._waiters.move_to_end(key)
+            else:
+                del self._waiters[key]
+            if not future.done():
+                future.set_result(True)
+                return
+        self._active -= 1
+
+    async def _acquire(self, key: str):
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            return
+        if self._queued >= self.max_queue:
+            self._reject("queue_full")
+        if len(self._waiters.get(key, ())) >= self.max_queued_per_key:
+            self._reject("session_queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        self._queued += 1
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done():
+                # 시간 초과와 동시에 슬롯을 넘겨받은 경우
+                return
+            self._remove_waiter(key, future)
+            self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if future.done():
+                # 슬롯을 받은 직후 취소되면 다음 대기자에게 넘긴다
+                self._wake_next()
+            else:
+                self._remove_waiter(key, future)
+            raise
+        finally:
+            ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - started)
+            self._update_gauges()
+
+    def _release(self, service_seconds: float):
+        self._avg_service_seconds = 0.9 * self._avg_service_seconds + 0.1 * service_seconds
+        self._wake_next()
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self, key: str):
+        """`async with admission_controller.slot(session_id):` 로 감싼 구간만 동시 실행 한도에 포함된다"""
+        if not self.enabled:
+            yield
+            return
+        await self._acquire(key)
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": self._queued,
+            "max_queue": self.max_queue,
+            "queued_sessions": len(self._waiters),
+            "avg_service_seconds": round(self._avg_service_seconds, 3),
+        }
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,187 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+import aiosqlite
+
+from ..common.logger import logger
+from ..common.metrics import registry as metrics_registry
+from ..config import settings
+
+GC_RUNS = metrics_registry.counter("aiga_checkpoint_gc_runs_total", "Checkpoint GC runs", ("outcome",))
+GC_DELETED_SESSIONS = metrics_registry.counter("aiga_checkpoint_gc_deleted_sessions_total", "Sessions removed by checkpoint GC")
+GC_RECLAIMED_BYTES = metrics_registry.counter("aiga_checkpoint_gc_reclaimed_bytes_total", "Bytes reclaimed from checkpoint sqlite files")
+
+
+class CheckpointMaintenance:
+    """
+    checkpoints.sqlite 보존 정책 관리.
+    - session_activity 테이블에 thread_id별 마지막 사용 시각을 기록
+    - TTL이 지난 세션의 checkpoints / writes / tool_results_cache 를 배치 단위로 삭제
+    - WAL checkpoint(TRUNCATE) 및 incremental vacuum 후 회수된 바이트를 보고
+    """
+
+    def __init__(self):
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_report: Dict = {}
+
+    async def attach(self, conn: aiosqlite.Connection, lock: asyncio.Lock = None):
+        """그래프 체크포인터와 같은 연결을 사용 (lock은 AsyncSqliteSaver.lock 공유)"""
+        self._conn = conn
+        self._lock = lock or asyncio.Lock()
+        async with self._lock:
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_activity (
+                    thread_id TEXT PRIMARY KEY,
+                    last_seen DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            await conn.commit()
+
+    @property
+    def attached(self) -> bool:
+        return self._conn is not None
+
+    async def touch(self, thread_id: str):
+        # GC가 꺼져 있으면 활동 기록(쓰기 + commit)도 하지 않는다
+        if not settings.checkpoint_gc_enable or self._conn is None:
+            return
+        try:
+            async with self._lock:
+                await self._conn.execute(
+                    "INSERT INTO session_activity (thread_id, last_seen) VALUES (?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT(thread_id) DO UPDATE SET last_seen = CURRENT_TIMESTAMP",
+                    (thread_id,),
+                )
+                await self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to update session activity for {thread_id}: {e}")
+
+    def start(self):
+        if not settings.checkpoint_gc_enable or self._conn is None:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+            logger.info(
+                f"Checkpoint GC scheduled every {settings.checkpoint_gc_interval_seconds}s "
+                f"(session TTL {settings.checkpoint_session_ttl_hours}h)"
+            )
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.checkpoint_gc_interval_seconds)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                GC_RUNS.inc(outcome="error")
+                logger.error(f"Checkpoint GC failed: {e}", exc_info=True)
+
+    def _file_bytes(self) -> int:
+        path = settings.sqlite_directory
+        total = 0
+        for suffix in ("", "-wal"):
+            try:
+                total += os.path.getsize(path + suffix)
+            except OSError:
+                pass
+        return total
+
+    async def _existing_tables(self) -> List[str]:
+        async with self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'") as cursor:
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def run_once(self) -> Dict:
+        started = time.perf_counter()
+        bytes_before = self._file_bytes()
+        ttl_modifier = f"-{settings.checkpoint_session_ttl_hours} hours"
+        batch_size = max(1, settings.checkpoint_gc_batch_size)
+
+        tables = await self._existing_tables()
+        session_tables = [t for t in ("checkpoints", "writes") if t in tables]
+
+        async with self._lock:
+            # 기록이 없는 기존 세션은 지금부터 TTL을 적용
+            for table in session_tables:
+                await self._conn.execute(
+                    f"INSERT OR IGNORE INTO session_activity (thread_id) SELECT DISTINCT thread_id FROM {table}"
+                )
+            await self._conn.commit()
+
+        deleted_sessions = 0
+        while True:
+            async with self._lock:
+                async with self._conn.execute(
+                    "SELECT thread_id FROM session_activity WHERE last_seen < datetime('now', ?) LIMIT ?",
+                    (ttl_modifier, batch_size),
+                ) as cursor:
+                    thread_ids = [row[0] for row in await cursor.fetchall()]
+                if not thread_ids:
+                    break
+                placeholders = ", ".join("?" for _ in thread_ids)
+                for table in session_tables:
+                    await self._conn.execute(f"DELETE FROM {table} WHERE thread_id IN ({placeholders})", thread_ids)
+                await self._conn.execute(f"DELETE FROM tool_results_cache WHERE session_id IN ({placeholders})", thread_ids)
+                await self._conn.execute(f"DELETE FROM session_activity WHERE thread_id IN ({placeholders})", thread_ids)
+                await self._conn.commit()
+            deleted_sessions += len(thread_ids)
+            # 배치 사이에 이벤트 루프를 양보하여 요청 처리 지연을 최소화
+            await asyncio.sleep(0)
+            if len(thread_ids) < batch_size:
+                break
+
+        async with self._lock:
+            # 세션 기록 없이 남은 오래된 캐시 결과 정리
+            cursor = await self._conn.execute(
+                "DELETE FROM tool_results_cache WHERE created_at < datetime('now', ?) "
+                "AND session_id NOT IN (SELECT thread_id FROM session_activity)",
+                (ttl_modifier,),
+            )
+            orphan_results = cursor.rowcount
+            await cursor.close()
+            await self._conn.commit()
+
+            async with self._conn.execute("PRAGMA auto_vacuum") as cursor:
+                auto_vacuum = (await cursor.fetchone())[0]
+            if auto_vacuum != 2 and settings.checkpoint_gc_convert_auto_vacuum:
+                # incremental vacuum을 쓰려면 한 번의 전체 VACUUM으로 모드를 전환해야 함
+                logger.info("Converting checkpoint database to auto_vacuum=INCREMENTAL (one-time VACUUM)")
+                await self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                await self._conn.execute("VACUUM")
+                auto_vacuum = 2
+            if auto_vacuum == 2:
+                await self._conn.execute(f"PRAGMA incremental_vacuum({int(settings.checkpoint_gc_vacuum_pages)})")
+            await self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        bytes_after = self._file_bytes()
+        reclaimed = max(0, bytes_before - bytes_after)
+        report = {
+            "deleted_sessions": deleted_sessions,
+            "deleted_orphan_results": orphan_results,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "reclaimed_bytes": reclaimed,
+            "auto_vacuum": auto_vacuum,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+        GC_RUNS.inc(outcome="success")
+        GC_DELETED_SESSIONS.inc(deleted_sessions)
+        GC_RECLAIMED_BYTES.inc(reclaimed)
+        self.last_report = report
+        logger.info(f"Checkpoint GC finished: {report}")
+        return report
+
+
+checkpoint_maintenance = CheckpointMaintenance()
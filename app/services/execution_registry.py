@@ -0,0 +1,215 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from ..common.logger import logger
+from ..config import settings
+
+CancelHandler = Callable[[str], Awaitable[bool]]
+
+
+class ExecutionRegistry:
+    """
+    세션별 LangGraph 실행이 어느 워커에서 돌고 있는지 기록하는 레지스트리의 기본 클래스.
+    - register/unregister: 현재 워커가 소유한 세션을 기록/해제
+    - request_cancel: 다른 워커가 소유한 세션에 중지 요청을 전달
+    - inflight_counts: 워커별 진행 중인 실행 수
+    """
+    backend_name = "base"
+
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+        self._sessions: Set[str] = set()
+        self._cancel_handler: Optional[CancelHandler] = None
+
+    def set_cancel_handler(self, handler: CancelHandler):
+        # 다른 워커로부터 중지 요청이 왔을 때 로컬 태스크를 취소할 콜백
+        self._cancel_handler = handler
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def register(self, session_id: str):
+        self._sessions.add(session_id)
+
+    async def unregister(self, session_id: str):
+        self._sessions.discard(session_id)
+
+    async def request_cancel(self, session_id: str) -> bool:
+        raise NotImplementedError
+
+    async def inflight_counts(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    async def _handle_cancel(self, session_id: str) -> bool:
+        if self._cancel_handler is None:
+            return False
+        return await self._cancel_handler(session_id)
+
+
+class LocalExecutionRegistry(ExecutionRegistry):
+    """단일 프로세스용 레지스트리. 다른 워커가 없으므로 원격 중지는 항상 실패한다."""
+    backend_name = "local"
+
+    async def request_cancel(self, session_id: str) -> bool:
+        return False
+
+    async def inflight_counts(self) -> Dict[str, int]:
+        return {self.worker_id: len(self._sessions)}
+
+
+class RedisExecutionRegistry(ExecutionRegistry):
+    """
+    Redis를 공유 저장소로 사용하는 레지스트리.
+    - {prefix}:owner (hash)          : session_id -> worker_id
+    - {prefix}:worker:{worker_id}    : 워커 heartbeat (TTL), 값은 진행 중인 실행 수
+    - {prefix}:cancel:{worker_id}    : 워커별 중지 요청 pub/sub 채널
+    heartbeat가 끊긴 워커는 집계에서 자동으로 빠진다.
+    """
+    backend_name = "redis"
+
+    # 소유자가 자신일 때만 삭제 (다른 워커가 같은 세션을 새로 시작한 경우 보호)
+    _UNREGISTER_SCRIPT = """
+    if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+        return redis.call('HDEL', KEYS[1], ARGV[1])
+    end
+    return 0
+    """
+
+    def __init__(self, worker_id: str, redis_url: str, prefix: str, heartbeat_seconds: int):
+        super().__init__(worker_id)
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self._heartbeat_seconds = max(1, heartbeat_seconds)
+        self._redis = None
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @property
+    def _owner_key(self) -> str:
+        return f"{self._prefix}:owner"
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f"{self._prefix}:worker:{worker_id}"
+
+    def _cancel_channel(self, worker_id: str) -> str:
+        return f"{self._prefix}:cancel:{worker_id}"
+
+    async def start(self):
+        import redis.asyncio as aioredis  # redis는 공유 백엔드를 쓸 때만 필요
+
+        self._redis = aioredis.from_url(self._redis_url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(self._cancel_channel(self.worker_id))
+        await self._beat()
+        self._listener_task = asyncio.create_task(self._listen())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"Redis execution registry started for worker {self.worker_id}")
+
+    async def close(self):
+        for task in (self._listener_task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self._redis is None:
+            return
+        try:
+            if self._sessions:
+                await self._redis.hdel(self._owner_key, *self._sessions)
+            await self._redis.delete(self._worker_key(self.worker_id))
+            await self._pubsub.aclose()
+            await self._redis.aclose()
+        except Exception as e:
+            logger.warning(f"Error while closing redis execution registry: {e}")
+
+    async def register(self, session_id: str):
+        await super().register(session_id)
+        try:
+            await self._redis.hset(self._owner_key, session_id, self.worker_id)
+        except Exception as e:
+            # 공유 저장소 장애 시에도 로컬 실행은 계속 진행
+            logger.warning(f"Failed to register session {session_id} in redis: {e}")
+
+    async def unregister(self, session_id: str):
+        await super().unregister(session_id)
+        try:
+            await self._redis.eval(self._UNREGISTER_SCRIPT, 1, self._owner_key, session_id, self.worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to unregister session {session_id} in redis: {e}")
+
+    async def request_cancel(self, session_id: str) -> bool:
+        try:
+            owner = await self._redis.hget(self._owner_key, session_id)
+            if not owner:
+                return False
+            if owner == self.worker_id:
+                return await self._handle_cancel(session_id)
+            receivers = await self._redis.publish(self._cancel_channel(owner), session_id)
+        except Exception as e:
+            # 공유 저장소 장애 시 원격 중지는 실패로 처리 (로컬 실행은 이미 확인됨)
+            logger.warning(f"Failed to forward cancel request for session {session_id} via redis: {e}")
+            return False
+        logger.info(f"Cancel request for session {session_id} sent to worker {owner} (receivers={receivers})")
+        return receivers > 0
+
+    async def inflight_counts(self) -> Dict[str, int]:
+        # 공유 저장소 장애 시에도 최소한 현재 워커의 수는 반환 (부분 결과)
+        counts: Dict[str, int] = {self.worker_id: len(self._sessions)}
+        pattern = self._worker_key("*")
+        try:
+            async for key in self._redis.scan_iter(match=pattern):
+                value = await self._redis.get(key)
+                if value is not None:
+                    counts[key.rsplit(":", 1)[-1]] = int(value)
+        except Exception as e:
+            logger.warning(f"Failed to read inflight counts from redis: {e}")
+        return counts
+
+    async def _beat(self):
+        await self._redis.set(
+            self._worker_key(self.worker_id),
+            len(self._sessions),
+            ex=self._heartbeat_seconds * 3,
+        )
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(self._heartbeat_seconds)
+            try:
+                await self._beat()
+            except Exception as e:
+                logger.warning(f"Execution registry heartbeat failed: {e}")
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    session_id = message["data"]
+                    cancelled = await self._handle_cancel(session_id)
+                    logger.info(f"Remote cancel for session {session_id} handled on worker {self.worker_id}: {cancelled}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Execution registry listener error: {e}")
+                await asyncio.sleep(1.0)
+
+
+def create_execution_registry() -> ExecutionRegistry:
+    backend = (settings.execution_registry_backend or "local").lower()
+    if backend == "redis":
+        return RedisExecutionRegistry(
+            worker_id=settings.worker_id,
+            redis_url=settings.redis_url,
+            prefix=settings.execution_registry_prefix,
+            heartbeat_seconds=settings.execution_registry_heartbeat_seconds,
+        )
+    if backend != "local":
+        logger.warning(f"Unknown EXECUTION_REGISTRY_BACKEND '{backend}', falling back to local registry.")
+    return LocalExecutionRegistry(worker_id=settings.worker_id)
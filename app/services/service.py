@@ -5,43 +5,182 @@ from langchain_core.runnables.config import RunnableConfig
 from langchain_core.messages import ToolMessage, AIMessage
 import json
 import asyncio
-from typing import Dict
-from ..database.searchDoctor import getDoctorById
+import functools
+from typing import Dict, List
+from ..database.searchDoctor import getDoctorById, getDoctorsByIds
 from ..tools.tools import formattingDoctorInfo
+from ..tools.sql_tool import PAGINATED_SEARCHES
+from ..common.pagination import decode_cursor, InvalidCursor, pagination_enabled
+from ..common.utils import compact_observation
 from ..common.logger import logger
 from ..common.callbacks import TokenCountingCallback
+from ..common.deadline import new_deadline, hard_timeout, DEADLINE_EXCEEDED
+from ..common.metrics import registry as metrics_registry
 from ..config import settings
+from .execution_registry import ExecutionRegistry, create_execution_registry
+from .checkpoint_maintenance import checkpoint_maintenance
+from .admission import admission_controller, AdmissionRejected
 import re
 
+EXECUTIONS_ACTIVE = metrics_registry.gauge("aiga_executions_active", "Running LangGraph executions in this worker")
+EXECUTIONS_QUEUED = metrics_registry.gauge("aiga_executions_queued", "LangGraph executions waiting for a previous run of the same session")
+EXECUTIONS_COMPLETED = metrics_registry.counter("aiga_executions_completed_total", "Finished LangGraph executions", ("outcome",))
+
+
+class SessionBusyError(Exception):
+    """같은 세션의 실행이 이미 진행 중이고 정책이 reject인 경우"""
+    def __init__(self, session_id: str):
+        super().__init__(f"Execution already in progress for session_id({session_id})")
+        self.session_id = session_id
+
+
 # 상태 관리를 위한 클래스
 class LangGraphExecutionManager:
-    def __init__(self):
+    # 같은 세션에 대한 동시 실행 정책
+    POLICY_CANCEL = "cancel"   # 이전 실행을 취소하고 새 실행 시작
+    POLICY_REJECT = "reject"   # 새 실행을 거절
+    POLICY_QUEUE = "queue"     # 이전 실행이 끝난 뒤 순서대로 실행
+
+    def __init__(self, registry: ExecutionRegistry = None, policy: str = None):
         self._tasks: Dict[str, asyncio.Task] = {}
+        # queue 정책: 실행 -> 앞서 대기 중인 같은 세션의 실행 (중지 시 체인 전체 취소)
+        self._previous: Dict[asyncio.Task, asyncio.Task] = {}
+        # 세션 -> 레지스트리 등록을 소유한 최신 실행의 토큰 (이전 실행이 새 등록을 해제하지 않도록)
+        self._owners: Dict[str, object] = {}
         self._lock = asyncio.Lock()
+        self._policy = (policy or settings.session_concurrency_policy or self.POLICY_CANCEL).lower()
+        # 워커 간 실행 소유 정보 공유 (다른 워커로 들어온 /chat/stop 처리용)
+        self._registry = registry or create_execution_registry()
+        self._registry.set_cancel_handler(self._cancel_local)
+
+    @property
+    def registry(self) -> ExecutionRegistry:
+        return self._registry
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    async def startup(self):
+        await self._registry.start()
+
+    async def shutdown(self):
+        await self._registry.close()
+
+    async def _run(self, session_id: str, coro, owner: object, previous: asyncio.Task = None):
+        try:
+            if previous is not None:
+                # queue 정책: 같은 세션의 이전 실행이 끝날 때까지 대기 (체크포인트 동시 쓰기 방지)
+                EXECUTIONS_QUEUED.inc()
+                try:
+                    await asyncio.wait([previous])
+                finally:
+                    EXECUTIONS_QUEUED.dec()
+            EXECUTIONS_ACTIVE.inc()
+            try:
+                return await coro
+            finally:
+                EXECUTIONS_ACTIVE.dec()
+        finally:
+            coro.close()
+            # 같은 세션에 더 최신 실행이 등록되어 있으면 소유 정보는 그대로 둔다
+            if self._owners.get(session_id) is owner:
+                del self._owners[session_id]
+                await self._registry.unregister(session_id)
+
+    def _on_done(self, session_id: str, task: asyncio.Task):
+        # 완료된 태스크(결과 메시지 포함)를 즉시 해제
+        if self._tasks.get(session_id) is task:
+            del self._tasks[session_id]
+        self._previous.pop(task, None)
+        if task.cancelled():
+            outcome = "cancelled"
+        elif task.exception() is not None:
+            outcome = "error"
+        else:
+            outcome = "success"
+        EXECUTIONS_COMPLETED.inc(outcome=outcome)
     
     async def start_task(self, session_id: str, coro):
         async with self._lock:
-            task = asyncio.create_task(coro)
+            previous = self._tasks.get(session_id)
+            if previous is not None and previous.done():
+                previous = None
+            if previous is not None:
+                if self._policy == self.POLICY_REJECT:
+                    coro.close()
+                    raise SessionBusyError(session_id)
+                if self._policy == self.POLICY_QUEUE:
+                    logger.info(f"Queueing execution for session {session_id} behind the running one")
+                else:
+                    logger.info(f"Cancelling previous execution for session {session_id}")
+                    # 이전 실행이 체크포인트를 쓰는 중일 수 있으므로 종료를 잠시 기다린다
+                    chain = self._chain(previous)
+                    for running in chain:
+                        running.cancel()
+                    _, pending = await asyncio.wait(chain, timeout=settings.session_cancel_wait_seconds)
+                    if pending:
+                        logger.warning(f"Previous execution for session {session_id} did not stop in time; new run waits for it")
+                    else:
+                        previous = None
+            # 실행이 시작(및 종료)되기 전에 등록해야 해제가 등록보다 앞서지 않는다
+            owner = object()
+            self._owners[session_id] = owner
+            await self._registry.register(session_id)
+            task = asyncio.create_task(self._run(session_id, coro, owner, previous))
+            task.add_done_callback(functools.partial(self._on_done, session_id))
             self._tasks[session_id] = task
+            if previous is not None:
+                self._previous[task] = previous
             return task
-    
-    async def stop_task(self, session_id: str):
+
+    def _chain(self, task: asyncio.Task) -> List[asyncio.Task]:
+        """task와 그 앞에 대기 중인 같은 세션의 실행들 (끝나지 않은 것만)"""
+        chain = []
+        while task is not None:
+            if not task.done():
+                chain.append(task)
+            task = self._previous.get(task)
+        return chain
+
+    async def _cancel_local(self, session_id: str) -> bool:
         async with self._lock:
-            if session_id in self._tasks:
-                task = self._tasks[session_id]
-                if not task.done():
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
+            task = self._tasks.get(session_id)
+            if task is None:
+                return False
+            # queue 정책이면 실제 실행 중인 이전 실행까지 모두 취소
+            chain = self._chain(task)
+            for running in chain:
+                running.cancel()
+            if chain:
+                await asyncio.gather(*chain, return_exceptions=True)
+            if self._tasks.get(session_id) is task:
                 del self._tasks[session_id]
-                return True
-            return False
+            return True
+    
+    async def stop_task(self, session_id: str):
+        if await self._cancel_local(session_id):
+            return True
+        # 현재 워커에 없으면 소유 워커에 중지 요청을 전달
+        return await self._registry.request_cancel(session_id)
     
     def get_task(self, session_id: str) -> asyncio.Task:
         return self._tasks.get(session_id)
 
+    async def inflight_counts(self) -> Dict[str, int]:
+        return await self._registry.inflight_counts()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "active": EXECUTIONS_ACTIVE.value(),
+            "queued": EXECUTIONS_QUEUED.value(),
+            "completed": {
+                outcome: EXECUTIONS_COMPLETED.value(outcome=outcome)
+                for outcome in ("success", "error", "cancelled")
+            },
+            "tracked_tasks": len(self._tasks),
+        }
+
 def makeResponse(question: str, result, token_counter: TokenCountingCallback):
     total_tokens = None
     input_tokens = None
@@ -108,6 +247,8 @@ def makeResponse(question: str, result, token_counter: TokenCountingCallback):
         "grand_total_input_tokens": token_counter.total_prompt_tokens,
         "grand_total_output_tokens": token_counter.total_completion_tokens,
         "grand_total_tokens": token_counter.total_tokens,
+        "grand_total_cached_tokens": token_counter.total_cached_tokens,
+        "token_breakdown": token_counter.breakdown(), # 호출 노드/run name 별 사용량
         "llm_ai_model": settings.azure_api_model,
     }
 
@@ -118,6 +259,7 @@ def makeResponse(question: str, result, token_counter: TokenCountingCallback):
         final_doctors_list = []
         final_hospitals_list = []
         answer_template = None
+        answer_count = 0
 
         for content_dict in tool_contents:
             if content_dict.get("migrated") is True:
@@ -128,6 +270,7 @@ def makeResponse(question: str, result, token_counter: TokenCountingCallback):
 
             answer = content_dict.get("answer")
             if isinstance(answer, dict):
+                answer_count += 1
                 if answer_template is None:
                     answer_template = answer.copy()
                 
@@ -141,6 +284,9 @@ def makeResponse(question: str, result, token_counter: TokenCountingCallback):
                 answer_template['doctors'] = final_doctors_list
             if "hospitals" in answer_template:
                 answer_template['hospitals'] = final_hospitals_list
+            if answer_count > 1:
+                # 여러 도구 결과를 합친 목록은 한 검색의 다음 페이지로 이어갈 수 없다
+                answer_template.pop("next_cursor", None)
             
             json_response["answer"] = answer_template
         # else: dict 형태의 answer가 없는 도구(general)는 기본 요약문을 answer로 사용
@@ -170,7 +316,8 @@ async def startQuery(req: ChatRequest, request: Request) -> dict:
 
         config = {
             "callbacks": [token_counter],
-            "configurable": {"thread_id": session_id}
+            # deadline_at: 요청 deadline (time.monotonic 기준). 각 노드가 남은 예산으로 선택 작업 여부를 판단
+            "configurable": {"thread_id": session_id, "deadline_at": new_deadline()}
         }
 
         if os.getenv("LANGSMITH_TRACING") == "true":
@@ -189,28 +336,44 @@ async def startQuery(req: ChatRequest, request: Request) -> dict:
 
 
         current_graph = request.app.state.graph
+        await checkpoint_maintenance.touch(session_id)
         
         locale = req.locale or settings.default_locale
         latitude = req.latitude
         longitude = req.longitude
 
-        task = await execution_manager.start_task(
-            session_id,
-            current_graph.ainvoke({
-                    "messages": [HumanMessage(content=prompt)],
-                    "locale": locale,
-                    "latitude": latitude,
-                    "longitude": longitude,
-                },
-                config=config
+        async with admission_controller.slot(session_id):
+            task = await execution_manager.start_task(
+                session_id,
+                current_graph.ainvoke({
+                        "messages": [HumanMessage(content=prompt)],
+                        "locale": locale,
+                        "latitude": latitude,
+                        "longitude": longitude,
+                    },
+                    config=config
+                )
             )
-        )
 
-        result = await task
+            timeout = hard_timeout(config["configurable"]["deadline_at"])
+            try:
+                # 시간 초과 시 wait_for가 task를 취소한다 (p99 상한)
+                result = await asyncio.wait_for(task, timeout=timeout) if timeout else await task
+            except asyncio.TimeoutError:
+                DEADLINE_EXCEEDED.inc()
+                logger.warning(f"Query exceeded deadline ({timeout}s) for session {session_id}")
+                raise HTTPException(status_code=504, detail="요청 처리 시간이 초과되었습니다.")
         response = makeResponse(prompt, result, token_counter)
         logger.info(f"Query completed for session {session_id}")
         return response
         
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except SessionBusyError as e:
+        logger.warning(f"Rejected concurrent query for session {session_id}")
+        raise HTTPException(status_code=409, detail=str(e))
     except asyncio.CancelledError:
         logger.warning(f"Query cancelled for session {session_id}")
         return {
@@ -269,4 +432,43 @@ def findDoctor(message: str, session_id: str):
         }
     except Exception as e:
         logger.error(f"Error in findDoctor for session {session_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def findDoctors(doctor_ids: list, session_id: str = None):
+    """저장된 목록 등 여러 의사의 상세 정보를 한 번에 조회 (입력 순서 유지)"""
+    if not doctor_ids:
+        raise HTTPException(status_code=400, detail="doctor_ids가 비어 있습니다.")
+    if len(doctor_ids) > settings.doctor_batch_max_ids:
+        raise HTTPException(status_code=400, detail=f"doctor_ids는 최대 {settings.doctor_batch_max_ids}개까지 조회할 수 있습니다.")
+    try:
+        doctors = getDoctorsByIds(doctor_ids)
+        formattedDoctors = formattingDoctorInfo(doctors, True)
+        logger.info(f"Doctors found for session {session_id}: {len(formattedDoctors)}/{len(doctor_ids)}")
+        return {
+            "doctors": formattedDoctors
+        }
+    except Exception as e:
+        logger.error(f"Error in findDoctors for session {session_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def fetchMore(cursor: str, session_id: str = None):
+    """검색 결과 "더 보기": 커서의 검색 조건으로 다음 페이지를 LLM 없이 DB에서 바로 조회"""
+    if not pagination_enabled():
+        raise HTTPException(status_code=404, detail="더 보기 기능이 비활성화되어 있습니다.")
+    try:
+        decoded = decode_cursor(cursor)
+    except InvalidCursor as e:
+        logger.warning(f"Invalid continuation cursor for session {session_id}: {e}")
+        raise HTTPException(status_code=400, detail="유효하지 않거나 만료된 커서입니다.")
+    fetch_page = PAGINATED_SEARCHES.get(decoded["search"])
+    if fetch_page is None:
+        raise HTTPException(status_code=400, detail="유효하지 않거나 만료된 커서입니다.")
+    try:
+        result = compact_observation(await fetch_page(decoded["args"], decoded["sort_key"], decoded["page"]))
+        logger.info(f"fetchMore for session {session_id}: search={decoded['search']}, page={decoded['page']}")
+        return result
+    except Exception as e:
+        logger.error(f"Error in fetchMore for session {session_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
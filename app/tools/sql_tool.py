@@ -8,21 +8,26 @@ import asyncio
 from typing import Optional, List, Union
 
 from langchain_core.tools import tool
-from langchain_community.utilities import SQLDatabase
-from langchain_openai import AzureChatOpenAI
-from pydantic import SecretStr
 from sqlalchemy import text
 from geopy.geocoders import Nominatim
 
 from ..config import settings
 from functools import wraps
 
-from ..common.logger import logger
+from ..common.logger import logger, get_logger
+from ..common.tracing import span
 from .location_dic import GROUP_LOCATION_EXPANSION_RULES, LOCATION_NORMALIZATION_RULES # Import the rules for group locations
+from ..common.location_lexicon import GROUP_NAMES_BY_LENGTH, SIDO_RULE_BY_NAME, find_sido_rule, has_top_level_region, scan_location_terms
 
-from ..database.db import engine as db_engine, fetchData
+from ..database.db import engine as db_engine, fetchData, in_clause_params
+from ..common.doctor_index import doctor_name_index
 from ..database.searchDoctor import getSearchDoctorsByOnlyDepartment
-from ..common.utils import _get_final_limit
+from ..common.utils import _get_final_limit, doctor_heavy_columns
+from ..common.pagination import encode_cursor, pagination_enabled
+
+# 생성된 SQL 전문 로그 (LOG_LEVELS / LOG_SAMPLING 으로 제어)
+sql_logger = get_logger("sql")
+tool_args_logger = get_logger("tool_args")
 
 def handle_proximity_search(func):
     """
@@ -63,10 +68,6 @@ def handle_proximity_search(func):
     
     return wrapper
 
-# 시/도 이름 전체 집합 생성 (예: '경기도', '경기' 모두 포함)
-ALL_PROVINCE_METRO_NAMES = set(name for rule in LOCATION_NORMALIZATION_RULES for name in rule)
-VALID_TOP_LEVEL_REGIONS = ALL_PROVINCE_METRO_NAMES.union(set(GROUP_LOCATION_EXPANSION_RULES.keys()))
-
 def escape_string_for_sql(value: str) -> str:
     """SQL 쿼리에 삽입할 문자열을 이스케이프합니다."""
     # 단일 따옴표를 두 배로 늘려 이스케이프합니다. (MySQL 기본 동작)
@@ -103,30 +104,13 @@ def is_sido_included(location: Optional[str]) -> bool:
         logger.info(f"is_sido_included: location is empty, returning False.")
         return False
     
-    result = any(region in location for region in VALID_TOP_LEVEL_REGIONS)
+    result = has_top_level_region(location)
     logger.info(f"is_sido_included: Checking '{location}'. Result: {result}")
     return result
 
 
 
 
-# SQL agent를 위한 별도 설정 (tools.py와 동일하게 유지)
-sql_llm = AzureChatOpenAI(
-    azure_deployment=settings.azure_api_model,
-    azure_endpoint=settings.azure_endpoint,
-    api_key=SecretStr(settings.azure_key),
-    api_version=settings.azure_api_version,
-    temperature=0
-)
-
-# SQLDatabase 인스턴스 생성 (db_engine 활용하여 커넥션 풀 통합)
-sql_db = SQLDatabase(
-    db_engine,
-    sample_rows_in_table_info=0,
-    include_tables=['hospital', 'hospital_evaluation', 'doctor', 'doctor_basic', 'doctor_career', 'doctor_evaluation']
-)
-
-
 async def _get_coords_for_location(location_name: str):
     """
     DB 조회를 통해 특정 지역명의 평균 좌표를 계산하는 내부 헬퍼 함수.
@@ -138,14 +122,13 @@ async def _get_coords_for_location(location_name: str):
     group_name_found = None
     remaining_location = ""
 
-    for g_name in GROUP_LOCATION_EXPANSION_RULES.keys():
-        if g_name in location_name:
-            # 그룹 이름과 나머지 부분을 분리합니다. "경상도 창원" -> g_name="경상도", remaining="창원"
-            remaining = location_name.replace(g_name, "").strip()
-            if remaining: # 그룹명 외에 다른 지역명이 있는 경우
-                group_name_found = g_name
-                remaining_location = remaining
-                break
+    for g_name in scan_location_terms(location_name).terms("group"):
+        # 그룹 이름과 나머지 부분을 분리합니다. "경상도 창원" -> g_name="경상도", remaining="창원"
+        remaining = location_name.replace(g_name, "").strip()
+        if remaining: # 그룹명 외에 다른 지역명이 있는 경우
+            group_name_found = g_name
+            remaining_location = remaining
+            break
     
     if group_name_found:
         logger.info(f"그룹 지역명 조합 감지: '{group_name_found}' + '{remaining_location}'. 조합 해결 시도.")
@@ -172,10 +155,8 @@ async def _get_coords_for_location(location_name: str):
     # --- 내부 헬퍼 함수 정의 ---
     def _normalize_location_part(part: str) -> str:
         """지역명 부분을 정규화 (예: '서울시' -> '서울')"""
-        for long_name, short_name in LOCATION_NORMALIZATION_RULES:
-            if part == long_name:
-                return short_name
-        return part
+        rule = SIDO_RULE_BY_NAME.get(part)
+        return rule[1] if rule else part
 
     async def _execute_query(conditions: dict):
         """조건(dict)을 받아 DB 쿼리를 실행하고 한 줄의 결과를 반환"""
@@ -209,12 +190,9 @@ async def _get_coords_for_location(location_name: str):
         sigungu = row.sigungu_code_name or ''
         
         # 원래 요청에 특정 시/도(경북, 경남 등)가 포함되었는지 확인
-        requested_sido = None
-        # 요청된 위치 문자열을 순회하며 정규화된 시/도 이름을 찾는다.
-        for long_name, short_name in LOCATION_NORMALIZATION_RULES:
-            if long_name in original_location or short_name in original_location:
-                requested_sido = short_name # 비교를 위해 짧은 이름 사용
-                break
+        # 요청된 위치 문자열에서 정규화된 시/도 이름을 찾는다. (비교를 위해 짧은 이름 사용)
+        sido_rule = find_sido_rule(original_location)
+        requested_sido = sido_rule[1] if sido_rule else None
         
         # 요청된 시/도 정보가 있고, 결과의 시/도와 일치하지 않으면 유효하지 않은 결과로 처리
         # row.sido가 이미 짧은 이름 형태라고 가정
@@ -254,7 +232,8 @@ async def _get_coords_for_location(location_name: str):
     location_to_process = location_name.strip()
     
     # '경상도 창원시' 같은 입력에서 '경상도'를 분리하고 '창원시'만 남김
-    for group_name in GROUP_LOCATION_EXPANSION_RULES.keys():
+    for group_name in scan_location_terms(location_to_process).terms("group"):
+        # 앞선 그룹명 제거로 문자열이 바뀌었을 수 있으므로 다시 확인
         if group_name in location_to_process:
             # 그룹명을 공백으로 치환하여 나머지 부분만 남긴다.
             # "경상도 창원시" -> " 창원시" -> "창원시"
@@ -315,15 +294,13 @@ async def _get_coords_for_location(location_name: str):
         geolocator = Nominatim(user_agent="aiga_llm_server") # user_agent는 필수 항목입니다.
         
         # geopy의 geocode는 동기 함수이므로, asyncio.to_thread를 사용해 비동기적으로 실행합니다.
-        location = await asyncio.to_thread(geolocator.geocode, location_name, timeout=5, language='ko')
+        with span("geocoding"):
+            location = await asyncio.to_thread(geolocator.geocode, location_name, timeout=5, language='ko')
         
         if location:
             # --- START: 외부 Geocoding 결과 검증 로직 추가 ---
-            requested_sido = None
-            for long_name, short_name in LOCATION_NORMALIZATION_RULES:
-                if long_name in location_name or short_name in location_name:
-                    requested_sido = short_name # 비교를 위해 짧은 이름 사용
-                    break
+            sido_rule = find_sido_rule(location_name)
+            requested_sido = sido_rule[1] if sido_rule else None # 비교를 위해 짧은 이름 사용
             
             # Nominatim이 반환한 주소(location.address)에 요청된 시/도가 포함되어 있는지 확인
             found_address = location.address or ""
@@ -371,9 +348,9 @@ def _build_location_where_clause(location: Optional[str], latitude: Optional[flo
     
     # 1. Expand group names first (e.g., "부울경" -> "(부산 또는 울산 또는 경남)")
     #    Replace '또는' with 'OR' for MySQL Full-Text Search.
-    sorted_group_names = sorted(GROUP_LOCATION_EXPANSION_RULES.keys(), key=len, reverse=True)
-    for group_name in sorted_group_names:
-        if group_name in location_str:
+    found_groups = scan_location_terms(location_str).terms("group")
+    for group_name in GROUP_NAMES_BY_LENGTH:
+        if group_name in found_groups and group_name in location_str:
             expansion_with_or = GROUP_LOCATION_EXPANSION_RULES[group_name].replace('또는', 'OR')
             location_str = location_str.replace(group_name, f"({expansion_with_or})") # 확장된 부분은 괄호로 묶음
             logger.debug(f"그룹 지역명 '{group_name}' 확장 후 location_str: {location_str}")
@@ -418,7 +395,7 @@ async def search_hospitals_by_location_and_department(department: Union[str, Lis
         coords_for_distance: (내부용) 데코레이터가 계산한 좌표.
         limit: 선택 - 반환할 결과의 최대 수.
     """
-    logger.info(f"DEBUG: search_hospitals_by_location_and_department received args: department='{department}', location='{location}', latitude={latitude}, longitude={longitude}, is_location_near={is_location_near}, limit={limit}")
+    tool_args_logger.info("search_hospitals_by_location_and_department received args: department=%r, location=%r, latitude=%s, longitude=%s, is_location_near=%s, limit=%s", department, location, latitude, longitude, is_location_near, limit)
     
     final_limit = _get_final_limit(limit)
 
@@ -465,7 +442,7 @@ async def search_hospitals_by_location_and_department(department: Union[str, Lis
                 LIMIT {final_limit};
             """
         
-        logger.info(f"Executing SQL Query: {query}")
+        sql_logger.info("Executing SQL Query: %s", query)
         with db_engine.connect() as connection:
             return connection.execute(text(query)).fetchall()
 
@@ -531,7 +508,17 @@ async def search_doctor_details_by_name(name: Union[str, List[str]], hospital: O
     hospital_where_clause = ""
 
     # Handle 'name' parameter (string or list)
-    if isinstance(name, list) and name:
+    # 이름 인덱스가 준비되어 있으면 doctorname LIKE 대신 일치하는 doctor_id(IN)로만 조회
+    names = [n.strip() for n in name if n and n.strip()] if isinstance(name, list) else ([name.strip()] if isinstance(name, str) and name.strip() else [])
+    doctor_ids = doctor_name_index.find_ids(names) if names else None
+    if doctor_ids is not None:
+        if not doctor_ids:
+            logger.info(f"search_doctor_details_by_name: 이름 인덱스에 일치하는 의사가 없습니다. name: {name}")
+            return {"chat_type": "search_doctor", "answer": {"doctors": [], "proposal": proposal}}
+        placeholders, id_params = in_clause_params("doctor_id", doctor_ids)
+        params.update(id_params)
+        name_where_clause = f"AND db.doctor_id IN ({placeholders})"
+    elif isinstance(name, list) and name:
         name_clauses = []
         for i, n in enumerate(name):
             if n and n.strip():
@@ -580,11 +567,12 @@ async def search_doctor_details_by_name(name: Union[str, List[str]], hospital: O
     else:
         order_by_clause = "ORDER BY total_score DESC"
 
+    heavy_columns = doctor_heavy_columns("db", "dc")
     template_query = f"""
         SELECT
             d.doctor_id, HEX(d.rid) as hexrid, h.shortname, h.address, h.lat, h.lon, h.telephone, h.hospital_site, h.hid as hospital_hid,
-            db.doctorname, db.deptname, db.specialties, db.parse_specialties, db.doctor_url,
-            dc.education, dc.career, db.profileimgurl,
+            db.doctorname, db.deptname, db.doctor_url, db.profileimgurl,
+            {heavy_columns},
             de.paper_score, de.patient_score, de.public_score,
             de.kindness, de.satisfaction, de.explanation, de.recommendation
             {distance_select}
@@ -729,6 +717,149 @@ async def search_hospital_details_by_name(name: Union[str, List[str]], latitude:
         logger.error(f"Error in search_hospital_details_by_name: {e}", exc_info=True)
         return {"chat_type": "error", "message": f"병원 상세 정보 검색 중 오류가 발생했습니다: {str(e)}"}
 
+# --- 의사 검색 keyset 페이지네이션 ("더 보기") ---
+# 지역+진료과 / 지역+질환 의사 검색은 한 페이지보다 결과가 많으면 answer.next_cursor 를 함께 반환하고,
+# /chat/more 가 그 커서로 LLM 없이 다음 페이지를 조회한다. 정렬 키: (distance,) total_score, doctor_id
+
+_DOCTOR_MATCH_COLUMNS = {"department": "db.deptname", "disease": "db.parse_specialties"}
+
+
+def _doctor_search_args(match: str, search_term: str, location: Optional[str], latitude: Optional[float], longitude: Optional[float], is_location_near: bool, coords_for_distance: Optional[dict], limit: int) -> dict:
+    """의사 검색 쿼리를 다시 만들기 위한 인자 (커서에 그대로 들어간다)"""
+    return {
+        "match": match, "search_term": search_term, "location": location, "latitude": latitude, "longitude": longitude,
+        "is_location_near": is_location_near, "coords_for_distance": coords_for_distance, "limit": limit,
+    }
+
+
+def _search_doctors_page(args: dict, after: Optional[list] = None) -> list:
+    """
+    진료과/질환 MATCH 의사 검색 한 페이지 (다음 페이지 확인용으로 limit+1행까지 조회).
+    after가 있으면 그 정렬 키 다음 행부터 (keyset).
+    """
+    match_column = _DOCTOR_MATCH_COLUMNS[args["match"]]
+    match_where_clause = f"AND MATCH({match_column}) AGAINST('{args['search_term']}' IN BOOLEAN MODE)"
+    score_weight = float(os.getenv("SCORE_WEIGHT", 0.3))
+    total_score_select = f""", (
+        IFNULL(de.patient_score, 0) * {score_weight} + 
+        IFNULL(de.public_score, 0) * {score_weight}
+    ) as total_score"""
+
+    coords_for_distance = args["coords_for_distance"]
+    params = {}
+    distance_select = ""
+    keyset_clause = ""
+
+    if coords_for_distance:
+        distance_km = settings.distance_square_meter
+        lat, lon = coords_for_distance['lat'], coords_for_distance['lon']
+        lat_range, lon_range = distance_km / 111.0, distance_km / 88.0
+
+        from_clause = f"""
+        FROM (
+            SELECT DISTINCT hid, lat, lon, shortName, address, telephone , hospital_site
+            FROM hospital
+            WHERE lat BETWEEN {lat - lat_range} AND {lat + lat_range}
+              AND lon BETWEEN {lon - lon_range} AND {lon + lon_range}
+        ) h
+        INNER JOIN doctor_basic db ON db.hid = h.hid
+        """
+        distance_select = f", ST_DISTANCE_SPHERE(POINT(h.lon, h.lat), POINT({lon}, {lat})) as distance"
+        order_by_clause = "ORDER BY distance ASC, total_score DESC, sort_id ASC"
+        if after:
+            params = {"after_distance": after[0], "after_score": after[1], "after_id": after[2]}
+            keyset_clause = """HAVING (distance > :after_distance OR (distance = :after_distance AND
+                (total_score < :after_score OR (total_score = :after_score AND sort_id > :after_id))))"""
+    else:
+        location_where_clause = _build_location_where_clause(args["location"], args["latitude"], args["longitude"], args["is_location_near"])
+        from_clause = f"FROM doctor_basic db INNER JOIN hospital h ON db.hid = h.hid AND 1=1 {location_where_clause}"
+        order_by_clause = "ORDER BY total_score DESC, sort_id ASC"
+        if after:
+            params = {"after_score": after[0], "after_id": after[1]}
+            keyset_clause = "HAVING (total_score < :after_score OR (total_score = :after_score AND sort_id > :after_id))"
+
+    fetch_limit = args["limit"] + 1 if pagination_enabled() else args["limit"]
+    heavy_columns = doctor_heavy_columns("db", "dc")
+    query = f"""
+        SELECT
+            d.doctor_id, h.shortname, h.address, h.lat, h.lon, h.telephone, h.hospital_site, h.hid as hospital_hid,
+            db.doctorname, db.deptname, db.doctor_url, db.profileimgurl,
+            {heavy_columns},
+            de.paper_score, de.patient_score, de.public_score, de.kindness,
+            de.satisfaction, de.explanation, de.recommendation,
+            db.doctor_id as sort_id
+            {distance_select}
+            {total_score_select}
+        {from_clause}
+        LEFT JOIN doctor d ON db.rid = d.rid
+        LEFT JOIN doctor_career dc ON d.rid = dc.rid
+        LEFT JOIN (
+            SELECT
+                doctor_id, AVG(paper_score) AS paper_score, AVG(patient_score) AS patient_score,
+                AVG(public_score) AS public_score, AVG(kindness) AS kindness, AVG(satisfaction) AS satisfaction,
+                AVG(explanation) AS explanation, AVG(recommendation) AS recommendation
+            FROM aiga2025.doctor_evaluation
+            GROUP BY doctor_id
+        ) de ON d.doctor_id = de.doctor_id
+        WHERE
+            db.is_active in (1,2)
+            {match_where_clause}
+        {keyset_clause}
+        {order_by_clause}
+        LIMIT {fetch_limit};
+    """
+    sql_logger.info("Executing SQL Query: %s params: %s", query, params)
+    with db_engine.connect() as connection:
+        return connection.execute(text(query), params).fetchall()
+
+
+def _doctor_from_row(row) -> dict:
+    return {
+        "doctor_id": row.doctor_id, "hospital": row.shortname, "address": row.address,
+        "lat": row.lat, "lon": row.lon, "telephone": row.telephone, "hospital_site" : row.hospital_site, "hospital_hid" : row.hospital_hid,
+        "name": row.doctorname, "deptname": row.deptname, "specialties": row.specialties,"parse_specialties": row.parse_specialties,
+        "url": row.doctor_url, "education": row.education, "career": row.career, "photo": row.profileimgurl,
+        "doctor_score": {"paper_score": row.paper_score or 0.0, "patient_score": row.patient_score or 0.0, "public_score": row.public_score or 0.0, "peer_score": 0.0},
+        "ai_score": {"kindness": (row.kindness or 0.0) * 5.0, "satisfaction": (row.satisfaction or 0.0) * 5.0, "explanation": (row.explanation or 0.0) * 5.0, "recommendation": (row.recommendation or 0.0) * 5.0},
+        "paper": [], "review": []
+    }
+
+
+def _doctor_page(rows: list, args: dict, page: int) -> tuple:
+    """조회 행을 (의사 목록, 다음 페이지 커서 또는 None)으로. limit보다 많이 조회되었으면 다음 페이지가 있다"""
+    rows = list(rows or [])
+    has_more = pagination_enabled() and len(rows) > args["limit"]
+    rows = rows[:args["limit"]]
+    doctors = [_doctor_from_row(row) for row in rows]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        sort_key = [last.total_score, last.sort_id]
+        if args["coords_for_distance"]:
+            sort_key.insert(0, last.distance)
+        next_cursor = encode_cursor("doctors", args, sort_key, page + 1)
+    return doctors, next_cursor
+
+
+async def fetch_doctor_page(args: dict, sort_key: list, page: int) -> dict:
+    """/chat/more: 커서의 검색 인자와 정렬 키로 다음 페이지 조회"""
+    rows = await asyncio.to_thread(_search_doctors_page, args, sort_key)
+    doctors, next_cursor = _doctor_page(rows, args, page)
+    logger.info(f"fetch_doctor_page: page {page}, {len(doctors)}명의 의사 정보 반환.")
+    return {
+        "chat_type": "search_doctor",
+        "answer": {
+            "doctors": doctors,
+            "page": page,
+            "next_cursor": next_cursor
+        }
+    }
+
+
+# 커서의 검색 이름 -> 다음 페이지 조회 함수
+PAGINATED_SEARCHES = {"doctors": fetch_doctor_page}
+
+
 @tool
 @handle_proximity_search
 async def search_doctors_by_location_and_department(department: Union[str, List[str]], location: Optional[str] = None, latitude: Optional[float] = None, longitude: Optional[float] = None, is_location_near: bool = False, coords_for_distance: Optional[dict] = None, limit: Optional[int] = None, proposal: str = "") -> dict:
@@ -755,102 +886,34 @@ async def search_doctors_by_location_and_department(department: Union[str, List[
         return {"chat_type": "search_doctor", "answer": {"doctors": []}}
 
     def _perform_doctor_search(search_term):
-        department_where_clause = f"AND MATCH(db.deptname) AGAINST('{search_term}' IN BOOLEAN MODE)"
-        score_weight = float(os.getenv("SCORE_WEIGHT", 0.3))
-        total_score_select = f""", (
-            IFNULL(de.patient_score, 0) * {score_weight} + 
-            IFNULL(de.public_score, 0) * {score_weight}
-        ) as total_score"""
-        
-        distance_select = ""
-        order_by_clause = ""
-        from_clause = ""
-
-        if coords_for_distance:
-            distance_km = settings.distance_square_meter
-            lat, lon = coords_for_distance['lat'], coords_for_distance['lon']
-            lat_range, lon_range = distance_km / 111.0, distance_km / 88.0
-
-            from_clause = f"""
-            FROM (
-                SELECT DISTINCT hid, lat, lon, shortName, address, telephone , hospital_site
-                FROM hospital
-                WHERE lat BETWEEN {lat - lat_range} AND {lat + lat_range}
-                  AND lon BETWEEN {lon - lon_range} AND {lon + lon_range}
-            ) h
-            INNER JOIN doctor_basic db ON db.hid = h.hid
-            """
-            distance_select = f", ST_DISTANCE_SPHERE(POINT(h.lon, h.lat), POINT({lon}, {lat})) as distance"
-            order_by_clause = "ORDER BY distance ASC, total_score DESC"
-        else:
-            location_where_clause = _build_location_where_clause(location, latitude, longitude, is_location_near)
-            from_clause = f"FROM doctor_basic db INNER JOIN hospital h ON db.hid = h.hid AND 1=1 {location_where_clause}"
-            order_by_clause = "ORDER BY total_score DESC"
-
-        query = f"""
-            SELECT
-                d.doctor_id, h.shortname, h.address, h.lat, h.lon, h.telephone, h.hospital_site, h.hid as hospital_hid,
-                db.doctorname, db.deptname, db.specialties, db.parse_specialties, db.doctor_url,
-                dc.education, dc.career, db.profileimgurl,
-                de.paper_score, de.patient_score, de.public_score, de.kindness,
-                de.satisfaction, de.explanation, de.recommendation
-                {distance_select}
-                {total_score_select}
-            {from_clause}
-            LEFT JOIN doctor d ON db.rid = d.rid
-            LEFT JOIN doctor_career dc ON d.rid = dc.rid
-            LEFT JOIN (
-                SELECT
-                    doctor_id, AVG(paper_score) AS paper_score, AVG(patient_score) AS patient_score,
-                    AVG(public_score) AS public_score, AVG(kindness) AS kindness, AVG(satisfaction) AS satisfaction,
-                    AVG(explanation) AS explanation, AVG(recommendation) AS recommendation
-                FROM aiga2025.doctor_evaluation
-                GROUP BY doctor_id
-            ) de ON d.doctor_id = de.doctor_id
-            WHERE
-                db.is_active in (1,2)
-                {department_where_clause}
-            {order_by_clause}
-            LIMIT {final_limit};
-        """
-        logger.info(f"Executing SQL Query: {query}")
-        with db_engine.connect() as connection:
-            return connection.execute(text(query)).fetchall()
+        args = _doctor_search_args("department", search_term, location, latitude, longitude, is_location_near, coords_for_distance, final_limit)
+        return args, _search_doctors_page(args)
 
     try:
         # 1단계: AND 검색 수행
-        list_of_tuples = await asyncio.to_thread(_perform_doctor_search, department_search_term)
+        page_args, list_of_tuples = await asyncio.to_thread(_perform_doctor_search, department_search_term)
         
         # 결과가 없고 공백이 포함된 경우 2단계: OR 검색 수행
         if not list_of_tuples and has_space:
             logger.info("No results with AND search. Attempting Fallback with OR search.")
             department_search_term_or, _ = _generate_boolean_term(department, 'OR')
-            list_of_tuples = await asyncio.to_thread(_perform_doctor_search, department_search_term_or)
+            page_args, list_of_tuples = await asyncio.to_thread(_perform_doctor_search, department_search_term_or)
         
-        doctors = []
+        doctors, next_cursor = [], None
         if list_of_tuples:
             try:
-                for row in list_of_tuples:
-                    doctor = {
-                        "doctor_id": row.doctor_id, "hospital": row.shortname, "address": row.address,
-                        "lat": row.lat, "lon": row.lon, "telephone": row.telephone, "hospital_site" : row.hospital_site, "hospital_hid" : row.hospital_hid,
-                        "name": row.doctorname, "deptname": row.deptname, "specialties": row.specialties,"parse_specialties": row.parse_specialties,
-                        "url": row.doctor_url, "education": row.education, "career": row.career, "photo": row.profileimgurl,
-                        "doctor_score": {"paper_score": row.paper_score or 0.0, "patient_score": row.patient_score or 0.0, "public_score": row.public_score or 0.0, "peer_score": 0.0},
-                        "ai_score": {"kindness": (row.kindness or 0.0) * 5.0, "satisfaction": (row.satisfaction or 0.0) * 5.0, "explanation": (row.explanation or 0.0) * 5.0, "recommendation": (row.recommendation or 0.0) * 5.0},
-                        "paper": [], "review": []
-                    }
-                    doctors.append(doctor)
+                doctors, next_cursor = _doctor_page(list_of_tuples, page_args, page=1)
             except Exception as e:
                 logger.error(f"Error parsing templated SQL result for doctor search: {e} - Result string: {list_of_tuples}")
-                doctors = []
+                doctors, next_cursor = [], None
     
         logger.info(f"search_doctors_by_location_and_department 툴 실행 성공. {len(doctors)}명의 의사 정보 반환.")
         return {
             "chat_type": "search_doctor",
             "answer": {
                 "doctors": doctors,
-                "proposal": proposal
+                "proposal": proposal,
+                "next_cursor": next_cursor
             }
         }
 
@@ -896,102 +959,34 @@ async def search_doctors_by_disease_and_location(disease: Union[str, List[str]],
         return {"chat_type": "search_doctor", "answer": {"doctors": []}}
 
     def _perform_disease_doctor_search(search_term):
-        disease_where_clause = f"AND MATCH(db.parse_specialties) AGAINST('{search_term}' IN BOOLEAN MODE)"
-        score_weight = float(os.getenv("SCORE_WEIGHT", 0.3))
-        total_score_select = f""", (
-            IFNULL(de.patient_score, 0) * {score_weight} + 
-            IFNULL(de.public_score, 0) * {score_weight}
-        ) as total_score"""
-
-        distance_select = ""
-        order_by_clause = ""
-        from_clause = ""
-
-        if coords_for_distance:
-            distance_km = settings.distance_square_meter
-            lat, lon = coords_for_distance['lat'], coords_for_distance['lon']
-            lat_range, lon_range = distance_km / 111.0, distance_km / 88.0
-
-            from_clause = f"""
-            FROM (
-                SELECT DISTINCT hid, lat, lon, shortName, address, telephone ,hospital_site
-                FROM hospital
-                WHERE lat BETWEEN {lat - lat_range} AND {lat + lat_range}
-                  AND lon BETWEEN {lon - lon_range} AND {lon + lon_range}
-            ) h
-            INNER JOIN doctor_basic db ON db.hid = h.hid
-            """
-            distance_select = f", ST_DISTANCE_SPHERE(POINT(h.lon, h.lat), POINT({lon}, {lat})) as distance"
-            order_by_clause = "ORDER BY distance ASC, total_score DESC"
-        else:
-            location_where_clause = _build_location_where_clause(location, latitude, longitude, is_location_near)
-            from_clause = f"FROM doctor_basic db INNER JOIN hospital h ON db.hid = h.hid AND 1=1 {location_where_clause}"
-            order_by_clause = "ORDER BY total_score DESC"
-
-        query = f"""
-            SELECT
-                d.doctor_id, h.shortname, h.address, h.lat, h.lon, h.telephone, h.hospital_site, h.hid as hospital_hid,
-                db.doctorname, db.deptname, db.specialties, db.parse_specialties, db.doctor_url,
-                dc.education, dc.career, db.profileimgurl,
-                de.paper_score, de.patient_score, de.public_score, de.kindness,
-                de.satisfaction, de.explanation, de.recommendation
-                {distance_select}
-                {total_score_select}
-            {from_clause}
-            LEFT JOIN doctor d ON db.rid = d.rid
-            LEFT JOIN doctor_career dc ON d.rid = dc.rid
-            LEFT JOIN (
-                SELECT
-                    doctor_id, AVG(paper_score) AS paper_score, AVG(patient_score) AS patient_score,
-                    AVG(public_score) AS public_score, AVG(kindness) AS kindness, AVG(satisfaction) AS satisfaction,
-                    AVG(explanation) AS explanation, AVG(recommendation) AS recommendation
-                FROM aiga2025.doctor_evaluation
-                GROUP BY doctor_id
-            ) de ON d.doctor_id = de.doctor_id
-            WHERE
-                db.is_active in (1,2)
-                {disease_where_clause}
-            {order_by_clause}
-            LIMIT {final_limit};
-        """
-        logger.info(f"Executing SQL Query: {query}")
-        with db_engine.connect() as connection:
-            return connection.execute(text(query)).fetchall()
+        args = _doctor_search_args("disease", search_term, location, latitude, longitude, is_location_near, coords_for_distance, final_limit)
+        return args, _search_doctors_page(args)
 
     try:
         # 1단계: AND 검색 수행
-        list_of_tuples = await asyncio.to_thread(_perform_disease_doctor_search, disease_search_term)
+        page_args, list_of_tuples = await asyncio.to_thread(_perform_disease_doctor_search, disease_search_term)
         
         # 결과가 없고 공백이 포함된 경우 2단계: OR 검색 수행
         if not list_of_tuples and has_space:
             logger.info("No results with AND search. Attempting Fallback with OR search.")
             disease_search_term_or, _ = _generate_boolean_term(hybrid_disease_list, 'OR')
-            list_of_tuples = await asyncio.to_thread(_perform_disease_doctor_search, disease_search_term_or)
+            page_args, list_of_tuples = await asyncio.to_thread(_perform_disease_doctor_search, disease_search_term_or)
         
-        doctors = []
+        doctors, next_cursor = [], None
         if list_of_tuples:
             try:
-                for row in list_of_tuples:
-                    doctor = {
-                        "doctor_id": row.doctor_id, "hospital": row.shortname, "address": row.address,
-                        "lat": row.lat, "lon": row.lon, "telephone": row.telephone, "hospital_site" :  row.hospital_site, "hospital_hid" : row.hospital_hid,
-                        "name": row.doctorname, "deptname": row.deptname, "specialties": row.specialties, "parse_specialties": row.parse_specialties,
-                        "url": row.doctor_url, "education": row.education, "career": row.career, "photo": row.profileimgurl,
-                        "doctor_score": {"paper_score": row.paper_score or 0.0, "patient_score": row.patient_score or 0.0, "public_score": row.public_score or 0.0, "peer_score": 0.0},
-                        "ai_score": {"kindness": (row.kindness or 0.0) * 5.0, "satisfaction": (row.satisfaction or 0.0) * 5.0, "explanation": (row.explanation or 0.0) * 5.0, "recommendation": (row.recommendation or 0.0) * 5.0},
-                        "paper": [], "review": []
-                    }
-                    doctors.append(doctor)
+                doctors, next_cursor = _doctor_page(list_of_tuples, page_args, page=1)
             except Exception as e:
                 logger.error(f"Error parsing templated SQL result for doctor search: {e} - Result string: {list_of_tuples}")
-                doctors = []
-        
+                doctors, next_cursor = [], None
+    
         logger.info(f"search_doctors_by_disease_and_location 툴 실행 성공. {len(doctors)}명의 의사 정보 반환.")
         return {
             "chat_type": "search_doctor",
             "answer": {
                 "doctors": doctors,
-                "proposal": proposal
+                "proposal": proposal,
+                "next_cursor": next_cursor
             }
         }
 
@@ -1073,7 +1068,7 @@ async def search_hospital_by_disease_and_location(disease: Union[str, List[str]]
                 LIMIT {final_limit};
             """
         
-        logger.info(f"Executing SQL Query: {query}")
+        sql_logger.info("Executing SQL Query: %s", query)
         with db_engine.connect() as connection:
             return connection.execute(text(query)).fetchall()
 
@@ -1151,7 +1146,7 @@ async def search_hospital_by_disease(disease: Union[str, List[str]], limit: Opti
             GROUP BY h.hid
             LIMIT {final_limit};
         """
-        logger.info(f"Executing SQL Query: {query}")
+        sql_logger.info("Executing SQL Query: %s", query)
         with db_engine.connect() as connection:
             return connection.execute(text(query)).fetchall()
 
@@ -1290,7 +1285,7 @@ async def search_hospital_by_disease_and_department(disease: Union[str, List[str
                 LIMIT {final_limit};
             """
         
-        logger.info(f"Executing SQL Query: {query}")
+        sql_logger.info("Executing SQL Query: %s", query)
         with db_engine.connect() as connection:
             return connection.execute(text(query)).fetchall()
 
@@ -1357,11 +1352,12 @@ async def search_doctors_by_hospital_name(hospital_name: Union[str, List[str]],
     if not name_where_clause:
         return {"chat_type": "search_doctor", "answer": {"doctors": []}}
     
+    heavy_columns = doctor_heavy_columns("db", "dc")
     template_query = f"""
         SELECT
             d.doctor_id, HEX(d.rid) as hexrid, h.shortname, h.address, h.lat, h.lon, h.telephone,h.hospital_site,h.hid as hospital_hid,
-            db.doctorname, db.deptname, db.specialties, db.parse_specialties, db.doctor_url,
-            dc.education, dc.career, db.profileimgurl,
+            db.doctorname, db.deptname, db.doctor_url, db.profileimgurl,
+            {heavy_columns},
             de.paper_score, de.patient_score, de.public_score,
             de.kindness, de.satisfaction, de.explanation, de.recommendation
         FROM
@@ -1537,11 +1533,12 @@ async def search_by_location_only(location: str, target: str, is_location_near:
             from_clause = f"FROM doctor_basic db INNER JOIN hospital h ON db.hid = h.hid AND 1=1 {location_where_clause}"
             order_by_clause = "ORDER BY total_score DESC"
 
+        heavy_columns = doctor_heavy_columns("db", "dc")
         template_query = f"""
             SELECT
                 d.doctor_id, h.shortname, h.address, h.lat, h.lon, h.telephone, h.hospital_site, h.hid as hospital_hid,
-                db.doctorname, db.deptname, db.specialties, db.parse_specialties, db.doctor_url,
-                dc.education, dc.career, db.profileimgurl,
+                db.doctorname, db.deptname, db.doctor_url, db.profileimgurl,
+                {heavy_columns},
                 de.paper_score, de.patient_score, de.public_score, de.kindness,
                 de.satisfaction, de.explanation, de.recommendation
                 {distance_select}
@@ -8,7 +8,8 @@ from langchain_core.caches import RETURN_VAL_TYPE
 from langchain_core.tools import tool, BaseTool
 from langchain_core.prompts import ChatPromptTemplate # <--- Inject방지 
 from .standard_desease_dic import STANDARD_DESEASE_DIC
-from .location_dic import LOCATION_NORMALIZATION_RULES, GROUP_LOCATION_EXPANSION_RULES
+from .location_dic import GROUP_LOCATION_EXPANSION_RULES
+from ..common.location_lexicon import SIDO_NORMALIZER, scan_location_terms
 from ..common.location_analyzer import classify_location_query
 from ..database.standardSpecialty import getStandardSpecialty as getStandardSpecialtyFromDB
 from ..database.recommandDoctors import getRecommandDoctors
@@ -18,11 +19,15 @@ from ..common.common import getValidHospitalName
 from ..database.searchDoctor import getSearchDoctors, getSearchDoctorsByHospitalAndDept, getSearchDoctorsByOnlyHospital
 from ..database.db import engine as db_engine
 from ..common.logger import logger
+from ..common.tracing import span
+from ..common.storage_codec import storage_codec
+from ..common.callbacks import usage_config
+from ..common.metrics import registry as metrics_registry
+from ..common.startup import lazy_singleton
+from ..common.llm_clients import create_chat_model
 
 from langchain_community.utilities import SQLDatabase
 from langchain_community.agent_toolkits import create_sql_agent
-from langchain_openai import AzureChatOpenAI
-from pydantic import SecretStr
 from sqlalchemy import text
 
 # LangChain LLM 캐시를 위한 모듈 임포트
@@ -35,59 +40,70 @@ LIMIT_RECOMMAND_DOCTOR = int(os.environ.get('LIMIT_RECOMMAND_DOCTOR', '10'))
 LIMIT_RECOMMAND_PAPER = int(os.environ.get('LIMIT_RECOMMAND_PAPER', '10'))
 LIMIT_RECOMMAND_HOSPITAL = int(os.environ.get('LIMIT_RECOMMAND_HOSPITAL', '10'))
 
-# --- LangChain LLM 캐시 설정 시작 ---
-if settings.llm_sql_agent_cache_verbose:
-    # 캐시 적중(hit) 시 로그를 남기기 위해 SQLiteCache를 상속받는 커스텀 클래스 정의
-    class LoggingSQLiteCache(SQLiteCache):
-        """캐시 조회 시 성공/실패 모두 로그를 남기는 SQLiteCache"""
-        _miss_count = 0  # MISS 횟수를 기록하기 위한 클래스 변수
-
-        def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
-            cached_val = super().lookup(prompt, llm_string)
-            if cached_val is not None:
-                logger.info(f"LLM Cache HIT! (prompt: {prompt[:100]}...)")
-            else:
-                logger.info(f"LLM Cache MISS! (prompt: {prompt[:100]}...)")
-            return cached_val
-
-    # settings.cache_sqlite_directory를 사용하여 캐시 파일 경로 설정
-    cache_db_path = os.path.join(settings.cache_sqlite_directory, "llm_sqlite_cache.db")
-    # SQLite를 사용하여 LLM 응답을 캐싱하도록 전역 설정. 이때 커스텀 클래스인 LoggingSQLiteCache를 사용.
-    set_llm_cache(LoggingSQLiteCache(database_path=cache_db_path))
-    logger.info("LLM SQL Agent Cache 기능 활성화됨.")
-else:
+LLM_CACHE_LOOKUPS = metrics_registry.counter("aiga_llm_cache_lookups_total", "LangChain LLM cache lookups", ("cache",))
+
+# 캐시 적중(hit) 시 로그를 남기기 위해 SQLiteCache를 상속받는 커스텀 클래스 정의
+class LoggingSQLiteCache(SQLiteCache):
+    """캐시 조회 시 성공/실패 모두 로그를 남기는 SQLiteCache"""
+    _miss_count = 0  # MISS 횟수를 기록하기 위한 클래스 변수
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        cached_val = super().lookup(prompt, llm_string)
+        if cached_val is not None:
+            LLM_CACHE_LOOKUPS.inc(cache="hit")
+            logger.info(f"LLM Cache HIT! (prompt: {prompt[:100]}...)")
+        else:
+            LLM_CACHE_LOOKUPS.inc(cache="miss")
+            logger.info(f"LLM Cache MISS! (prompt: {prompt[:100]}...)")
+        return cached_val
+
+
+# --- LangChain LLM 캐시 설정 (startup_event 에서 1회, SQL agent 첫 사용 시 미설정이면 설정) ---
+@lazy_singleton("llm_cache")
+def configure_llm_cache():
+    if settings.llm_sql_agent_cache_verbose:
+        # settings.cache_sqlite_directory를 사용하여 캐시 파일 경로 설정
+        cache_db_path = os.path.join(settings.cache_sqlite_directory, "llm_sqlite_cache.db")
+        # SQLite를 사용하여 LLM 응답을 캐싱하도록 전역 설정. 이때 커스텀 클래스인 LoggingSQLiteCache를 사용.
+        cache = LoggingSQLiteCache(database_path=cache_db_path)
+        set_llm_cache(cache)
+        logger.info("LLM SQL Agent Cache 기능 활성화됨.")
+        return cache
     set_llm_cache(None) # 캐시 비활성화 시 전역 캐시를 None으로 설정
     logger.info("LLM SQL Agent Cache 기능 비활성화됨.")
-# --- LangChain LLM 캐시 설정 종료 ---
+    return None
 
-# SQL agent를 위한 별도 설정
-sql_llm = AzureChatOpenAI(
-    azure_deployment=settings.azure_api_model,
-    azure_endpoint=settings.azure_endpoint,
-    api_key=SecretStr(settings.azure_key),
-    api_version=settings.azure_api_version,
-    temperature=0
-)
 
-# SQLDatabase 인스턴스 생성 (db_engine 활용하여 커넥션 풀 통합)
-sql_db = SQLDatabase(
-    db_engine,
-    sample_rows_in_table_info=0,
-    include_tables=['hospital', 'hospital_evaluation', 'doctor', 'doctor_basic', 'doctor_career', 'doctor_evaluation']
-)
+# SQL agent를 위한 별도 설정
+@lazy_singleton("sql_llm")
+def get_sql_llm():
+    return create_chat_model(settings.azure_api_model, use_deployment=True)
+
+
+# SQLDatabase 인스턴스 생성 (db_engine 활용하여 커넥션 풀 통합). 생성 시 MySQL 테이블 메타데이터를 리플렉션한다.
+@lazy_singleton("sql_database")
+def get_sql_db():
+    return SQLDatabase(
+        db_engine,
+        sample_rows_in_table_info=0,
+        include_tables=['hospital', 'hospital_evaluation', 'doctor', 'doctor_basic', 'doctor_career', 'doctor_evaluation']
+    )
 
 from .sql_tool import search_hospitals_by_location_and_department, search_doctor_details_by_name, search_hospital_details_by_name, search_doctors_by_location_and_department, search_doctors_by_disease_and_location, search_hospital_by_disease_and_location, search_doctors_by_hospital_name, search_hospital_by_disease, search_hospital_by_disease_and_department, _get_coords_for_location
 
 
 # SQL agent 생성
-sql_agent_executor = create_sql_agent(
-    sql_llm, 
-    db=sql_db, 
-    agent_type="openai-tools", 
-    verbose=settings.sql_agent_verbose,
-    top_k=5,
-    max_iterations=7
-)
+@lazy_singleton("sql_agent")
+def get_sql_agent_executor():
+    configure_llm_cache()
+    return create_sql_agent(
+        get_sql_llm(),
+        db=get_sql_db(),
+        agent_type="openai-tools",
+        verbose=settings.sql_agent_verbose,
+        top_k=5,
+        max_iterations=7
+    )
 
 
 def getStandardDeseaseDictionary(disease: str):
@@ -428,14 +444,16 @@ async def get_cached_tool_result(result_id: str) -> dict:
     try:
         conn = await aiosqlite.connect(settings.sqlite_directory, check_same_thread=False)
         async with conn.cursor() as cursor:
-            await cursor.execute(
-                "SELECT content FROM tool_results_cache WHERE result_id = ?", 
-                (result_id,)
-            )
-            row = await cursor.fetchone()
+            with span("tool_cache", tool="get_cached_tool_result") as cache_span:
+                await cursor.execute(
+                    "SELECT content FROM tool_results_cache WHERE result_id = ?", 
+                    (result_id,)
+                )
+                row = await cursor.fetchone()
+                cache_span.set(cache="hit" if row else "miss")
 
         if row:
-            content = row[0]
+            content = storage_codec.decode_text(row[0])
             return json.loads(content)
         else:
             logger.warning(f"Cached tool result not found for result_id: {result_id}")
@@ -456,17 +474,13 @@ def normalize_location_in_question(question: str) -> str:
     Handles both grouped regions (e.g., "경상도") and single regions (e.g., "경상북도").
     """
     # Stage 1: Expand grouped regions into explicit OR clauses for the LLM
-    for group_name, expansion in GROUP_LOCATION_EXPANSION_RULES.items():
-        if group_name in question:
-            question = question.replace(group_name, expansion)
-            # Only replace the first group found to avoid nested replacements
-            break
+    # Only replace the first group found to avoid nested replacements
+    group_name = scan_location_terms(question).first("group")
+    if group_name:
+        question = question.replace(group_name, GROUP_LOCATION_EXPANSION_RULES[group_name])
     
-    # Stage 2: Normalize individual region names to their root word
-    for full_name, root_word in LOCATION_NORMALIZATION_RULES:
-        question = question.replace(full_name, root_word)
-        
-    return question
+    # Stage 2: Normalize individual region names to their root word (single pass)
+    return SIDO_NORMALIZER.rewrite(question)
 
 
 @tool
@@ -520,7 +534,9 @@ async def search_doctor_for_else_question(question: str, use_json_output: bool =
         # SQL Agent 호출 시 항상 JSON 출력을 요청하도록 설정
         final_input = FILE_SQL_AGENT_PROMPT_JSON_ENABLED.format(question=augmented_question)
 
-        result = await sql_agent_executor.ainvoke({"input": final_input})
+        # 첫 호출의 테이블 리플렉션이 이벤트 루프를 막지 않도록 스레드에서 생성
+        sql_agent_executor = get_sql_agent_executor() if get_sql_agent_executor.is_initialized() else await asyncio.to_thread(get_sql_agent_executor)
+        result = await sql_agent_executor.ainvoke({"input": final_input}, config=usage_config("sql_agent"))
         
         output_str = result.get("output", "{}")
         
@@ -536,7 +552,7 @@ async def search_doctor_for_else_question(question: str, use_json_output: bool =
             data=output_str
         )
         
-        summary_response = await sql_llm.ainvoke(summary_prompt)
+        summary_response = await get_sql_llm().ainvoke(summary_prompt, config=usage_config("sql_agent_summary"))
         final_answer = summary_response.content
         
         logger.info("SQL Agent 결과를 요약하여 general 답변으로 반환합니다.")
@@ -0,0 +1,208 @@
+"""
+매 턴 실행되는 한국어 텍스트 분석기 마이크로 벤치마크.
+
+대상: classify_location_query, analyze_other_location_request, detect_emergency_situation_internal,
+      detect_forbidden_recommendation_internal, sanitize_prompt, _build_location_where_clause
+코퍼스(benchmarks/corpus/analyzer_messages.json)의 메시지로 호출당 지연(p50/p95/p99, µs)과
+호출당 메모리 할당(tracemalloc peak / 블록 수)을 측정하고, 저장된 기준값과 비교해 회귀 시 exit 1.
+
+실행:
+    python -m benchmarks.analyzers                       # 기준값과 비교
+    python -m benchmarks.analyzers --update-baseline     # 기준값 갱신 (같은 머신에서)
+    python -m benchmarks.analyzers --only sanitize_prompt --rounds 50
+
+_build_location_where_clause 는 app.tools.sql_tool 을 import 한다 (DB 드라이버 필요, 연결은 하지 않음).
+import 할 수 없으면 해당 항목은 skipped 로 표시되고 비교에서 제외된다.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# LLM 클라이언트 생성을 위해 실제 키 없이도 import 가능하도록 stub 엔드포인트를 사용 (호출은 하지 않음)
+os.environ.setdefault("LLM_STUB_ENABLE", "true")
+
+from benchmarks.replay import percentile  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus", "analyzer_messages.json")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "analyzers.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the Korean text analyzers")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--rounds", type=int, default=20, help="코퍼스 전체를 몇 번 반복 측정할지")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 반복 수")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="p50 허용 증가율 (0.25 = +25%%)")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10, help="호출당 할당 허용 증가율")
+    parser.add_argument("--only", action="append", help="특정 벤치마크만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--with-logging", action="store_true", help="콘솔 로그 출력 비용까지 포함")
+    parser.add_argument("--json-out", help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+def load_benchmarks() -> Dict[str, tuple]:
+    """벤치마크 이름 -> (호출 함수, 입력 종류). 입력 종류는 'messages' 또는 'locations'"""
+    from app.common.emergency_analyzer import detect_emergency_situation_internal
+    from app.common.location_analyzer import (
+        analyze_other_location_request,
+        classify_location_query,
+        detect_forbidden_recommendation_internal,
+    )
+    from app.common.sanitizer import sanitize_prompt
+
+    benchmarks = {
+        "classify_location_query": (classify_location_query, "messages"),
+        "analyze_other_location_request": (analyze_other_location_request, "messages"),
+        "detect_emergency_situation_internal": (detect_emergency_situation_internal, "messages"),
+        "detect_forbidden_recommendation_internal": (detect_forbidden_recommendation_internal, "messages"),
+        "sanitize_prompt": (sanitize_prompt, "messages"),
+    }
+    try:
+        from app.tools.sql_tool import _build_location_where_clause
+        benchmarks["_build_location_where_clause"] = (_build_location_where_clause, "locations")
+    except Exception as e:
+        print(f"skipped _build_location_where_clause: app.tools.sql_tool import failed ({e})")
+    return benchmarks
+
+
+def measure_latency(func: Callable, inputs: List, rounds: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        for value in inputs:
+            func(value)
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(rounds):
+        for value in inputs:
+            started = perf_counter_ns()
+            func(value)
+            samples.append((perf_counter_ns() - started) / 1000.0)
+    return samples
+
+
+def measure_allocations(func: Callable, inputs: List) -> dict:
+    """호출마다 peak 증가량과 할당 블록 수를 측정 (tracemalloc 오버헤드 때문에 지연 측정과 분리)"""
+    peaks, blocks = [], []
+    tracemalloc.start()
+    try:
+        for value in inputs:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            snapshot_before = tracemalloc.take_snapshot()
+            func(value)
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot_after = tracemalloc.take_snapshot()
+            peaks.append(peak - before)
+            blocks.append(sum(max(0, stat.count_diff) for stat in snapshot_after.compare_to(snapshot_before, "filename")))
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_mean": int(statistics.fmean(peaks)),
+        "peak_bytes_max": max(peaks),
+        "retained_blocks_mean": round(statistics.fmean(blocks), 2),
+    }
+
+
+def run(args) -> dict:
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    from app.common.logger import logger
+    if not args.with_logging:
+        logger.setLevel(logging.WARNING)
+
+    results = {}
+    for name, (func, kind) in load_benchmarks().items():
+        if args.only and name not in args.only:
+            continue
+        inputs = corpus[kind]
+        samples = measure_latency(func, inputs, args.rounds, args.warmup)
+        results[name] = {
+            "calls": len(samples),
+            "p50_us": round(percentile(samples, 50), 2),
+            "p95_us": round(percentile(samples, 95), 2),
+            "p99_us": round(percentile(samples, 99), 2),
+            "mean_us": round(statistics.fmean(samples), 2),
+            **measure_allocations(func, inputs),
+        }
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "rounds": args.rounds,
+        "benchmarks": results,
+    }
+
+
+def compare(report: dict, baseline: dict, time_tolerance: float, alloc_tolerance: float) -> List[str]:
+    regressions = []
+    for name, current in report["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            continue
+        if base["p50_us"] and current["p50_us"] > base["p50_us"] * (1 + time_tolerance):
+            regressions.append(f"{name}: p50 {base['p50_us']:.1f}us -> {current['p50_us']:.1f}us")
+        if base["peak_bytes_mean"] and current["peak_bytes_mean"] > base["peak_bytes_mean"] * (1 + alloc_tolerance):
+            regressions.append(f"{name}: peak/call {base['peak_bytes_mean']}B -> {current['peak_bytes_mean']}B")
+    return regressions
+
+
+def print_report(report: dict, baseline: Optional[dict]):
+    print(f"\n{'benchmark':<44}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'peak B':>10}{'blocks':>8}{'Δp50':>9}")
+    for name, row in report["benchmarks"].items():
+        base = (baseline or {}).get("benchmarks", {}).get(name)
+        delta = f"{(row['p50_us'] / base['p50_us'] - 1) * 100:+.0f}%" if base and base["p50_us"] else "-"
+        print(
+            f"{name:<44}{row['p50_us']:>10.1f}{row['p95_us']:>10.1f}{row['p99_us']:>10.1f}"
+            f"{row['peak_bytes_mean']:>10}{row['retained_blocks_mean']:>8.1f}{delta:>9}"
+        )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nbaseline updated: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nno baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(report, baseline, args.time_tolerance, args.alloc_tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nno regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+재생(replay) 벤치마크용 스크립트 기반 채팅 모델.
+- 에이전트 호출(SystemMessage로 시작): 현재 턴의 사용자 메시지로 스크립트를 찾아
+  이미 응답한 AI 메시지 수만큼 진행된 다음 단계(tool_calls 또는 최종 답변)를 돌려준다.
+- 보조 호출(엔티티 추출, 위치 확인, 검증 등 단일 프롬프트): 프롬프트에 포함된 문자열로 응답을 고른다.
+"""
+import asyncio
+import uuid
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from .script import ConversationScript
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+class ScriptedChatModel(BaseChatModel):
+    script: ConversationScript
+    latency_seconds: float = 0.0
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-chat"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self
+
+    def _pick(self, messages: List[BaseMessage]) -> AIMessage:
+        if not messages or not isinstance(messages[0], SystemMessage):
+            prompt = "\n".join(str(m.content) for m in messages)
+            return AIMessage(content=self.script.side_response(prompt))
+
+        last_human_idx = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        step = sum(1 for m in messages[last_human_idx + 1:] if isinstance(m, AIMessage))
+        spec = self.script.agent_step(messages[last_human_idx].content, step)
+        if spec.get("tool_calls"):
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": tc["name"], "args": dict(tc.get("args", {})), "id": f"call_{uuid.uuid4().hex[:24]}", "type": "tool_call"}
+                    for tc in spec["tool_calls"]
+                ],
+            )
+        return AIMessage(content=spec.get("content", self.script.default_answer))
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        message = self._pick(messages)
+        prompt_tokens = sum(_approx_tokens(str(m.content)) for m in messages)
+        completion_tokens = _approx_tokens(str(message.content)) + 20 * len(message.tool_calls)
+        token_usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        message.response_metadata = {"token_usage": token_usage, "model_name": self._llm_type}
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": token_usage, "model_name": self._llm_type},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self._result(messages)
@@ -0,0 +1,110 @@
+-- 벤치마크용 로컬 MySQL 스키마 (운영 aiga2025 스키마 중 서버가 조회하는 컬럼만 포함)
+-- 쿼리에 aiga2025. 접두어가 있으므로 데이터베이스 이름은 반드시 aiga2025 이어야 한다.
+
+DROP TABLE IF EXISTS doctor_paper;
+DROP TABLE IF EXISTS doctor_specialty;
+DROP TABLE IF EXISTS specialty;
+DROP TABLE IF EXISTS doctor_evaluation;
+DROP TABLE IF EXISTS doctor_career;
+DROP TABLE IF EXISTS doctor_basic;
+DROP TABLE IF EXISTS doctor;
+DROP TABLE IF EXISTS hospital_evaluation;
+DROP TABLE IF EXISTS hospital_alias;
+DROP TABLE IF EXISTS hospital;
+
+CREATE TABLE hospital (
+    hid VARCHAR(32) NOT NULL PRIMARY KEY,
+    shortname VARCHAR(100) NOT NULL,
+    address VARCHAR(255),
+    lat DOUBLE,
+    lon DOUBLE,
+    telephone VARCHAR(32),
+    hospital_site VARCHAR(255),
+    sidocode_name VARCHAR(32),
+    sigungu_code_name VARCHAR(32),
+    eupmyeon VARCHAR(32),
+    FULLTEXT KEY ft_hospital_address (address) WITH PARSER ngram
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE hospital_alias (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    hid VARCHAR(32) NOT NULL,
+    alias_name VARCHAR(100) NOT NULL,
+    shortname VARCHAR(100) NOT NULL,
+    KEY idx_hospital_alias_hid (hid)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE hospital_evaluation (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    hid VARCHAR(32) NOT NULL,
+    matched_dept VARCHAR(100),
+    public_score DOUBLE,
+    KEY idx_hospital_evaluation_hid (hid)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE doctor (
+    rid BINARY(16) NOT NULL PRIMARY KEY,
+    doctor_id INT NOT NULL,
+    KEY idx_doctor_doctor_id (doctor_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE doctor_basic (
+    doctor_id INT NOT NULL PRIMARY KEY,
+    rid BINARY(16) NOT NULL,
+    hid VARCHAR(32) NOT NULL,
+    doctorname VARCHAR(50),
+    deptname VARCHAR(100),
+    specialties TEXT,
+    parse_specialties TEXT,
+    doctor_url VARCHAR(255),
+    profileimgurl VARCHAR(255),
+    is_active CHAR(1) DEFAULT '1',
+    KEY idx_doctor_basic_hid (hid),
+    KEY idx_doctor_basic_rid (rid),
+    FULLTEXT KEY ft_doctor_basic_deptname (deptname) WITH PARSER ngram,
+    FULLTEXT KEY ft_doctor_basic_parse_specialties (parse_specialties) WITH PARSER ngram
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE doctor_career (
+    rid BINARY(16) NOT NULL PRIMARY KEY,
+    education TEXT,
+    career TEXT
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE doctor_evaluation (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    doctor_id INT NOT NULL,
+    standard_spec VARCHAR(100),
+    paper_score DOUBLE,
+    patient_score DOUBLE,
+    public_score DOUBLE,
+    peer_score DOUBLE,
+    kindness DOUBLE,
+    satisfaction DOUBLE,
+    explanation DOUBLE,
+    recommendation DOUBLE,
+    KEY idx_doctor_evaluation_doctor_id (doctor_id),
+    KEY idx_doctor_evaluation_standard_spec (standard_spec)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE specialty (
+    specialty_id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    specialty VARCHAR(100) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE doctor_specialty (
+    doctor_id INT NOT NULL,
+    specialty_id INT NOT NULL,
+    PRIMARY KEY (doctor_id, specialty_id),
+    KEY idx_doctor_specialty_specialty_id (specialty_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE doctor_paper (
+    id INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    rid BINARY(16) NOT NULL,
+    pmid VARCHAR(32),
+    title VARCHAR(255),
+    isFirstAuthor TINYINT DEFAULT 0,
+    createAt DATETIME DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_doctor_paper_rid (rid)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
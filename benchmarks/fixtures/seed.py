@@ -0,0 +1,164 @@
+"""
+벤치마크용 로컬 MySQL 픽스처 생성기.
+같은 seed면 항상 같은 데이터를 만든다 (실행 간 결과 비교 가능).
+"""
+import os
+import random
+from typing import Dict, List
+
+from sqlalchemy import text
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema.sql")
+
+REGIONS = [
+    # (시/도, 시/군/구, 읍/면/동, 위도, 경도)
+    ("서울", "강남구", "역삼동", 37.5006, 127.0364),
+    ("서울", "종로구", "연건동", 37.5796, 126.9990),
+    ("서울", "송파구", "풍납동", 37.5266, 127.1083),
+    ("부산", "서구", "아미동", 35.1001, 129.0174),
+    ("부산", "해운대구", "좌동", 35.1695, 129.1770),
+    ("경기", "성남시", "분당구", 37.3521, 127.1234),
+    ("경기", "수원시", "영통구", 37.2795, 127.0436),
+    ("대구", "중구", "삼덕동", 35.8683, 128.6046),
+    ("광주", "동구", "학동", 35.1422, 126.9224),
+    ("경남", "창원시", "성산구", 35.2195, 128.6811),
+]
+
+HOSPITAL_NAMES = ["대학교병원", "성모병원", "의료원", "세브란스병원", "아산병원", "삼성병원", "기독병원", "중앙병원"]
+
+DEPARTMENTS = {
+    "내과": ["고혈압", "당뇨병", "위염", "간염", "역류성 식도염"],
+    "정형외과": ["허리디스크", "무릎 관절염", "오십견", "척추관 협착증"],
+    "신경과": ["편두통", "뇌졸중", "파킨슨병", "치매"],
+    "피부과": ["아토피 피부염", "건선", "여드름"],
+    "안과": ["백내장", "녹내장", "망막 질환"],
+    "심장내과": ["부정맥", "협심증", "심부전"],
+    "소아청소년과": ["소아 천식", "성장 장애"],
+    "이비인후과": ["비염", "중이염", "수면 무호흡"],
+}
+
+FAMILY_NAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN_NAMES = "민서준우현지수영진성하은도윤태재경"
+
+
+def _rid(rng: random.Random) -> bytes:
+    return bytes(rng.getrandbits(8) for _ in range(16))
+
+
+def _apply_schema(connection):
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        statements = [s.strip() for s in f.read().split(";")]
+    for statement in statements:
+        lines = [line for line in statement.splitlines() if not line.strip().startswith("--")]
+        sql = "\n".join(lines).strip()
+        if sql:
+            connection.execute(text(sql))
+
+
+def seed_database(engine, seed: int = 42, hospitals_per_region: int = 4, doctors_per_hospital: int = 12) -> Dict[str, int]:
+    """스키마를 다시 만들고 합성 데이터를 채운다. 생성된 행 수를 반환."""
+    rng = random.Random(seed)
+    hospitals: List[dict] = []
+    aliases: List[dict] = []
+    hospital_evaluations: List[dict] = []
+    doctors: List[dict] = []
+    doctor_rows: List[dict] = []
+    careers: List[dict] = []
+    evaluations: List[dict] = []
+    doctor_specialties: List[dict] = []
+    papers: List[dict] = []
+
+    specialties = []
+    specialty_ids: Dict[str, int] = {}
+    for diseases in DEPARTMENTS.values():
+        for disease in diseases:
+            specialty_ids[disease] = len(specialties) + 1
+            specialties.append({"specialty_id": len(specialties) + 1, "specialty": disease})
+
+    doctor_id = 1000
+    for region_idx, (sido, sigungu, eupmyeon, lat, lon) in enumerate(REGIONS):
+        for h in range(hospitals_per_region):
+            hid = f"H01KR{region_idx:02d}{h:03d}"
+            shortname = f"{sido}{HOSPITAL_NAMES[(region_idx + h) % len(HOSPITAL_NAMES)]}"
+            if h:
+                shortname = f"{shortname}{h}"
+            hospitals.append({
+                "hid": hid,
+                "shortname": shortname,
+                "address": f"{sido} {sigungu} {eupmyeon} {rng.randint(1, 300)}",
+                "lat": lat + rng.uniform(-0.05, 0.05),
+                "lon": lon + rng.uniform(-0.05, 0.05),
+                "telephone": f"02-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                "hospital_site": f"https://{hid.lower()}.example.org",
+                "sidocode_name": sido,
+                "sigungu_code_name": sigungu,
+                "eupmyeon": eupmyeon,
+            })
+            for alias in {shortname, shortname.replace("병원", ""), f"{sido} {shortname[len(sido):]}"}:
+                aliases.append({"hid": hid, "alias_name": alias, "shortname": shortname})
+
+            dept_names = list(DEPARTMENTS)
+            for dept in dept_names:
+                hospital_evaluations.append({"hid": hid, "matched_dept": dept, "public_score": round(rng.uniform(40, 100), 2)})
+
+            for _ in range(doctors_per_hospital):
+                doctor_id += 1
+                dept = rng.choice(dept_names)
+                diseases = rng.sample(DEPARTMENTS[dept], k=min(2, len(DEPARTMENTS[dept])))
+                rid = _rid(rng)
+                doctors.append({"rid": rid, "doctor_id": doctor_id})
+                doctor_rows.append({
+                    "doctor_id": doctor_id,
+                    "rid": rid,
+                    "hid": hid,
+                    "doctorname": rng.choice(FAMILY_NAMES) + "".join(rng.sample(GIVEN_NAMES, 2)),
+                    "deptname": dept,
+                    "specialties": ", ".join(diseases),
+                    "parse_specialties": " ".join(d.replace(" ", "") for d in diseases),
+                    "doctor_url": f"https://{hid.lower()}.example.org/doctors/{doctor_id}",
+                    "profileimgurl": f"https://{hid.lower()}.example.org/img/{doctor_id}.jpg",
+                    "is_active": rng.choice("1112"),
+                })
+                careers.append({
+                    "rid": rid,
+                    "education": "의학 학사 / 의학 석사 / 의학 박사 " * rng.randint(1, 3),
+                    "career": "전임의 / 임상 조교수 / 부교수 " * rng.randint(1, 4),
+                })
+                for disease in diseases:
+                    evaluations.append({
+                        "doctor_id": doctor_id,
+                        "standard_spec": disease,
+                        "paper_score": round(rng.uniform(0, 1), 3),
+                        "patient_score": round(rng.uniform(0, 100), 2),
+                        "public_score": round(rng.uniform(0, 100), 2),
+                        "peer_score": round(rng.uniform(0, 100), 2),
+                        "kindness": round(rng.uniform(0, 1), 3),
+                        "satisfaction": round(rng.uniform(0, 1), 3),
+                        "explanation": round(rng.uniform(0, 1), 3),
+                        "recommendation": round(rng.uniform(0, 1), 3),
+                    })
+                    doctor_specialties.append({"doctor_id": doctor_id, "specialty_id": specialty_ids[disease]})
+                for p in range(rng.randint(0, 3)):
+                    papers.append({"rid": rid, "pmid": str(rng.randint(10_000_000, 39_999_999)), "title": f"Study {p} on {diseases[0]}", "isFirstAuthor": p == 0})
+
+    inserts = [
+        ("hospital", hospitals),
+        ("hospital_alias", aliases),
+        ("hospital_evaluation", hospital_evaluations),
+        ("doctor", doctors),
+        ("doctor_basic", doctor_rows),
+        ("doctor_career", careers),
+        ("doctor_evaluation", evaluations),
+        ("specialty", specialties),
+        ("doctor_specialty", doctor_specialties),
+        ("doctor_paper", papers),
+    ]
+    with engine.begin() as connection:
+        _apply_schema(connection)
+        for table, rows in inserts:
+            if not rows:
+                continue
+            columns = list(rows[0])
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"
+            connection.execute(text(sql), rows)
+    return {table: len(rows) for table, rows in inserts}
@@ -0,0 +1,190 @@
+"""
+부하 테스트용 로컬 OpenAI(Azure) 호환 chat-completions stub 서버.
+
+재생 코퍼스(benchmarks/corpus/conversations.json)의 스크립트대로 tool_calls / 최종 답변 / 보조 프롬프트 응답을
+돌려주고, usage(prompt/completion/cached tokens)도 채운다. 응답 지연은 분포로 지정한다.
+모델 지연과 분리된 서버 자체의 포화 지점을 찾기 위해 loadgen.py와 함께 사용한다.
+
+실행:
+    python -m benchmarks.llm_stub_server --port 8089 --latency lognormal:5.5,0.4
+    LLM_STUB_ENABLE=true LLM_STUB_ENDPOINT=http://127.0.0.1:8089 ./start.sh
+
+지연 분포 (단위 ms):
+    fixed:200 | uniform:100,400 | normal:300,80 | lognormal:mu,sigma (ln(ms) 기준) | none
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.script import ConversationScript  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus", "conversations.json")
+
+
+def parse_latency(spec: str, rng: random.Random) -> Callable[[], float]:
+    """지연 분포 문자열을 초 단위 샘플러로 변환"""
+    if not spec or spec == "none":
+        return lambda: 0.0
+    kind, _, raw = spec.partition(":")
+    params = [float(v) for v in raw.split(",") if v]
+    if kind == "fixed" and len(params) == 1:
+        return lambda: params[0] / 1000.0
+    if kind == "uniform" and len(params) == 2:
+        return lambda: rng.uniform(params[0], params[1]) / 1000.0
+    if kind == "normal" and len(params) == 2:
+        return lambda: max(0.0, rng.gauss(params[0], params[1])) / 1000.0
+    if kind == "lognormal" and len(params) == 2:
+        return lambda: rng.lognormvariate(params[0], params[1]) / 1000.0
+    raise ValueError(f"unknown latency spec: {spec}")
+
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+def _pick(script: ConversationScript, messages: List[dict]) -> dict:
+    """fake_llm.ScriptedChatModel 과 같은 규칙: system 메시지로 시작하면 에이전트 호출"""
+    if not messages or messages[0].get("role") != "system":
+        prompt = "\n".join(_text(m.get("content")) for m in messages)
+        return {"content": script.side_response(prompt)}
+
+    user_indexes = [i for i, m in enumerate(messages) if m.get("role") == "user"]
+    if not user_indexes:
+        return {"content": script.default_answer}
+    last_user = user_indexes[-1]
+    step = sum(1 for m in messages[last_user + 1:] if m.get("role") == "assistant")
+    return script.agent_step(_text(messages[last_user].get("content")), step)
+
+
+def build_completion(script: ConversationScript, body: dict, cached_ratio: float = 0.0) -> dict:
+    messages = body.get("messages", [])
+    spec = _pick(script, messages)
+
+    if spec.get("tool_calls") and body.get("tools"):
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {"name": tc["name"], "arguments": json.dumps(tc.get("args", {}), ensure_ascii=False)},
+                }
+                for tc in spec["tool_calls"]
+            ],
+        }
+        finish_reason = "tool_calls"
+        completion_tokens = 20 * len(spec["tool_calls"])
+    else:
+        content = spec.get("content", script.default_answer)
+        message = {"role": "assistant", "content": content}
+        finish_reason = "stop"
+        completion_tokens = _approx_tokens(content)
+
+    prompt_tokens = sum(_approx_tokens(_text(m.get("content"))) for m in messages)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model") or "stub",
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": int(prompt_tokens * cached_ratio)},
+            "completion_tokens_details": {"reasoning_tokens": 0},
+        },
+        "system_fingerprint": "stub",
+    }
+
+
+def create_app(script: ConversationScript, latency: Callable[[], float], error_rate: float = 0.0,
+               cached_ratio: float = 0.0, rng: Optional[random.Random] = None) -> FastAPI:
+    rng = rng or random.Random()
+    app = FastAPI(title="AIGA LLM stub")
+    app.state.requests = 0
+
+    async def _complete(request: Request, deployment: str = ""):
+        body = await request.json()
+        app.state.requests += 1
+        if body.get("stream"):
+            return JSONResponse(status_code=400, content={"error": {"message": "stream is not supported by the stub", "type": "invalid_request_error"}})
+        delay = latency()
+        if delay:
+            await asyncio.sleep(delay)
+        if error_rate and rng.random() < error_rate:
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={"error": {"message": "stub rate limit", "type": "rate_limit_exceeded", "code": "429"}},
+            )
+        if deployment and not body.get("model"):
+            body["model"] = deployment
+        return JSONResponse(content=build_completion(script, body, cached_ratio))
+
+    @app.post("/openai/deployments/{deployment}/chat/completions")
+    async def azure_chat_completions(deployment: str, request: Request):
+        return await _complete(request, deployment)
+
+    @app.post("/openai/chat/completions")
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        return await _complete(request)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "requests": app.state.requests}
+
+    return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI-compatible chat-completions stub for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--script", default=DEFAULT_CORPUS, help="응답 스크립트로 사용할 재생 코퍼스")
+    parser.add_argument("--latency", default="none", help="fixed:ms | uniform:lo,hi | normal:mean,std | lognormal:mu,sigma | none")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429로 응답할 비율 (0~1)")
+    parser.add_argument("--cached-ratio", type=float, default=0.0, help="usage.prompt_tokens_details.cached_tokens 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    app = create_app(
+        ConversationScript.from_corpus(args.script),
+        parse_latency(args.latency, rng),
+        error_rate=args.error_rate,
+        cached_ratio=args.cached_ratio,
+        rng=rng,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+/chat/start 부하 생성기.
+
+동시성(가상 사용자 수)을 단계적으로 올리면서 각 단계의 처리량, p50/p95/p99, 오류/409/429 비율을 보고한다.
+LLM stub 서버(llm_stub_server.py)와 함께 쓰면 모델 지연과 분리된 서버 자체의 포화 지점을 찾을 수 있다.
+
+실행:
+    python -m benchmarks.llm_stub_server --latency fixed:300 &
+    LLM_STUB_ENABLE=true uvicorn app.main:app --port 8000 &
+    python -m benchmarks.loadgen --base-url http://127.0.0.1:8000 --concurrency 1,4,16,64 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+import httpx
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.replay import percentile  # noqa: E402
+from benchmarks.script import load_conversations  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus", "conversations.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Closed-loop load generator for /chat/start")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="쉼표로 구분한 동시성 단계")
+    parser.add_argument("--duration", type=float, default=20.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="단계별 워밍업 시간(초, 집계 제외)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--locale", default="ko")
+    parser.add_argument("--json-out", help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+async def run_level(client: httpx.AsyncClient, conversations: List[List[str]], concurrency: int,
+                    duration: float, warmup: float, locale: str) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def user(index: int):
+        # 가상 사용자마다 대화를 돌아가며 재생하고, 대화가 끝나면 새 세션으로 시작
+        conversation_index = index
+        while time.perf_counter() < deadline:
+            turns = conversations[conversation_index % len(conversations)]
+            conversation_index += concurrency
+            session_id = f"load-{uuid.uuid4().hex}"
+            for message in turns:
+                if time.perf_counter() >= deadline:
+                    return
+                sent = time.perf_counter()
+                try:
+                    response = await client.post(
+                        "/chat/start",
+                        json={"message": message, "session_id": session_id, "locale": locale},
+                    )
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                elapsed = time.perf_counter() - sent
+                if sent >= measure_from:
+                    statuses[status] += 1
+                    if status == "200":
+                        latencies.append(elapsed)
+                if status != "200":
+                    break
+
+    await asyncio.gather(*[user(i) for i in range(concurrency)])
+    wall = max(1e-9, time.perf_counter() - measure_from)
+    total = sum(statuses.values())
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": len(latencies),
+        "throughput_rps": len(latencies) / wall,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "error_rate": (total - len(latencies)) / total if total else 0.0,
+        "rate_429": statuses.get("429", 0) / total if total else 0.0,
+        "rate_409": statuses.get("409", 0) / total if total else 0.0,
+        "statuses": dict(statuses),
+    }
+
+
+def print_levels(levels: List[dict]):
+    print(f"\n{'conc':>6}{'reqs':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err%':>8}{'429%':>8}")
+    for row in levels:
+        print(
+            f"{row['concurrency']:>6}{row['requests']:>8}{row['throughput_rps']:>10.2f}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+            f"{row['error_rate'] * 100:>8.1f}{row['rate_429'] * 100:>8.1f}"
+        )
+    saturation = find_saturation(levels)
+    if saturation:
+        print(f"\nsaturation: throughput stops scaling at concurrency {saturation['concurrency']} (~{saturation['throughput_rps']:.2f} rps)")
+
+
+def find_saturation(levels: List[dict], min_gain: float = 0.1):
+    """동시성을 올려도 처리량이 min_gain(10%) 이상 늘지 않는 첫 단계의 직전 단계를 포화 지점으로 본다"""
+    for previous, current in zip(levels, levels[1:]):
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return previous
+    return None
+
+
+async def main_async(args) -> List[dict]:
+    conversations = load_conversations(args.corpus)
+    levels = []
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            row = await run_level(client, conversations, concurrency, args.duration, args.warmup, args.locale)
+            print(f"concurrency {concurrency}: {row['throughput_rps']:.2f} rps, p95 {row['p95_ms']:.1f} ms, statuses {row['statuses']}")
+            levels.append(row)
+    return levels
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels = asyncio.run(main_async(args))
+    print_levels(levels)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"levels": levels, "saturation": find_saturation(levels)}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+오프라인 end-to-end 재생(replay) 벤치마크.
+
+get_compiled_graph()로 만든 실제 그래프를 스크립트 기반 가짜 채팅 모델(benchmarks/fake_llm.py)과
+시드된 로컬 MySQL 픽스처(benchmarks/fixtures)에 연결하여, 여러 턴의 대화 코퍼스를 동시에 재생하고
+단계별 p50/p95/p99, 처리량(turns/s), 턴당 메모리 할당량을 보고한다. Azure / 운영 MySQL 없이 실행된다.
+
+로컬 픽스처 DB 준비 (쿼리가 aiga2025. 접두어를 쓰므로 DB 이름은 aiga2025 고정):
+    docker run -d --name aiga-bench-mysql -e MYSQL_ROOT_PASSWORD=bench \
+        -e MYSQL_DATABASE=aiga2025 -p 3307:3306 mysql:8.0
+
+실행:
+    python -m benchmarks.replay --mysql-port 3307 --mysql-password bench --concurrency 8 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus", "conversations.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline replay benchmark for the LangGraph agent")
+    parser.add_argument("--mysql-host", default="127.0.0.1")
+    parser.add_argument("--mysql-port", type=int, default=3307)
+    parser.add_argument("--mysql-user", default="root")
+    parser.add_argument("--mysql-password", default="bench")
+    parser.add_argument("--skip-seed", action="store_true", help="이미 시드된 픽스처 DB를 그대로 사용")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3, help="각 대화를 몇 번 재생할지 (각각 별도 thread_id)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="가짜 LLM 호출마다 추가할 지연")
+    parser.add_argument("--alloc-turns", type=int, default=10, help="순차 할당량 측정에 사용할 턴 수 (0이면 생략)")
+    parser.add_argument("--validation", action="store_true", help="validate_node 의 LLM 검증 활성화")
+    parser.add_argument("--json-out", help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+def configure_offline_settings(args, workdir: str):
+    """app 모듈을 import 하기 전에 설정을 오프라인 픽스처로 교체 (.env 값보다 우선)"""
+    from app.config import settings
+
+    settings.mysql_host = args.mysql_host
+    settings.mysql_port = args.mysql_port
+    settings.mysql_user = args.mysql_user
+    settings.mysql_password = args.mysql_password
+    settings.mysql_db = "aiga2025"
+    # LLM 클라이언트는 생성만 되고 호출되지 않는다 (가짜 모델로 교체)
+    settings.azure_endpoint = "http://127.0.0.1:9"
+    settings.azure_key = "offline"
+    settings.azure_api_version = "2024-06-01"
+    settings.azure_api_model = "offline"
+    settings.azure_summary_api_model = "offline"
+    settings.sqlite_directory = os.path.join(workdir, "checkpoints.sqlite")
+    settings.cache_sqlite_directory = workdir
+    settings.llm_sql_agent_cache_verbose = False
+    settings.validation_enable = args.validation
+    settings.metrics_enable = True
+    os.environ.setdefault("DISEASE_SYNONYM_MATCH", "80")
+    os.environ.setdefault("SCORE_WEIGHT", "0.3")
+    return settings
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # nearest-rank
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, dict]:
+    summary = {}
+    for key, values in sorted(samples.items()):
+        summary[key] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+            "mean_ms": round(statistics.fmean(values) * 1000, 3),
+        }
+    return summary
+
+
+class StageRecorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def __call__(self, stage: str, tool: str, cache: str, seconds: float):
+        key = stage
+        if tool:
+            key = f"{key}[{tool}]"
+        if cache:
+            key = f"{key}({cache})"
+        self.samples[key].append(seconds)
+
+
+async def run_turn(graph, make_response, thread_id: str, user_text: str, locale: str = "ko"):
+    from langchain_core.messages import HumanMessage
+    from app.common.callbacks import TokenCountingCallback
+
+    token_counter = TokenCountingCallback()
+    config = {"callbacks": [token_counter], "configurable": {"thread_id": thread_id}}
+    result = await graph.ainvoke(
+        {"messages": [HumanMessage(content=user_text)], "locale": locale, "latitude": None, "longitude": None},
+        config=config,
+    )
+    return make_response(user_text, result, token_counter)
+
+
+async def replay(graph, make_response, conversations: List[dict], concurrency: int, repeat: int, recorder: StageRecorder):
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    turn_latencies: List[float] = []
+    errors: List[str] = []
+
+    async def run_conversation(conversation: dict, repetition: int):
+        async with semaphore:
+            thread_id = f"bench-{conversation['id']}-{repetition}-{uuid.uuid4().hex[:8]}"
+            for turn in conversation["turns"]:
+                started = time.perf_counter()
+                try:
+                    await run_turn(graph, make_response, thread_id, turn["user"])
+                except Exception as e:
+                    errors.append(f"{conversation['id']}: {e}")
+                    return
+                elapsed = time.perf_counter() - started
+                turn_latencies.append(elapsed)
+                recorder("turn", "", "", elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        run_conversation(conversation, repetition)
+        for repetition in range(repeat)
+        for conversation in conversations
+    ])
+    wall = time.perf_counter() - started
+    return turn_latencies, wall, errors
+
+
+async def measure_allocations(graph, make_response, conversations: List[dict], max_turns: int) -> dict:
+    """턴 단위 순차 실행으로 턴당 peak / 잔류(net) 할당량을 측정"""
+    turns = [(c["id"], t["user"]) for c in conversations for t in c["turns"]][:max_turns]
+    if not turns:
+        return {}
+    peaks, nets = [], []
+    tracemalloc.start()
+    try:
+        thread_ids = {}
+        for conversation_id, user_text in turns:
+            thread_id = thread_ids.setdefault(conversation_id, f"bench-alloc-{conversation_id}-{uuid.uuid4().hex[:8]}")
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await run_turn(graph, make_response, thread_id, user_text)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            nets.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "turns": len(turns),
+        "peak_bytes_per_turn_mean": int(statistics.fmean(peaks)),
+        "peak_bytes_per_turn_max": max(peaks),
+        "net_bytes_per_turn_mean": int(statistics.fmean(nets)),
+    }
+
+
+def print_report(report: dict):
+    print(f"\nturns: {report['turns']}  wall: {report['wall_seconds']:.2f}s  throughput: {report['throughput_turns_per_sec']:.2f} turns/s")
+    if report["errors"]:
+        print(f"errors: {len(report['errors'])}")
+        for error in report["errors"][:5]:
+            print(f"  - {error}")
+    print(f"\n{'stage':<60}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    for key, row in report["stages"].items():
+        print(f"{key:<60}{row['count']:>8}{row['p50_ms']:>12.2f}{row['p95_ms']:>12.2f}{row['p99_ms']:>12.2f}")
+    if report.get("allocations"):
+        alloc = report["allocations"]
+        print(
+            f"\nallocations ({alloc['turns']} sequential turns): "
+            f"peak/turn mean {alloc['peak_bytes_per_turn_mean'] / 1024:.1f} KiB, "
+            f"max {alloc['peak_bytes_per_turn_max'] / 1024:.1f} KiB, "
+            f"net/turn mean {alloc['net_bytes_per_turn_mean'] / 1024:.1f} KiB"
+        )
+
+
+async def main_async(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="aiga-bench-")
+    configure_offline_settings(args, workdir)
+
+    from app.database.db import engine
+    from benchmarks.fixtures.seed import seed_database
+
+    if not args.skip_seed:
+        counts = seed_database(engine, seed=args.seed)
+        print(f"seeded fixture database: {counts}")
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    import app.agent as agent_module
+    import app.common.handlers as handlers_module
+    import app.tools.tools as tools_module
+    from app.common.tracing import add_span_listener
+    from app.services.service import makeResponse
+    from benchmarks.fake_llm import ScriptedChatModel
+    from benchmarks.script import ConversationScript
+
+    fake = ScriptedChatModel(
+        script=ConversationScript.from_corpus(args.corpus),
+        latency_seconds=args.llm_latency_ms / 1000.0,
+    )
+    agent_module.llm = fake
+    agent_module.llm_for_summary = fake
+    agent_module.model = fake
+    agent_module.validation_llm = fake
+    # search_doctor_for_else_question 폴백의 SQL agent / 요약 호출도 네트워크 없이 스크립트 모델로
+    tools_module.get_sql_llm = lambda: fake
+    tools_module.get_sql_agent_executor.reset()
+
+    async def _offline_reverse_geocode(latitude, longitude):
+        return "서울특별시 강남구 역삼동"
+
+    handlers_module.get_address_from_coordinates = _offline_reverse_geocode
+
+    recorder = StageRecorder()
+    add_span_listener(recorder)
+    graph = await agent_module.get_compiled_graph()
+
+    turn_latencies, wall, errors = await replay(
+        graph, makeResponse, corpus["conversations"], args.concurrency, args.repeat, recorder
+    )
+    report = {
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "turns": len(turn_latencies),
+        "wall_seconds": wall,
+        "throughput_turns_per_sec": len(turn_latencies) / wall if wall else 0.0,
+        "errors": errors,
+        "stages": summarize(recorder.samples),
+    }
+    if args.alloc_turns:
+        report["allocations"] = await measure_allocations(graph, makeResponse, corpus["conversations"], args.alloc_turns)
+    return report
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
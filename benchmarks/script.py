@@ -0,0 +1,55 @@
+"""
+재생 코퍼스(benchmarks/corpus/*.json) 기반 응답 스크립트.
+가짜 채팅 모델(fake_llm.py)과 로컬 OpenAI 호환 stub 서버(llm_stub_server.py)가 같은 규칙을 공유한다.
+"""
+import json
+from typing import Dict, List, Tuple
+
+DEFAULT_ANSWER = "요청하신 내용을 확인했습니다."
+
+
+class ConversationScript:
+    def __init__(self, scripts: Dict[str, List[dict]], side_responses: List[Tuple[str, str]] = (),
+                 default_side_response: str = "{}", default_answer: str = DEFAULT_ANSWER):
+        self.scripts = scripts
+        self.side_responses = [tuple(pair) for pair in side_responses]
+        self.default_side_response = default_side_response
+        self.default_answer = default_answer
+
+    @classmethod
+    def from_corpus(cls, path: str) -> "ConversationScript":
+        with open(path, encoding="utf-8") as f:
+            corpus = json.load(f)
+        return cls(
+            scripts={turn["user"]: turn["agent"] for c in corpus.get("conversations", []) for turn in c["turns"]},
+            side_responses=corpus.get("side_responses", []),
+            default_side_response=corpus.get("default_side_response", "{}"),
+            default_answer=corpus.get("default_answer", DEFAULT_ANSWER),
+        )
+
+    def agent_step(self, user_text: str, step: int) -> dict:
+        """
+        현재 턴의 사용자 메시지와 그 뒤에 이미 나온 AI 메시지 수(step)로 다음 응답을 고른다.
+        반환값: {"content": str} 또는 {"tool_calls": [{"name", "args"}]}
+        """
+        script = self.scripts.get(user_text)
+        if not script:
+            return {"content": self.default_answer}
+        if step < len(script):
+            return script[step]
+        # 스크립트를 넘어가면 마지막 최종 답변을 반복 (tool 루프 방지)
+        last = script[-1]
+        return last if not last.get("tool_calls") else {"content": self.default_answer}
+
+    def side_response(self, prompt: str) -> str:
+        for needle, response in self.side_responses:
+            if needle in prompt:
+                return response
+        return self.default_side_response
+
+
+def load_conversations(path: str) -> List[List[str]]:
+    """부하 생성기용: 코퍼스의 대화별 사용자 발화 목록"""
+    with open(path, encoding="utf-8") as f:
+        corpus = json.load(f)
+    return [[turn["user"] for turn in c["turns"]] for c in corpus.get("conversations", [])]
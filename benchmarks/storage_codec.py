@@ -0,0 +1,174 @@
+"""
+SQLite 저장 코덱(app/common/storage_codec.py) 압축률 / 인코딩·디코딩 시간 측정.
+
+실제 checkpoints.sqlite 의 tool_results_cache.content 와 checkpoints blob 을 샘플로 읽어
+코덱별 (none / zlib / zlib+공유 사전 / zlib+학습 사전 / zstd) 압축률과 p50/p95 시간(µs)을 비교한다.
+학습 사전은 샘플 절반으로 학습하고 나머지 절반으로 측정한다.
+
+실행:
+    python -m benchmarks.storage_codec --sqlite ./data/checkpoints.sqlite
+    python -m benchmarks.storage_codec --sqlite ./data/checkpoints.sqlite --train dict_v2.bin   # 사전 후보 저장
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.replay import percentile  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compression ratio / timing report for the SQLite storage codec")
+    parser.add_argument("--sqlite", default=os.getenv("SQLITE_DIRECTORY"), help="checkpoints sqlite 파일 (기본: SQLITE_DIRECTORY)")
+    parser.add_argument("--limit", type=int, default=2000, help="저장소별 최대 샘플 수")
+    parser.add_argument("--level", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--train", help="학습한 사전 후보를 이 파일로 저장")
+    parser.add_argument("--json-out", help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+def load_samples(path: str, limit: int) -> Dict[str, List[bytes]]:
+    """저장소별 원본 payload (이미 압축된 행은 풀어서 사용)"""
+    from app.common.storage_codec import COMPRESSED_TYPE_PREFIX, storage_codec
+
+    samples: Dict[str, List[bytes]] = {"tool_results_cache": [], "checkpoints": []}
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        try:
+            rows = connection.execute("SELECT content FROM tool_results_cache ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            samples["tool_results_cache"] = [storage_codec.decode_text(row[0]).encode("utf-8") for row in rows]
+        except sqlite3.OperationalError as e:
+            print(f"skipped tool_results_cache: {e}")
+        try:
+            rows = connection.execute("SELECT type, checkpoint FROM checkpoints ORDER BY rowid DESC LIMIT ?", (limit,)).fetchall()
+            for type_, blob in rows:
+                if blob is None:
+                    continue
+                blob = bytes(blob)
+                if type_ and type_.startswith(COMPRESSED_TYPE_PREFIX):
+                    blob = storage_codec.decode_bytes(blob, "checkpoints")
+                samples["checkpoints"].append(blob)
+        except sqlite3.OperationalError as e:
+            print(f"skipped checkpoints: {e}")
+    finally:
+        connection.close()
+    return samples
+
+
+def zlib_codec(level: int, zdict: Optional[bytes] = None) -> Tuple[Callable, Callable]:
+    def encode(data: bytes) -> bytes:
+        compressor = zlib.compressobj(level, zdict=zdict) if zdict else zlib.compressobj(level)
+        return compressor.compress(data) + compressor.flush()
+
+    def decode(data: bytes) -> bytes:
+        decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    return encode, decode
+
+
+def zstd_codec(level: int, raw_dict: Optional[bytes] = None) -> Optional[Tuple[Callable, Callable]]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    dict_data = zstandard.ZstdCompressionDict(raw_dict, dict_type=zstandard.DICT_TYPE_RAWCONTENT) if raw_dict else None
+    compressor = zstandard.ZstdCompressor(level=level, dict_data=dict_data)
+    decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+    return compressor.compress, decompressor.decompress
+
+
+def measure(encode: Callable, decode: Callable, samples: List[bytes], rounds: int) -> dict:
+    raw = sum(len(sample) for sample in samples)
+    stored = 0
+    encode_us, decode_us = [], []
+    for round_index in range(rounds):
+        for sample in samples:
+            started = time.perf_counter_ns()
+            encoded = encode(sample)
+            encode_us.append((time.perf_counter_ns() - started) / 1000.0)
+            started = time.perf_counter_ns()
+            decoded = decode(encoded)
+            decode_us.append((time.perf_counter_ns() - started) / 1000.0)
+            if decoded != sample:
+                raise AssertionError("round trip mismatch")
+            if round_index == 0:
+                stored += len(encoded)
+    return {
+        "raw_bytes": raw,
+        "stored_bytes": stored,
+        "ratio": round(raw / stored, 2) if stored else None,
+        "encode_p50_us": round(percentile(encode_us, 50), 1),
+        "encode_p95_us": round(percentile(encode_us, 95), 1),
+        "decode_p50_us": round(percentile(decode_us, 50), 1),
+        "decode_p95_us": round(percentile(decode_us, 95), 1),
+    }
+
+
+def run(args) -> dict:
+    from app.common.storage_codec import CURRENT_DICT_ID, DICTIONARIES, train_dictionary
+
+    if not args.sqlite or not os.path.exists(args.sqlite):
+        raise SystemExit(f"sqlite file not found: {args.sqlite}")
+    samples = load_samples(args.sqlite, args.limit)
+    builtin = DICTIONARIES[CURRENT_DICT_ID]
+    report = {}
+    trained_all = []
+    for store, payloads in samples.items():
+        if not payloads:
+            continue
+        train_set, test_set = payloads[::2], payloads[1::2] or payloads
+        trained = train_dictionary(train_set)
+        trained_all.extend(train_set)
+        codecs = {
+            "identity": (lambda data: data, lambda data: data),
+            "zlib": zlib_codec(args.level),
+            f"zlib+dict_v{CURRENT_DICT_ID}": zlib_codec(args.level, builtin),
+            "zlib+trained": zlib_codec(args.level, trained),
+        }
+        for name, raw_dict in (("zstd", None), (f"zstd+dict_v{CURRENT_DICT_ID}", builtin)):
+            codec = zstd_codec(args.level, raw_dict)
+            if codec:
+                codecs[name] = codec
+        report[store] = {
+            "samples": len(test_set),
+            "trained_dict_bytes": len(trained),
+            "codecs": {name: measure(encode, decode, test_set, args.rounds) for name, (encode, decode) in codecs.items()},
+        }
+
+    if args.train and trained_all:
+        with open(args.train, "wb") as f:
+            f.write(train_dictionary(trained_all))
+        print(f"dictionary candidate written: {args.train}")
+    return report
+
+
+def print_report(report: dict):
+    for store, result in report.items():
+        print(f"\n[{store}] samples={result['samples']} trained_dict={result['trained_dict_bytes']}B")
+        print(f"{'codec':<18}{'ratio':>8}{'raw':>12}{'stored':>12}{'enc p50':>10}{'enc p95':>10}{'dec p50':>10}{'dec p95':>10}")
+        for name, row in result["codecs"].items():
+            print(f"{name:<18}{row['ratio'] or 0:>8.2f}{row['raw_bytes']:>12}{row['stored_bytes']:>12}"
+                  f"{row['encode_p50_us']:>10}{row['encode_p95_us']:>10}{row['decode_p50_us']:>10}{row['decode_p95_us']:>10}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
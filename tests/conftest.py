@@ -0,0 +1,4 @@
+import os
+
+# 테스트에서는 로그 파일을 만들지 않는다
+os.environ.setdefault("LOG_HANDLER_TYPE", "pm2")
@@ -0,0 +1,38 @@
+import random
+
+from app.common.hangul import bounded_levenshtein, decompose, has_chosung, matches_chosung_pattern, to_chosung
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def test_decompose_drops_empty_jongsung():
+    assert decompose("병원") == "ㅂㅕㅇㅇㅝㄴ"
+    assert decompose("가나") == "ㄱㅏㄴㅏ"
+    assert decompose("a1") == "a1"
+
+
+def test_chosung_helpers():
+    assert to_chosung("서울아산") == "ㅅㅇㅇㅅ"
+    assert to_chosung("서울ㅇㅅ병원") == "ㅅㅇㅇㅅㅂㅇ"
+    assert has_chosung("서울ㅇㅅ") and not has_chosung("서울아산")
+    assert matches_chosung_pattern("ㅇㅅ병원", "서울아산병원", 2)
+    assert not matches_chosung_pattern("ㅇㅅ의원", "서울아산병원", 2)
+
+
+def test_bounded_levenshtein_matches_full_distance_within_bound():
+    rng = random.Random(0)
+    alphabet = "ㄱㄴㅏㅓㅇ"
+    for _ in range(3000):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 7)))
+        bound = rng.randint(0, 3)
+        distance = _levenshtein(a, b)
+        assert bounded_levenshtein(a, b, bound) == (distance if distance <= bound else None)
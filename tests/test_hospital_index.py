@@ -0,0 +1,67 @@
+import random
+
+from app.common.hangul import bounded_levenshtein, decompose
+from app.common.hospital_index import _AliasSnapshot, _normalize
+
+SYLLABLES = "가나다라마바사아간난병원의대학교서울삼성"
+
+
+def _rows(names, scores):
+    return [{"alias_name": name, "standard_name": f"{name}(표준)", "public_score": score} for name, score in zip(names, scores)]
+
+
+def _sql_substring(rows, query):
+    """alias_name LIKE '%query%' ORDER BY public_score DESC (NULL 뒤) LIMIT 1"""
+    ordered = sorted(rows, key=lambda row: (row["public_score"] is None, -(row["public_score"] or 0)))
+    for row in ordered:
+        if query in _normalize(row["alias_name"]):
+            return row["standard_name"]
+    return None
+
+
+def test_substring_rank_equals_sql_ordering():
+    rng = random.Random(0)
+    names = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 6))) for _ in range(200)]
+    scores = [rng.choice([None, rng.randint(0, 100)]) for _ in names]
+    rows = _rows(names, scores)
+    snapshot = _AliasSnapshot(rows)
+    for _ in range(1000):
+        query = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+        rank = snapshot.find_substring(query)
+        assert (snapshot.standard_names[rank] if rank is not None else None) == _sql_substring(rows, query)
+
+
+def test_normalized_and_chosung_lookup():
+    snapshot = _AliasSnapshot(_rows(["건국대학교병원", "서울아산병원"], [1, 2]))
+    assert snapshot.aliases[snapshot.find_normalized("건국대")] == "건국대학교병원"
+    assert snapshot.aliases[snapshot.find_chosung("서울ㅇㅅ병원")] == "서울아산병원"
+    assert snapshot.find_chosung("ㄱㄱㄱ") is None
+
+
+def test_fuzzy_match_across_moved_syllable_boundary():
+    # 자모 거리 1이지만 공유 음절은 2개뿐인 경우
+    snapshot = _AliasSnapshot(_rows(["가나병원", "서울아산병원"], [1, 2]))
+    assert snapshot.aliases[snapshot.find_fuzzy("간아병원", 1)] == "가나병원"
+    assert snapshot.aliases[snapshot.find_fuzzy("서울아샨병원", 1)] == "서울아산병원"
+
+
+def test_fuzzy_match_equals_full_scan():
+    rng = random.Random(1)
+    names = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 7))) for _ in range(200)]
+    snapshot = _AliasSnapshot(_rows(names, list(range(len(names)))))
+    for _ in range(500):
+        query = rng.choice(snapshot.aliases)
+        position = rng.randrange(len(query))
+        query = query[:position] + rng.choice(SYLLABLES) + query[position + 1:]
+        max_distance = rng.choice([1, 2])
+        query_jamo = decompose(query)
+        best = None
+        for rank in range(len(snapshot)):
+            for length, jamo in snapshot.jamo_variants[rank]:
+                if abs(length - len(query)) > max_distance:
+                    continue
+                distance = bounded_levenshtein(query_jamo, jamo, max_distance)
+                if distance is not None and (best is None or distance < best[0]):
+                    best = (distance, rank)
+        if len(query_jamo) - 1 - 2 * max_distance >= 1:
+            assert snapshot.find_fuzzy(query, max_distance) == (best[1] if best else None)
@@ -0,0 +1,39 @@
+import random
+
+from app.common.location_lexicon import find_sido_rule, has_top_level_region, scan_location_terms
+from app.tools.location_dic import (
+    GROUP_LOCATION_EXPANSION_RULES,
+    LOCATION_NORMALIZATION_RULES,
+    NAMED_PROXIMITY_KEYWORDS,
+    VALID_TOP_LEVEL_REGIONS,
+)
+
+
+def _sample_texts(count=500):
+    words = [name for rule in LOCATION_NORMALIZATION_RULES for name in rule] + list(GROUP_LOCATION_EXPANSION_RULES)
+    words += list(NAMED_PROXIMITY_KEYWORDS) + ["병원", " ", "내", "강남구", "치과"]
+    rng = random.Random(0)
+    return ["".join(rng.choice(words) for _ in range(rng.randint(0, 5))) for _ in range(count)]
+
+
+def test_find_sido_rule_matches_rule_order_loop():
+    for text in _sample_texts():
+        expected = next((rule for rule in LOCATION_NORMALIZATION_RULES if rule[0] in text or rule[1] in text), None)
+        assert find_sido_rule(text) == expected
+
+
+def test_has_top_level_region_matches_linear_scan():
+    for text in _sample_texts():
+        assert has_top_level_region(text) == any(region in text for region in VALID_TOP_LEVEL_REGIONS)
+
+
+def test_scan_reports_overlapping_hits_in_every_category():
+    scan = scan_location_terms("내 근처 치과")
+    assert {"내 근처", "근처"} <= set(scan.terms("proximity"))
+    assert scan.leftmost("proximity") == "내 근처"
+    assert "치과" in scan.terms("forbidden")
+
+
+def test_group_terms_are_reported_once_each():
+    group = next(iter(GROUP_LOCATION_EXPANSION_RULES))
+    assert scan_location_terms(f"{group} {group}").terms("group").count(group) == 1
@@ -0,0 +1,42 @@
+import random
+
+from app.common.multipattern import MultiTableRewriter, PatternRewriter
+from app.common.sanitizer import REWRITER
+from app.common.sensitive_words import MEDICAL_REWRITE, PROMPT_REWRITE
+
+
+def test_pattern_rewriter_prefers_longest_at_same_position():
+    rewriter = PatternRewriter({"피": "출혈", "피투성이": "혈액으로 오염된 상태"})
+    assert rewriter.rewrite("피투성이가 됐어") == "혈액으로 오염된 상태가 됐어"
+
+
+def test_pattern_rewriter_prefers_leftmost_over_longer_later_match():
+    rewriter = PatternRewriter({"ab": "X", "bcd": "Y"})
+    assert rewriter.rewrite("abcd") == "Xcd"
+
+
+def test_pattern_rewriter_does_not_rescan_replacements():
+    rewriter = PatternRewriter({"피": "피부", "피부": "skin"})
+    assert rewriter.rewrite("피") == "피부"
+
+
+def test_rewrite_and_find_returns_matches_in_order():
+    rewriter = PatternRewriter({"가슴": "흉부", "피": "출혈"})
+    assert rewriter.rewrite_and_find("가슴에서 피가") == ("흉부에서 출혈가", ["가슴", "피"])
+    assert rewriter.rewrite_and_find("") == ("", [])
+
+
+def test_multi_table_rewriter_keeps_tables_separate():
+    rewriter = MultiTableRewriter({"a": {"피": "출혈"}, "b": {"피": "혈액", "피투성이": "오염"}})
+    assert rewriter.rewrite("피투성이", "a") == "출혈투성이"
+    assert rewriter.rewrite("피투성이", "b") == "오염"
+
+
+def test_shared_rewriter_matches_per_table_pattern_rewriters():
+    medical, prompt = PatternRewriter(MEDICAL_REWRITE), PatternRewriter(PROMPT_REWRITE)
+    keys = sorted(set(MEDICAL_REWRITE) | set(PROMPT_REWRITE)) + ["가", " ", "프", "?"]
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = "".join(rng.choice(keys) for _ in range(rng.randint(0, 8)))
+        assert REWRITER.rewrite_and_find(text, "medical") == medical.rewrite_and_find(text)
+        assert REWRITER.rewrite(text, "prompt") == prompt.rewrite(text)
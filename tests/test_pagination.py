@@ -0,0 +1,68 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from app.common import pagination
+from app.common.pagination import InvalidCursor, decode_cursor, encode_cursor, pagination_enabled
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def cursor_secret(monkeypatch):
+    monkeypatch.setattr(settings, "pagination_enable", True)
+    monkeypatch.setattr(settings, "pagination_cursor_secret", "test-secret")
+    monkeypatch.setattr(settings, "pagination_cursor_ttl_seconds", 3600)
+
+
+def test_round_trip_preserves_sort_key_types():
+    cursor = encode_cursor("doctors", {"department": "내과", "limit": 10}, [Decimal("4.25"), 1.5, 42], 2)
+    decoded = decode_cursor(cursor)
+    assert decoded == {"search": "doctors", "args": {"department": "내과", "limit": 10}, "sort_key": [Decimal("4.25"), 1.5, 42], "page": 2}
+    assert isinstance(decoded["sort_key"][0], Decimal)
+
+
+def test_tampered_cursor_is_rejected():
+    signature = encode_cursor("doctors", {"limit": 10}, [1], 2).split(".")[1]
+    other_body = encode_cursor("doctors", {"limit": 1000}, [1], 2).split(".")[0]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(f"{other_body}.{signature}")
+
+
+def test_cursor_signed_with_another_secret_is_rejected(monkeypatch):
+    cursor = encode_cursor("doctors", {}, [1], 2)
+    monkeypatch.setattr(settings, "pagination_cursor_secret", "rotated")
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_expired_cursor_is_rejected(monkeypatch):
+    cursor = encode_cursor("doctors", {}, [1], 2)
+    now = pagination.time.time()
+    monkeypatch.setattr(pagination.time, "time", lambda: now + settings.pagination_cursor_ttl_seconds + 1)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("cursor", [None, "", "nodot", "한글.abc", "abc.한글", "abc.def", 123])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_pagination_requires_secret(monkeypatch):
+    assert pagination_enabled()
+    monkeypatch.setattr(settings, "pagination_cursor_secret", "")
+    assert not pagination_enabled()
+
+
+@pytest.mark.parametrize("cursor", ["abc.def", "한글.abc"])
+def test_fetch_more_answers_400_for_invalid_cursor(cursor):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("langchain_core")
+    from fastapi import HTTPException
+    from app.services.service import fetchMore
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(fetchMore(cursor, "session"))
+    assert excinfo.value.status_code == 400
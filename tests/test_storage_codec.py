@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from app.common.storage_codec import COMPRESSED_TYPE_PREFIX, CompressedSerializer, storage_codec, train_dictionary
+from app.config import settings
+
+PAYLOAD = json.dumps({
+    "chat_type": "search_doctor",
+    "answer": {"doctors": [{"doctor_id": i, "name": "홍길동", "deptname": "내과", "hospital": "서울아산병원"} for i in range(20)]},
+}, ensure_ascii=False)
+
+
+@pytest.fixture(params=[("zlib", False), ("zlib", True), ("zstd", False), ("zstd", True)], ids=lambda p: f"{p[0]}-dict{int(p[1])}")
+def codec(request, monkeypatch):
+    name, dictionary = request.param
+    if name == "zstd":
+        pytest.importorskip("zstandard")
+    monkeypatch.setattr(settings, "storage_codec", name)
+    monkeypatch.setattr(settings, "storage_codec_dictionary", dictionary)
+    monkeypatch.setattr(settings, "storage_codec_min_bytes", 256)
+    return name
+
+
+def test_text_round_trip(codec):
+    stored = storage_codec.encode_text(PAYLOAD)
+    assert isinstance(stored, bytes) and len(stored) < len(PAYLOAD.encode("utf-8"))
+    assert storage_codec.decode_text(stored) == PAYLOAD
+
+
+def test_small_values_stay_uncompressed(codec):
+    assert storage_codec.encode_text('{"status": "error"}') == '{"status": "error"}'
+
+
+def test_legacy_text_rows_decode_with_any_codec(codec):
+    assert storage_codec.decode_text(PAYLOAD) == PAYLOAD
+
+
+def test_rows_written_with_another_codec_still_decode(codec, monkeypatch):
+    monkeypatch.setattr(settings, "storage_codec", "zlib")
+    stored = storage_codec.encode_text(PAYLOAD)
+    monkeypatch.setattr(settings, "storage_codec", "none")
+    assert storage_codec.decode_text(stored) == PAYLOAD
+
+
+def test_codec_none_stores_plain_text(monkeypatch):
+    monkeypatch.setattr(settings, "storage_codec", "none")
+    assert storage_codec.encode_text(PAYLOAD) == PAYLOAD
+
+
+def test_unknown_header_is_rejected():
+    with pytest.raises(ValueError):
+        storage_codec.decode_bytes(b"\x7fabc", "tool_results_cache")
+
+
+class _JsonSerde:
+    def dumps_typed(self, obj):
+        return "json", json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads_typed(self, data):
+        type_, blob = data
+        assert type_ == "json"
+        return json.loads(blob)
+
+
+def test_checkpoint_serializer_round_trip_and_legacy_blobs(codec):
+    serde = CompressedSerializer(_JsonSerde())
+    obj = json.loads(PAYLOAD)
+    type_, blob = serde.dumps_typed(obj)
+    assert type_ == COMPRESSED_TYPE_PREFIX + "json"
+    assert serde.loads_typed((type_, blob)) == obj
+    # 압축 전 체크포인트 blob 은 그대로 읽는다
+    assert serde.loads_typed(_JsonSerde().dumps_typed(obj)) == obj
+
+
+@pytest.mark.parametrize("disable", [("storage_codec", "none"), ("storage_codec_checkpoints", False)], ids=["codec-none", "checkpoints-off"])
+def test_checkpoints_written_compressed_read_after_codec_disabled(codec, monkeypatch, disable):
+    serde = CompressedSerializer(_JsonSerde())
+    obj = json.loads(PAYLOAD)
+    stored = serde.dumps_typed(obj)
+    assert stored[0].startswith(COMPRESSED_TYPE_PREFIX)
+    monkeypatch.setattr(settings, *disable)
+    assert serde.loads_typed(stored) == obj
+    # 끈 뒤에 쓰는 체크포인트는 압축하지 않는다
+    assert serde.dumps_typed(obj) == _JsonSerde().dumps_typed(obj)
+
+
+def test_train_dictionary_respects_size():
+    samples = [PAYLOAD.replace("홍길동", f"의사{i}") for i in range(50)]
+    dictionary = train_dictionary(samples, size=1024)
+    assert 0 < len(dictionary) <= 1024